@@ -15,8 +15,11 @@ NO CrewAI
 """
 
 from urllib.parse import urlparse
-import re
-import requests
+
+from config.signals import Signal, SignalCode
+from utils.analysis_context import AnalysisContext, build_context
+from utils.reachability import probe_url
+from utils.domain_cache import check_website
 
 FREE_EMAIL_DOMAINS = {
     "gmail.com", "yahoo.com", "outlook.com", "hotmail.com",
@@ -35,8 +38,6 @@ TRUSTED_DOMAINS = {
 
 SUSPICIOUS_TLDS = {".xyz", ".click", ".top", ".live", ".site", ".online", ".work", ".loan"}
 
-URL_REGEX = re.compile(r"(https?://[^\s]+|www\.[^\s]+)", re.IGNORECASE)
-
 
 def _extract_domain(value: str | None) -> str | None:
     if not value:
@@ -52,26 +53,20 @@ def _extract_domain(value: str | None) -> str | None:
     return host or None
 
 
-def _extract_first_url(text: str | None) -> str | None:
-    if not text:
-        return None
-    m = URL_REGEX.search(text)
-    if not m:
-        return None
-    url = m.group(0)
-    if url.startswith("www."):
+def _first_url(context: AnalysisContext) -> str | None:
+    url = context.first_url()
+    if url and url.lower().startswith("www."):
         url = "https://" + url
     return url
 
 
-def run_company_agent(intake_data: dict) -> dict:
-    observations = []
-    trust_score = 0
+def run_company_agent(intake_data: dict, context: AnalysisContext | None = None) -> dict:
+    if context is None:
+        context = build_context(intake_data)
+    signals = []
 
-    raw_text = (intake_data.get("raw_text") or "").strip()
-
-    # if website not provided by intake, try to pull from raw text
-    website = intake_data.get("website") or _extract_first_url(raw_text)
+    # if website not provided by intake, try to pull from the message text
+    website = intake_data.get("website") or _first_url(context)
     email = intake_data.get("email")
 
     website_domain = _extract_domain(website)
@@ -82,55 +77,58 @@ def run_company_agent(intake_data: dict) -> dict:
         # allow subdomains like careers.tcs.com
         base = ".".join(website_domain.split(".")[-2:])
         if base in TRUSTED_DOMAINS:
-            observations.append("Recognized well-known company domain (trust signal)")
-            trust_score -= 25
+            signals.append(Signal(SignalCode.TRUSTED_DOMAIN, {"domain": base}))
 
     # --- Suspicious TLD check ---
     if website_domain:
         for tld in SUSPICIOUS_TLDS:
             if website_domain.endswith(tld):
-                observations.append("Website uses a higher-risk domain extension (TLD)")
+                signals.append(Signal(SignalCode.SUSPICIOUS_TLD, {"tld": tld}))
                 break
 
     # --- Keyword-stuffed domain check (very common scam pattern) ---
     if website_domain and any(k in website_domain for k in ["internship", "offer", "confirm", "registration", "payment"]):
-        observations.append("Domain name contains recruitment/payment keywords (can be misleading)")
+        signals.append(Signal(SignalCode.KEYWORD_DOMAIN))
 
     # --- HTTPS check (correct way) ---
     if website:
         # If user typed without scheme, we assume https, so we only flag if explicitly http://
         if website.strip().lower().startswith("http://"):
-            observations.append("Website link uses HTTP (not HTTPS)")
+            signals.append(Signal(SignalCode.HTTP_ONLY))
 
     # --- Reachability check (do NOT punish redirects / bot protection) ---
+    probe = None
     if website:
-        try:
-            url = website if website.startswith(("http://", "https://")) else f"https://{website}"
-            r = requests.get(url, timeout=5, allow_redirects=True)
+        # cached per domain; a live probe only on miss / expired entry
+        if website_domain:
+            probe = check_website(website.strip(), website_domain)
+        else:
+            probe = probe_url(website.strip())
 
-            # Only flag true failures
-            if r.status_code >= 500:
-                observations.append("Website server error (could not verify reliably)")
-            # 401/403 often happens for legit sites with bot protection – treat as neutral
-        except Exception:
-            observations.append("Website could not be reached (network/timeout)")
+        if not probe.reachable:
+            signals.append(Signal(SignalCode.WEBSITE_UNREACHABLE))
+        # Only flag true failures
+        elif probe.status_code >= 500:
+            signals.append(Signal(SignalCode.WEBSITE_SERVER_ERROR, {"status_code": probe.status_code}))
+        # 401/403 often happens for legit sites with bot protection – treat as neutral
 
     # --- Email checks ---
     if email_domain:
         if email_domain in FREE_EMAIL_DOMAINS:
-            observations.append("Free email domain used for communication")
+            signals.append(Signal(SignalCode.FREE_EMAIL_DOMAIN, {"domain": email_domain}))
 
         # Compare base domains (handles hr@careers.tcs.com vs tcs.com)
         if website_domain:
             base_web = ".".join(website_domain.split(".")[-2:])
             base_email = ".".join(email_domain.split(".")[-2:])
             if base_web != base_email:
-                observations.append("Email domain does not match website domain")
-
-    if not observations:
-        observations.append("No major company legitimacy issues detected")
+                signals.append(Signal(SignalCode.EMAIL_DOMAIN_MISMATCH))
 
     return {
-        "observations": observations,
-        "trust_score": trust_score
+        "signals": signals,
+        "reachability": probe.to_dict() if probe else None,
+        # raw facts for company_risk_stats (analytics only, not scored)
+        "domain": website_domain or email_domain,
+        "uses_free_email": email_domain in FREE_EMAIL_DOMAINS,
+        "website_reachable": probe.reachable if probe else None
     }
\ No newline at end of file
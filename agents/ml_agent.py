@@ -1,48 +1,135 @@
 from pathlib import Path
-import re
-import joblib
+import io
+
+from config.signals import Signal, SignalCode
+from ml.linear_scorer import LinearScorer, bytes_version, content_version
+from utils.text_cleaner import normalize_model_text
+
+# probability bands reported as ML signal codes (explanation only)
+ML_MEDIUM_THRESHOLD = 0.33
+ML_HIGH_THRESHOLD = 0.66
+
+
+def ml_signal(p: float) -> Signal:
+    if p >= ML_HIGH_THRESHOLD:
+        code = SignalCode.ML_HIGH
+    elif p >= ML_MEDIUM_THRESHOLD:
+        code = SignalCode.ML_MEDIUM
+    else:
+        code = SignalCode.ML_LOW
+    return Signal(code, {"probability": round(p, 4)})
+
 
 class MLAgent:
-    def __init__(self, model_path="ml/model.pkl", vectorizer_path="ml/vectorizer.pkl"):
+    def __init__(
+        self,
+        model_path="ml/model.pkl",
+        vectorizer_path="ml/vectorizer.pkl",
+        scorer_path="ml/linear_scorer",
+        model_version=None,
+        model_bytes=None,
+        vectorizer_bytes=None,
+    ):
         self.model_path = Path(model_path)
         self.vectorizer_path = Path(vectorizer_path)
 
+        # pickle bytes the caller already read (and hashed): loaded from
+        # memory, so the version always describes what was unpickled
+        self._pickles = (model_bytes, vectorizer_bytes) if model_bytes is not None else None
+
         if not self.model_path.exists() or not self.vectorizer_path.exists():
             raise FileNotFoundError(
                 f"Missing ML files: {self.model_path} or {self.vectorizer_path}. "
                 "Run ml/train_model.ipynb and save model.pkl + vectorizer.pkl."
             )
 
-        self.model = joblib.load(self.model_path)
-        self.vectorizer = joblib.load(self.vectorizer_path)
+        self.model = None
+        self.vectorizer = None
+
+        # exported term table (memory-mapped): same probabilities without
+        # unpickling sklearn objects or its per-call overhead
+        self.scorer = self._load_scorer(scorer_path, model_version)
+        if self.scorer is None:
+            self._load_sklearn()
+
+    def _load_sklearn(self):
+        import joblib
+
+        if self._pickles is not None:
+            model_bytes, vectorizer_bytes = self._pickles
+            self.model = joblib.load(io.BytesIO(model_bytes))
+            self.vectorizer = joblib.load(io.BytesIO(vectorizer_bytes))
+            self._pickles = None
+        else:
+            self.model = joblib.load(self.model_path)
+            self.vectorizer = joblib.load(self.vectorizer_path)
+
+    def _load_scorer(self, scorer_path, model_version):
+        if not scorer_path or not LinearScorer.exists(scorer_path):
+            return None
+
+        scorer = LinearScorer.load(Path(scorer_path))
+        if model_version is None:
+            if self._pickles is not None:
+                model_version = bytes_version(self._pickles)
+            else:
+                model_version = content_version((self.model_path, self.vectorizer_path))
+
+        # a table exported from other pickles is stale: keep the sklearn path
+        return scorer if scorer.source_version == model_version else None
+
+    @property
+    def inference(self) -> str:
+        return "linear_scorer" if self.scorer is not None else "sklearn"
 
     def clean_text(self, t: str) -> str:
-        t = str(t).lower().strip()
-        t = re.sub(r"(https?://\S+|www\.\S+)", " URL ", t)
-        t = re.sub(r"[^a-z0-9₹\s]", " ", t)
-        t = re.sub(r"\s+", " ", t).strip()
-        return t
+        return normalize_model_text(t)
+
+    def predict_prob(self, text: str, normalized: bool = False) -> float:
+        return self.predict_probs([text], normalized)[0]
+
+    def predict_probs(self, texts: list[str], normalized: bool = False) -> list[float]:
+        # normalized=True: texts are AnalysisContext.model_text already
+        if not normalized:
+            texts = [self.clean_text(t) for t in texts]
 
-    def predict_prob(self, text: str) -> float:
-        text = self.clean_text(text)
-        vec = self.vectorizer.transform([text])
+        if self.scorer is not None:
+            return self.scorer.predict_probs(texts)
+
+        return self.sklearn_probs(texts)
+
+    def sklearn_probs(self, texts: list[str]) -> list[float]:
+        if self.model is None:
+            self._load_sklearn()
+
+        # one sparse matrix + one model call for the whole batch
+        vec = self.vectorizer.transform(texts)
 
         # LogisticRegression -> predict_proba
         if hasattr(self.model, "predict_proba"):
-            return float(self.model.predict_proba(vec)[0, 1])
+            return [float(p) for p in self.model.predict_proba(vec)[:, 1]]
 
         # LinearSVC -> decision_function + sigmoid
         import numpy as np
-        score = float(self.model.decision_function(vec)[0])
-        return float(1 / (1 + np.exp(-score)))
+        scores = self.model.decision_function(vec)
+        return [float(p) for p in 1 / (1 + np.exp(-scores))]
 
-    def run(self, text: str) -> dict:
-        p = self.predict_prob(text)          # 0–1
+    def _result(self, p: float) -> dict:
         risk = int(round(p * 100))           # 0–100
 
         return {
             "agent": "ml_agent",
             "risk_score": risk,
             "ml_probability": round(p, 4),
+            "signals": [ml_signal(p)],
             "reason": "ML signal: similarity to known recruitment fraud language patterns."
-        }
\ No newline at end of file
+        }
+
+    def run(self, text: str, normalized: bool = False) -> dict:
+        p = self.predict_prob(text, normalized)          # 0–1
+        return self._result(p)
+
+    def run_batch(self, texts: list[str], normalized: bool = False) -> list[dict]:
+        if not texts:
+            return []
+        return [self._result(p) for p in self.predict_probs(texts, normalized)]
@@ -0,0 +1,175 @@
+# agents/model_registry.py
+"""
+Model registry for SAFE-INTERN.
+
+Responsibilities:
+- Load ML artifacts (model + vectorizer, plus the exported term table
+  when it matches them) once per process
+- Hand out a single shared MLAgent (treat it as read-only)
+- Hot-swap to new artifacts when their mtime or content hash changes;
+  the term table directory (ML_SCORER_PATH) counts as an artifact, so
+  replacing it alone also swaps and changes model_version (which keys the
+  result cache and near-duplicate index)
+- Read each pickle once: it is unpickled from the same bytes that were
+  hashed, so model_version always describes the loaded model
+- Publish load time and model version via metadata_repository
+
+NO scoring logic
+NO user-facing logic
+"""
+
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from agents.ml_agent import MLAgent
+from config.settings import (
+    ML_MODEL_PATH,
+    ML_VECTORIZER_PATH,
+    ML_SCORER_PATH,
+    ML_RELOAD_CHECK_SECONDS,
+)
+from database import metadata_repository
+from ml.linear_scorer import ARRAY_FILES, META_FILE, LinearScorer, bytes_version
+
+
+_lock = threading.Lock()
+
+_agent: Optional[MLAgent] = None
+_info: Dict[str, Any] = {}
+_fingerprint: Optional[Tuple] = None
+_last_check = 0.0
+
+
+# ---------- ARTIFACT FINGERPRINTS ----------
+
+def _artifact_paths() -> Tuple[Path, ...]:
+    """
+    Pickles first, then the term table files when the artifact exists.
+    """
+    paths = (Path(ML_MODEL_PATH), Path(ML_VECTORIZER_PATH))
+    if ML_SCORER_PATH and LinearScorer.exists(ML_SCORER_PATH):
+        scorer_dir = Path(ML_SCORER_PATH)
+        paths += tuple(scorer_dir / f"{name}.npy" for name in ARRAY_FILES) + (scorer_dir / META_FILE,)
+    return paths
+
+
+def _stat_fingerprint(paths: Tuple[Path, ...]) -> Tuple:
+    """Cheap change detector: (mtime_ns, size) of every artifact."""
+    out = []
+    for p in paths:
+        st = p.stat()
+        out.append((st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+def _read_artifacts(paths: Tuple[Path, ...]) -> Tuple[bytes, ...]:
+    """Artifact bytes, read once for both hashing and loading."""
+    return tuple(p.read_bytes() for p in paths)
+
+
+# ---------- LOADING ----------
+
+def _load(paths: Tuple[Path, ...], blobs: Tuple[bytes, ...], fingerprint: Tuple, version: str) -> None:
+    global _agent, _info, _fingerprint
+
+    started = time.perf_counter()
+    agent = MLAgent(
+        model_path=paths[0],
+        vectorizer_path=paths[1],
+        scorer_path=ML_SCORER_PATH,
+        # the term table is served only if exported from these pickles
+        model_version=bytes_version(blobs[:2]),
+        model_bytes=blobs[0],
+        vectorizer_bytes=blobs[1],
+    )
+    load_seconds = time.perf_counter() - started
+
+    # single reference swap: callers holding the old agent keep a valid object
+    _agent = agent
+    _fingerprint = fingerprint
+    _info = {
+        "model_version": version,
+        "loaded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "load_seconds": round(load_seconds, 4),
+        "model_path": str(paths[0]),
+        "vectorizer_path": str(paths[1]),
+        "inference": agent.inference,
+        # which term table is served (compacted tables carry their settings)
+        "scorer_version": agent.scorer.artifact_version if agent.scorer is not None else None,
+    }
+
+    _publish(_info)
+
+
+def _publish(info: Dict[str, Any]) -> None:
+    try:
+        metadata_repository.record_model_metadata(
+            model_version=info["model_version"],
+            loaded_at=info["loaded_at"],
+            load_seconds=info["load_seconds"],
+        )
+    except sqlite3.Error:
+        # metadata is for auditing only; never block inference on it
+        pass
+
+
+def _refresh_if_changed() -> None:
+    global _fingerprint
+
+    paths = _artifact_paths()
+    fingerprint = _stat_fingerprint(paths)
+
+    if _agent is not None and fingerprint == _fingerprint:
+        return
+
+    # model version = short sha256 over all artifact bytes
+    blobs = _read_artifacts(paths)
+    version = bytes_version(blobs)
+
+    if _agent is not None and version == _info.get("model_version"):
+        # touched but identical content: no reload needed
+        _fingerprint = fingerprint
+        return
+
+    _load(paths, blobs, fingerprint, version)
+
+
+# ---------- PUBLIC API ----------
+
+def get_ml_agent() -> MLAgent:
+    """
+    Return the process-wide MLAgent.
+
+    Artifacts are loaded on first use. Afterwards their mtime/size is
+    re-checked at most every ML_RELOAD_CHECK_SECONDS; a changed content
+    hash triggers a reload and an atomic swap.
+    """
+    global _last_check
+
+    now = time.monotonic()
+    if _agent is not None and now - _last_check < ML_RELOAD_CHECK_SECONDS:
+        return _agent
+
+    with _lock:
+        if _agent is None or now - _last_check >= ML_RELOAD_CHECK_SECONDS:
+            try:
+                _refresh_if_changed()
+            except OSError:
+                # artifacts mid-replacement: keep serving the loaded model
+                if _agent is None:
+                    raise
+            _last_check = now
+
+    return _agent
+
+
+def get_model_info() -> Dict[str, Any]:
+    """
+    Return version/load info for the currently served model.
+    """
+    get_ml_agent()
+    return dict(_info)
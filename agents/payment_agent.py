@@ -11,77 +11,44 @@ Handles negation:
 - "No fees involved" should NOT trigger risk
 """
 
-import re
+from config.lexicon import STRONG_PAYMENT_KEYWORDS
+from config.signals import Signal, SignalCode
+from utils.analysis_context import AnalysisContext, build_context
 
-PAYMENT_KEYWORDS = [
-    "registration fee",
-    "processing fee",
-    "training fee",
-    "fee",
-    "deposit",
-    "upi",
-    "paytm",
-    "phonepe",
-    "gpay",
-    "google pay",
-    "scan qr",
-    "pay now",
-    "confirm seat",
-    "seat confirmation",
-    "transfer money",
-    "send payment",
-]
 
-UPFRONT_KEYWORDS = [
-    "before joining",
-    "pay first",
-    "upfront",
-    "immediate payment",
-    "pay now",
-]
-
-
-def run_payment_agent(intake_data: dict) -> dict:
-    text = (intake_data.get("raw_text") or intake_data.get("clean_text") or "").lower()
-    observations = []
+def run_payment_agent(intake_data: dict, context: AnalysisContext | None = None) -> dict:
+    if context is None:
+        context = build_context(intake_data)
+    matches = context.matches
+    signals = []
 
     # ✅ Negation patterns (trust signals)
-    negation_phrases = [
-        "no fee", "no fees", "no payment", "no payments",
-        "no registration fee", "no application fee",
-        "no charges", "free of cost", "without any fee"
-    ]
-    has_negation = any(p in text for p in negation_phrases)
+    has_negation = matches.has("payment_negation")
 
     # keyword detection
-    matches = [k for k in PAYMENT_KEYWORDS if k in text]
+    payment_hits = matches.terms("payment")
 
-    if matches:
+    if payment_hits:
         # if negation exists, ignore generic words
         if has_negation:
-            strong_only = [
-                m for m in matches
-                if m in ["upi", "paytm", "phonepe", "gpay", "google pay", "scan qr", "pay now", "send payment"]
-            ]
+            strong_only = [m for m in payment_hits if m in STRONG_PAYMENT_KEYWORDS]
             if strong_only:
-                observations.append(f"Payment-related language detected: {', '.join(strong_only)}")
+                signals.append(Signal(SignalCode.PAYMENT_LANGUAGE, {"terms": strong_only}))
         else:
-            observations.append(f"Payment-related language detected: {', '.join(matches)}")
+            signals.append(Signal(SignalCode.PAYMENT_LANGUAGE, {"terms": payment_hits}))
 
     # upfront payment cues
-    upfront_matches = [k for k in UPFRONT_KEYWORDS if k in text]
+    upfront_matches = matches.terms("upfront")
     if upfront_matches and not has_negation:
-        observations.append("Payment appears to be requested before internship starts")
+        signals.append(Signal(SignalCode.UPFRONT_PAYMENT, {"terms": upfront_matches}))
 
     # amount detection
-    if not has_negation and re.search(r"(₹|rs\.?|inr|\$)\s*\d+", text):
-        observations.append("Specific payment amount mentioned")
+    amount = None if has_negation else context.first_amount()
+    if amount:
+        signals.append(Signal(SignalCode.PAYMENT_AMOUNT, {"amount": amount}))
 
-    # final fallback
-    if not observations:
-        if has_negation:
-            observations.append("Explicitly states no fees/payment involved (trust signal)")
-        else:
-            observations.append("No unusual payment patterns detected")
+    # explicit "no fee" statement and nothing else payment-related
+    if not signals and has_negation:
+        signals.append(Signal(SignalCode.PAYMENT_NEGATED))
 
-    return {"observations": observations}
\ No newline at end of file
+    return {"signals": signals}
\ No newline at end of file
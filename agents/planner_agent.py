@@ -1,43 +1,134 @@
 from agents import company_agent, payment_agent, behavior_agent
-from agents.ml_agent import MLAgent
+from agents.model_registry import get_ml_agent
+from agents.scheduler import AgentTask, run_dag
+from config.settings import AGENT_TIMEOUTS
+from database import analytics_writer
+from utils.analysis_context import AnalysisContext, build_context
+from utils.profiling import profiled
+from utils.tracing import span
 
 
 # -----------------------
-# Helper: convert schema → dict
+# Planner
 # -----------------------
-def _to_dict(obj):
-    if hasattr(obj, "model_dump"):   # pydantic v2
-        return obj.model_dump()
-    if hasattr(obj, "dict"):         # pydantic v1
-        return obj.dict()
-    if hasattr(obj, "to_dict"):
-        return obj.to_dict()
-    if hasattr(obj, "__dict__"):
-        return dict(obj.__dict__)
-    return obj
+def _run_rule_agents(context: AnalysisContext) -> dict:
+    return {
+        "raw_text": context.text,
+        "context": context,
+        "company": company_agent.run_company_agent(context.intake, context),
+        "payment": payment_agent.run_payment_agent(context.intake, context),
+        "behavior": behavior_agent.run_behavior_agent(context.intake, context),
+    }
+
+
+# Results used when an agent times out or fails. They carry no signals,
+# so a degraded agent adds no risk points; the explanation marks its check
+# as not completed instead of reporting "nothing found".
+DEGRADED_RESULTS = {
+    "company": lambda reason: {
+        "signals": [],
+        "reachability": None,
+    },
+    "payment": lambda reason: {
+        "signals": [],
+    },
+    "behavior": lambda reason: {
+        "signals": [],
+    },
+    "ml": lambda reason: {
+        "agent": "ml_agent",
+        "risk_score": 0,
+        "ml_probability": 0.0,
+        "signals": [],
+        "reason": "ML signal unavailable for this analysis.",
+    },
+}
+
+
+def _agent_graph(context: AnalysisContext) -> list:
+    """
+    Declared agent graph. All four agents only read the shared analysis
+    context, so they run side by side.
+    """
+    def task(name, fn, depends_on=()):
+        stage = f"agent.{name}"
+
+        def run(deps):
+            with span(stage), profiled(stage):
+                return fn(deps)
+
+        return AgentTask(
+            name=name,
+            fn=run,
+            depends_on=depends_on,
+            timeout=AGENT_TIMEOUTS.get(name, 10),
+            fallback=DEGRADED_RESULTS[name],
+        )
+
+    return [
+        task("company", lambda deps: company_agent.run_company_agent(context.intake, context)),
+        task("payment", lambda deps: payment_agent.run_payment_agent(context.intake, context)),
+        task("behavior", lambda deps: behavior_agent.run_behavior_agent(context.intake, context)),
+        task("ml", lambda deps: get_ml_agent().run(context.model_text, normalized=True)),
+    ]
+
+
+def _emit_analytics(results: dict, degraded=()) -> None:
+    """
+    Hand pattern / company events to the write-behind analytics writer
+    (no database work on the request path). Degraded agents are skipped.
+    """
+    for name in ("company", "payment", "behavior", "ml"):
+        if name in degraded:
+            continue
+        for signal in results[name].get("signals", []):
+            analytics_writer.record_pattern_event(name, signal.code.value)
+
+    company = results["company"]
+    if "company" not in degraded and company.get("domain"):
+        analytics_writer.record_company_event(
+            company["domain"],
+            uses_free_email=company.get("uses_free_email", False),
+            website_reachable=company.get("website_reachable"),
+        )
 
 
-# -----------------------
-# Planner
-# -----------------------
 def run_planner(intake_schema):
 
-    intake_data = _to_dict(intake_schema)
+    # text-derived data (entities, tokens, keyword scan) computed once
+    with span("context"):
+        context = build_context(intake_schema)
+
+    dag = run_dag(_agent_graph(context))
+
+    results = {"raw_text": context.text, "context": context}
+    for name in ("company", "payment", "behavior", "ml"):
+        results[name] = dag.results[name]
 
-    results = {}
+    # agents that timed out / failed and returned a fallback result
+    results["degraded"] = sorted(dag.degraded)
 
-    # ALWAYS keep raw text for scoring
-    results["raw_text"] = (
-        intake_data.get("raw_text", "")
-        or intake_data.get("clean_text", "")
-        or ""
-    )
+    _emit_analytics(results, dag.degraded)
+
+    return results
+
+
+# -----------------------
+# Batch planner
+# -----------------------
+def run_planner_batch(intake_schemas: list) -> list:
+    """
+    Run all agents over many intakes.
 
-    results["company"] = company_agent.run_company_agent(intake_data)
-    results["payment"] = payment_agent.run_payment_agent(intake_data)
-    results["behavior"] = behavior_agent.run_behavior_agent(intake_data)
+    Rule agents run in a plain loop; the ML agent vectorizes every text
+    in one sparse matrix and scores it with a single model call.
+    Results are returned in input order.
+    """
+    batch = [_run_rule_agents(build_context(s)) for s in intake_schemas]
 
-    text = results["raw_text"]
-    results["ml"] = MLAgent().run(text)
+    ml_results = get_ml_agent().run_batch([r["context"].model_text for r in batch], normalized=True)
+    for results, ml in zip(batch, ml_results):
+        results["ml"] = ml
+        _emit_analytics(results)
 
-    return results
\ No newline at end of file
+    return batch
\ No newline at end of file
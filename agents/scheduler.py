@@ -0,0 +1,206 @@
+# agents/scheduler.py
+"""
+Agent scheduler for SAFE-INTERN.
+
+Responsibilities:
+- Run agents from a declared dependency graph on a shared thread pool
+- Start every agent as soon as its dependencies are done, so network-bound
+  agents (company) overlap with CPU-bound ones (payment, behavior, ML)
+- Enforce a per-agent timeout and fall back to a degraded result instead
+  of failing the whole analysis. The timeout counts from the moment the
+  agent starts running, not from submission: time spent queued behind
+  other requests never degrades an agent
+- An agent still queued after its own timeout (pool saturated, e.g. by
+  timed-out agents that are still running) is moved to an overflow
+  thread instead of waiting further
+- Run each agent in a copy of the caller's context, so tracing spans
+  opened by agents nest under the request that started them
+
+NO scoring
+NO agent logic
+"""
+
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import time
+
+from config.settings import AGENT_POOL_WORKERS
+
+
+@dataclass
+class AgentTask:
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]      # receives {dep_name: dep_result}
+    depends_on: Tuple[str, ...] = ()
+    timeout: float = 10.0                    # seconds, from the moment the task starts running
+    fallback: Callable[[str], Any] = lambda reason: None
+
+
+@dataclass
+class DagResult:
+    results: Dict[str, Any] = field(default_factory=dict)
+    degraded: Dict[str, str] = field(default_factory=dict)   # name -> reason
+    elapsed: Dict[str, float] = field(default_factory=dict)  # name -> seconds
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # shared across requests: no per-analysis thread start-up cost
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=AGENT_POOL_WORKERS,
+                    thread_name_prefix="safe-intern-agent",
+                )
+    return _executor
+
+
+class _Slot:
+    """
+    One submitted task: when it was queued and when a worker started it.
+    """
+
+    __slots__ = ("task", "queued", "started")
+
+    def __init__(self, task: AgentTask, queued: float):
+        self.task = task
+        self.queued = queued
+        self.started: Optional[float] = None
+
+    def deadline(self) -> float:
+        # queued tasks get their timeout as queue patience, then overflow
+        return (self.started if self.started is not None else self.queued) + self.task.timeout
+
+
+def _timed(slot: _Slot) -> Callable[[Dict[str, Any]], Any]:
+    def run(deps):
+        # the loop may already have set it (cancel failed just before this)
+        if slot.started is None:
+            slot.started = time.monotonic()
+        return slot.task.fn(deps)
+    return run
+
+
+def _run_overflow(fn: Callable, *args) -> Future:
+    """
+    Run fn on a dedicated thread (outside the saturated shared pool).
+    """
+    future: Future = Future()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as err:
+            future.set_exception(err)
+
+    threading.Thread(target=target, name="safe-intern-agent-overflow", daemon=True).start()
+    return future
+
+
+def _check_graph(tasks: Dict[str, AgentTask]) -> None:
+    for task in tasks.values():
+        for dep in task.depends_on:
+            if dep not in tasks:
+                raise ValueError(f"Agent '{task.name}' depends on unknown agent '{dep}'")
+
+    # Kahn's algorithm: every node must be reachable in topological order
+    indegree = {name: len(t.depends_on) for name, t in tasks.items()}
+    ready = [name for name, d in indegree.items() if d == 0]
+    seen = 0
+    while ready:
+        current = ready.pop()
+        seen += 1
+        for t in tasks.values():
+            if current in t.depends_on:
+                indegree[t.name] -= 1
+                if indegree[t.name] == 0:
+                    ready.append(t.name)
+    if seen != len(tasks):
+        raise ValueError("Agent dependency graph contains a cycle")
+
+
+def run_dag(task_list: List[AgentTask]) -> DagResult:
+    """
+    Execute agents respecting dependencies; return results and the set of
+    degraded agents (timed out or raised). Dependents of a degraded agent
+    still run and receive its fallback result.
+    """
+    tasks = {t.name: t for t in task_list}
+    _check_graph(tasks)
+
+    executor = _get_executor()
+    out = DagResult()
+
+    pending = dict(tasks)
+    running: Dict[Future, Tuple[_Slot, Any]] = {}   # future -> (slot, deps)
+
+    def finished(name: str) -> bool:
+        return name in out.results
+
+    def submit_ready() -> None:
+        for name, task in list(pending.items()):
+            if all(finished(dep) for dep in task.depends_on):
+                deps = {dep: out.results[dep] for dep in task.depends_on}
+                slot = _Slot(task, time.monotonic())
+                future = executor.submit(copy_context().run, _timed(slot), deps)
+                running[future] = (slot, deps)
+                del pending[name]
+
+    def elapsed(slot: _Slot) -> float:
+        return time.monotonic() - (slot.started if slot.started is not None else slot.queued)
+
+    def degrade(slot: _Slot, reason: str) -> None:
+        out.results[slot.task.name] = slot.task.fallback(reason)
+        out.degraded[slot.task.name] = reason
+        out.elapsed[slot.task.name] = elapsed(slot)
+
+    submit_ready()
+
+    while running:
+        next_deadline = min(slot.deadline() for slot, _ in running.values())
+        done, _ = wait(
+            list(running),
+            timeout=max(0.0, next_deadline - time.monotonic()),
+            return_when=FIRST_COMPLETED,
+        )
+
+        for future in done:
+            slot, _ = running.pop(future)
+            try:
+                out.results[slot.task.name] = future.result()
+                out.elapsed[slot.task.name] = elapsed(slot)
+            except Exception as err:
+                degrade(slot, f"error: {type(err).__name__}")
+
+        now = time.monotonic()
+        for future, (slot, deps) in list(running.items()):
+            if now < slot.deadline():
+                continue
+            if slot.started is None:
+                if future.cancel():
+                    # never started: run it now on its own thread, full timeout
+                    running.pop(future)
+                    slot.queued = time.monotonic()
+                    running[_run_overflow(copy_context().run, _timed(slot), deps)] = (slot, deps)
+                else:
+                    # a worker picked it up but has not recorded the start
+                    # yet: count from now rather than wait on a past deadline
+                    slot.started = now
+            else:
+                # the thread cannot be killed; its late result is discarded
+                running.pop(future)
+                degrade(slot, "timeout")
+
+        submit_ready()
+
+    return out
@@ -2,12 +2,8 @@
 import streamlit as st
 from datetime import datetime
 
-from intake.input_router import route_input
-from intake.intake_agent import run_intake
-from agents.planner_agent import run_planner
-from utils.risk_engine import calculate_risk
-from utils.explanation_engine import generate_explanation
-from utils.guardrails import apply_full_guardrails
+from pipeline import analyze_text
+from database.db_init import init_database
 
 
 # ---------------- PAGE CONFIG ----------------
@@ -17,6 +13,15 @@ st.set_page_config(
     layout="wide"
 )
 
+# ---------------- DATABASE ----------------
+@st.cache_resource
+def _init_db_once():
+    init_database()
+    return True
+
+
+_init_db_once()
+
 # ---------------- SESSION STATE ----------------
 if "history" not in st.session_state:
     st.session_state.history = []  # each: {time, input_preview, risk_score, risk_category}
@@ -112,6 +117,7 @@ with st.sidebar:
 
     show_advanced = st.toggle("Show advanced details", value=True)
     show_history = st.toggle("Show analysis history", value=True)
+    show_timings = st.toggle("Show stage timings", value=False)
 
     st.markdown("---")
     st.markdown("### 🧪 Quick Demo Inputs")
@@ -185,6 +191,8 @@ with tab1:
         if st.session_state.last_output:
             out = st.session_state.last_output
             render_score_card(out["risk_score"], out["risk_category"], out["summary"])
+            if out.get("incomplete_checks"):
+                st.warning("Checks not completed: " + ", ".join(out["incomplete_checks"]))
             st.markdown("")
 
             if show_advanced:
@@ -200,6 +208,12 @@ with tab1:
                 with st.expander("⚠️ Disclaimer"):
                     st.caption(out.get("disclaimer", ""))
 
+            if show_timings and out.get("trace"):
+                with st.expander("⏱️ Stage timings"):
+                    for s in out["trace"]:
+                        nested = "↳ " if s["parent"] not in (None, "analyze") else ""
+                        st.markdown(f"- {nested}**{s['name']}**: {s['duration_ms']:.1f} ms (at {s['start_ms']:.1f} ms)")
+
         else:
             st.info("Run an analysis to see results here.")
 
@@ -210,23 +224,7 @@ with tab1:
         else:
             with st.spinner("Analyzing communication…"):
                 try:
-                    routed_text = route_input(text_input=user_text)
-                    intake_schema = run_intake(routed_text)
-
-                    # Convert IntakeSchema -> dict (pydantic v1/v2 safe)
-                    if hasattr(intake_schema, "model_dump"):
-                        intake_data = intake_schema.model_dump()
-                    elif hasattr(intake_schema, "dict"):
-                        intake_data = intake_schema.dict()
-                    elif hasattr(intake_schema, "to_dict"):
-                        intake_data = intake_schema.to_dict()
-                    else:
-                        intake_data = intake_schema
-
-                    agent_results = run_planner(intake_data)
-                    risk_result = calculate_risk(agent_results)
-                    explanation = generate_explanation(risk_result)
-                    safe_output = apply_full_guardrails(explanation)
+                    safe_output = analyze_text(user_text, debug=show_timings)
 
                     # Store output + history
                     st.session_state.last_output = safe_output
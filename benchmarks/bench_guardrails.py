@@ -0,0 +1,177 @@
+# benchmarks/bench_guardrails.py
+"""
+Per-output cost of utils/guardrails.apply_full_guardrails.
+
+Compares the previous implementation (one lowercase + regex compile per
+forbidden word, four accusatory re.sub passes, then a second walk for
+the final check) with the single-pass engine, cold (memo cleared before
+every output) and warm (memo populated, as in a running app).
+
+Outputs come from explanation_engine.generate_explanation over varied
+scores / signals; one in five also carries free-text notes with
+forbidden or accusatory wording.
+
+Usage:
+    python benchmarks/bench_guardrails.py [--outputs N] [--repeat N]
+"""
+
+from typing import Dict, Any, List, Tuple
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.guardrail_words import FORBIDDEN_WORDS, SAFE_REPLACEMENTS
+from config.signals import Signal, SignalCode
+from utils import guardrails
+from utils.explanation_engine import generate_explanation
+
+
+# ---------- PREVIOUS IMPLEMENTATION ----------
+
+LEGACY_ACCUSATORY_PATTERNS = [
+    r'\bthis is (a )?(scam|fraud)\b',
+    r'\bdefinitely (a )?(scam|fraud)\b',
+    r'\bobviously (a )?(scam|fraud)\b',
+    r'\bguaranteed (to be )?(a )?(scam|fraud)\b',
+]
+
+
+def legacy_sanitize_text(text: str) -> str:
+    if not text:
+        return ""
+    sanitized = text
+    for bad_word in FORBIDDEN_WORDS:
+        if bad_word.lower() in sanitized.lower():
+            replacement = SAFE_REPLACEMENTS.get(bad_word, "potential risk indicator")
+            sanitized = re.compile(re.escape(bad_word), re.IGNORECASE).sub(replacement, sanitized)
+    for pattern in LEGACY_ACCUSATORY_PATTERNS:
+        sanitized = re.sub(
+            pattern, "shows patterns that may require careful verification", sanitized, flags=re.IGNORECASE
+        )
+    return sanitized
+
+
+def legacy_apply_guardrails(output: Dict[str, Any]) -> Dict[str, Any]:
+    guarded = {}
+    for key, value in output.items():
+        if isinstance(value, str):
+            guarded[key] = legacy_sanitize_text(value)
+        elif isinstance(value, list):
+            guarded[key] = [legacy_sanitize_text(v) if isinstance(v, str) else v for v in value]
+        elif isinstance(value, dict):
+            guarded[key] = legacy_apply_guardrails(value)
+        else:
+            guarded[key] = value
+    return guarded
+
+
+def legacy_final_output_check(output: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    violations = []
+
+    def scan(obj: Any, path: str = "root"):
+        if isinstance(obj, str):
+            for word in FORBIDDEN_WORDS:
+                if word.lower() in obj.lower():
+                    violations.append(f"Forbidden word '{word}' at {path}")
+            for pattern in LEGACY_ACCUSATORY_PATTERNS:
+                if re.search(pattern, obj, re.IGNORECASE):
+                    violations.append(f"Accusatory pattern at {path}")
+        elif isinstance(obj, list):
+            for i, item in enumerate(obj):
+                scan(item, f"{path}[{i}]")
+        elif isinstance(obj, dict):
+            for k, v in obj.items():
+                scan(v, f"{path}.{k}")
+
+    scan(output)
+    return len(violations) == 0, violations
+
+
+def legacy_apply_full_guardrails(output: Dict[str, Any]) -> Dict[str, Any]:
+    guarded = legacy_apply_guardrails(output)
+    is_safe, _ = legacy_final_output_check(guarded)
+    if not is_safe:
+        guarded = legacy_apply_guardrails(guarded)
+    return guarded
+
+
+# ---------- SAMPLE OUTPUTS ----------
+
+CATEGORIES = ["Low Risk Indicators", "Caution Advised", "High Risk Indicators"]
+SIGNAL_SETS = [
+    [Signal(SignalCode.WEBSITE_UNREACHABLE), Signal(SignalCode.FREE_EMAIL_DOMAIN)],
+    [Signal(SignalCode.PAYMENT_LANGUAGE, {"terms": ["fee", "upi"]}), Signal(SignalCode.PAYMENT_AMOUNT)],
+    [Signal(SignalCode.HARD_URGENCY), Signal(SignalCode.MANIPULATION), Signal(SignalCode.ML_HIGH)],
+    [Signal(SignalCode.EMAIL_DOMAIN_MISMATCH), Signal(SignalCode.UPFRONT_PAYMENT), Signal(SignalCode.ML_MEDIUM)],
+    [Signal(SignalCode.ML_LOW)],
+]
+NOTES = [
+    "This is a scam according to several reviewers",
+    "Recruiter asked for a deposit; looks like a con",
+    "Offer letter appears fake and the domain is new",
+    "Previous applicants reported fraudulent refund promises",
+]
+
+
+def sample_outputs(n: int) -> List[Dict[str, Any]]:
+    outputs = []
+    for i in range(n):
+        output = generate_explanation({
+            "risk_score": (i * 7) % 101,
+            "risk_category": CATEGORIES[i % 3],
+            "signals": SIGNAL_SETS[i % len(SIGNAL_SETS)],
+            "breakdown": {"financial": (i * 5) % 46, "pressure": i % 30, "ml": i % 20},
+        })
+        if i % 5 == 0:
+            output["notes"] = [NOTES[i % len(NOTES)]]
+        outputs.append(output)
+    return outputs
+
+
+# ---------- RUN ----------
+
+def per_output_us(fn, outputs, repeat: int, before_each=None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for output in outputs:
+            if before_each:
+                before_each()
+            fn(output)
+        best = min(best, time.perf_counter() - started)
+    return best / len(outputs) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--outputs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    outputs = sample_outputs(args.outputs)
+
+    legacy = per_output_us(legacy_apply_full_guardrails, outputs, args.repeat)
+    cold = per_output_us(
+        guardrails.apply_full_guardrails, outputs, args.repeat, before_each=guardrails._sanitize.cache_clear
+    )
+    guardrails._sanitize.cache_clear()
+    warm = per_output_us(guardrails.apply_full_guardrails, outputs, args.repeat)
+
+    changed = sum(
+        legacy_apply_full_guardrails(o) != guardrails.apply_full_guardrails(o) for o in outputs
+    )
+
+    print(f"outputs: {len(outputs)}")
+    print(f"legacy:             {legacy:8.1f} us/output")
+    print(f"single-pass (cold): {cold:8.1f} us/output  ({legacy / cold:.1f}x)")
+    print(f"single-pass (warm): {warm:8.1f} us/output  ({legacy / warm:.1f}x)")
+    print(f"outputs that differ from legacy: {changed} (word-boundary fix, e.g. 'concerning')")
+    print(f"memo: {guardrails._sanitize.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
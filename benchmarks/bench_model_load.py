@@ -0,0 +1,137 @@
+# benchmarks/bench_model_load.py
+"""
+ML artifact load cost: joblib pickles vs the memory-mapped term table.
+
+Each variant runs in a fresh interpreter and reports:
+- load time (imports included: unpickling pulls in sklearn / scipy)
+- RSS growth after loading and scoring the sample messages
+- private memory per forked worker (Private_* in /proc/<pid>/smaps_rollup),
+  i.e. what every extra Streamlit / worker process really costs
+
+Usage:
+    python benchmarks/bench_model_load.py [--workers N]
+
+Linux only (reads /proc).
+"""
+
+from typing import Dict, List
+import argparse
+import csv
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+VARIANTS = ("pickle", "mmap")
+
+
+# ---------- /proc HELPERS ----------
+
+def rss_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def private_kb(pid: int) -> int:
+    total = 0
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1])
+    return total
+
+
+def sample_texts() -> List[str]:
+    texts = []
+    for name in ("fake_internships.csv", "real_internships.csv"):
+        with open(os.path.join(ROOT, "data", name), encoding="utf-8") as f:
+            texts.extend(row["text"] for row in csv.DictReader(f))
+    return texts
+
+
+# ---------- CHILD ----------
+
+def run_child(variant: str, workers: int) -> Dict[str, float]:
+    import warnings
+    warnings.simplefilter("ignore")
+
+    texts = sample_texts()
+    before = rss_kb()
+    started = time.perf_counter()
+
+    from agents.ml_agent import MLAgent
+    scorer_path = os.path.join(ROOT, "ml/linear_scorer") if variant == "mmap" else None
+    agent = MLAgent(
+        model_path=os.path.join(ROOT, "ml/model.pkl"),
+        vectorizer_path=os.path.join(ROOT, "ml/vectorizer.pkl"),
+        scorer_path=scorer_path,
+    )
+    load_ms = (time.perf_counter() - started) * 1000
+    if variant == "mmap" and agent.scorer is None:
+        raise SystemExit("ml/linear_scorer/ missing or stale: run python -m ml.linear_scorer")
+
+    agent.predict_probs(texts)
+    loaded_kb = rss_kb() - before
+
+    # forked workers score every message, then report their private memory
+    pids = []
+    ready_r, ready_w = os.pipe()
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            for t in texts:
+                agent.predict_prob(t)
+            os.write(ready_w, b"x")
+            time.sleep(60)          # parent measures, then kills us
+            os._exit(0)
+        pids.append(pid)
+
+    for _ in pids:
+        os.read(ready_r, 1)
+    private = [private_kb(pid) for pid in pids]
+    for pid in pids:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+    return {
+        "load_ms": load_ms,
+        "rss_kb": loaded_kb,
+        "worker_private_kb": sum(private) / len(private) if private else 0.0,
+    }
+
+
+# ---------- RUN ----------
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--child", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.workers)))
+        return
+
+    print(f"{'variant':8} {'load ms':>9} {'RSS +MB':>9} {'private MB/worker':>18}")
+    for variant in VARIANTS:
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", variant, "--workers", str(args.workers)],
+            capture_output=True, text=True, check=True, cwd=ROOT,
+        )
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(
+            f"{variant:8} {r['load_ms']:9.1f} {r['rss_kb'] / 1024:9.1f} "
+            f"{r['worker_private_kb'] / 1024:18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
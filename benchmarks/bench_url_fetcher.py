@@ -0,0 +1,96 @@
+# benchmarks/bench_url_fetcher.py
+"""
+HTML → text benchmark for utils/url_fetcher.
+
+Compares the previous implementation (full BeautifulSoup tree, then
+decompose script/style/noscript) with the incremental parsers on the
+local fixtures in benchmarks/fixtures/. Each fixture is also scaled up
+by repeating its body to show how the two approaches grow with page
+size. Fed in 16 KiB chunks, as fetch_url_text does.
+
+Usage:
+    python benchmarks/bench_url_fetcher.py [--repeat N]
+"""
+
+from pathlib import Path
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from utils import url_fetcher
+
+FIXTURES = Path(__file__).parent / "fixtures"
+CHUNK = 16384
+SCALES = (1, 20, 200)
+
+
+def legacy_html_to_text(html: str) -> str:
+    # pre-streaming fetch_text_from_url body
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    text = soup.get_text(separator="\n")
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return "\n".join(lines)
+
+
+def streaming_html_to_text(html: str, use_lxml: bool) -> str:
+    parser = url_fetcher.html_text_parser(use_lxml)
+    for start in range(0, len(html), CHUNK):
+        parser.feed(html[start:start + CHUNK])
+    return parser.result()
+
+
+def scaled(html: str, factor: int) -> str:
+    head, sep, rest = html.partition("<body")
+    body_start = rest.index(">") + 1
+    body, _, tail = rest[body_start:].rpartition("</body>")
+    return head + sep + rest[:body_start] + body * factor + "</body>" + tail
+
+
+def timed(fn, html: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    candidates = [("stdlib", lambda h: streaming_html_to_text(h, use_lxml=False))]
+    if url_fetcher.etree is not None:
+        candidates.append(("lxml", lambda h: streaming_html_to_text(h, use_lxml=True)))
+
+    print(f"{'fixture':<22}{'scale':>6}{'KiB':>9}{'bs4 ms':>10}", end="")
+    for name, _ in candidates:
+        print(f"{name + ' ms':>12}{'speedup':>9}", end="")
+    print("  same text")
+
+    for path in sorted(FIXTURES.glob("*.html")):
+        base = path.read_text(encoding="utf-8")
+        for factor in SCALES:
+            html = scaled(base, factor)
+            expected = legacy_html_to_text(html)
+            legacy = timed(legacy_html_to_text, html, args.repeat)
+
+            print(f"{path.name:<22}{factor:>6}{len(html.encode()) / 1024:>9.1f}{legacy * 1000:>10.2f}", end="")
+            same = []
+            for name, fn in candidates:
+                elapsed = timed(fn, html, args.repeat)
+                same.append(fn(html) == expected)
+                print(f"{elapsed * 1000:>12.2f}{legacy / elapsed:>8.1f}x", end="")
+            print("  " + ("yes" if all(same) else "NO"))
+
+
+if __name__ == "__main__":
+    main()
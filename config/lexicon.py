@@ -0,0 +1,137 @@
+# config/lexicon.py
+"""
+Keyword lexicon for SAFE-INTERN.
+
+Purpose:
+- Single home for every keyword list the rule agents, intake fallback
+  and risk engine look for in the input text
+- KEYWORD_CATEGORIES feeds the shared single-pass matcher
+  (utils/keyword_matcher.py)
+
+All entries are lowercase; matching is plain substring matching on the
+lowercased text (same semantics as `keyword in text`).
+"""
+
+LEXICON_VERSION = "1"
+
+
+# ---------- BEHAVIOR AGENT ----------
+
+HARD_URGENCY_WORDS = [
+    "urgent", "immediately", "asap", "within 24 hours", "24 hours",
+    "deadline", "last date", "final day", "hours left", "apply now",
+    "pay now", "today only"
+]
+
+SCARCITY_WORDS = [
+    "limited slots", "only", "few seats", "mentor bandwidth",
+    "we will onboard only", "limited intake"
+]
+
+MANIPULATION_PHRASES = [
+    "guaranteed placement", "no interview required",
+    "100% placement", "instant selection",
+    "whatsapp confirmation", "confirm your seat",
+    "seat confirmation", "selected for internship",
+    "confirm seat now", "instant confirmation"
+]
+
+PROCESS_KEYWORDS = [
+    "interview", "assessment", "screening", "selection",
+    "resume screening", "technical interview", "hr discussion",
+    "online interaction", "call with founders"
+]
+
+
+# ---------- PAYMENT AGENT ----------
+
+PAYMENT_KEYWORDS = [
+    "registration fee",
+    "processing fee",
+    "training fee",
+    "fee",
+    "deposit",
+    "upi",
+    "paytm",
+    "phonepe",
+    "gpay",
+    "google pay",
+    "scan qr",
+    "pay now",
+    "confirm seat",
+    "seat confirmation",
+    "transfer money",
+    "send payment",
+]
+
+UPFRONT_KEYWORDS = [
+    "before joining",
+    "pay first",
+    "upfront",
+    "immediate payment",
+    "pay now",
+]
+
+# Negation patterns (trust signals)
+PAYMENT_NEGATION_PHRASES = [
+    "no fee", "no fees", "no payment", "no payments",
+    "no registration fee", "no application fee",
+    "no charges", "free of cost", "without any fee"
+]
+
+# Still reported when a negation phrase is present
+STRONG_PAYMENT_KEYWORDS = [
+    "upi", "paytm", "phonepe", "gpay", "google pay", "scan qr", "pay now", "send payment"
+]
+
+
+# ---------- INTAKE FALLBACK ----------
+
+INTAKE_PAYMENT_KEYWORDS = ["fee", "payment", "deposit", "registration", "charges"]
+INTAKE_URGENCY_KEYWORDS = ["urgent", "immediately", "limited", "asap", "hurry"]
+
+
+# ---------- RISK ENGINE ----------
+
+STRUCTURE_PROCESS_KEYWORDS = [
+    "interview", "technical interview", "hr discussion", "resume screening",
+    "selection process", "screening", "assessment", "shortlisted",
+    "online interaction", "interaction with the founders", "call with founders"
+]
+
+MENTORSHIP_KEYWORDS = ["mentor", "mentorship", "hands-on learning", "learning and mentorship"]
+
+STIPEND_KEYWORDS = ["stipend"]
+
+NO_FEE_KEYWORDS = ["no fees", "no fee", "no payment", "no charges", "no registration fee"]
+
+CAREERS_KEYWORDS = ["careers"]
+HTTPS_MARKERS = ["https://"]
+EMAIL_MARKERS = ["@"]
+FREE_EMAIL_MARKERS = ["@gmail.com", "@yahoo.com", "@outlook.com", "@hotmail.com"]
+
+
+# ---------- MATCHER CATEGORIES ----------
+
+KEYWORD_CATEGORIES = {
+    "hard_urgency": HARD_URGENCY_WORDS,
+    "scarcity": SCARCITY_WORDS,
+    "manipulation": MANIPULATION_PHRASES,
+    "process": PROCESS_KEYWORDS,
+
+    "payment": PAYMENT_KEYWORDS,
+    "upfront": UPFRONT_KEYWORDS,
+    "payment_negation": PAYMENT_NEGATION_PHRASES,
+
+    "intake_payment": INTAKE_PAYMENT_KEYWORDS,
+    "intake_urgency": INTAKE_URGENCY_KEYWORDS,
+
+    "structure_process": STRUCTURE_PROCESS_KEYWORDS,
+    "mentorship": MENTORSHIP_KEYWORDS,
+    "stipend": STIPEND_KEYWORDS,
+    "no_fee": NO_FEE_KEYWORDS,
+    "careers": CAREERS_KEYWORDS,
+    "https": HTTPS_MARKERS,
+    "email": EMAIL_MARKERS,
+    "free_email": FREE_EMAIL_MARKERS,
+}
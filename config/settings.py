@@ -25,9 +25,29 @@ BEHAVIOR_AGENT_MAX_SCORE = 30
 ML_SCORE_SCALING = 20  # Used only if probability-based ML scoring is enabled
 ML_MODEL_PATH = "ml/model.pkl"
 ML_VECTORIZER_PATH = "ml/vectorizer.pkl"
+ML_SCORER_PATH = "ml/linear_scorer"  # mmap-able term table directory (python -m ml.linear_scorer)
+ML_RELOAD_CHECK_SECONDS = 5  # how often the model registry re-stats artifacts
+
+# ---------- AGENT SCHEDULING ----------
+AGENT_POOL_WORKERS = 8
+AGENT_TIMEOUTS = {       # seconds per agent before its result is marked degraded
+    "company": 8,
+    "payment": 2,
+    "behavior": 2,
+    "ml": 5,
+}
 
 # ---------- DATABASE ----------
 DATABASE_PATH = "database/safe_intern.db"
+SQLITE_BUSY_TIMEOUT_MS = 5000        # wait this long for a lock before "database is locked"
+SQLITE_STATEMENT_CACHE_SIZE = 128    # prepared statements kept per connection
+
+# ---------- ANALYTICS (write-behind pattern / company stats) ----------
+ANALYTICS_ENABLED = True
+ANALYTICS_QUEUE_MAX_EVENTS = 10000       # bounded hand-off queue from the planner
+ANALYTICS_ENQUEUE_TIMEOUT_SECONDS = 0.05  # back-pressure wait before an event is dropped
+ANALYTICS_FLUSH_MAX_EVENTS = 500         # flush after this many events ...
+ANALYTICS_FLUSH_INTERVAL_SECONDS = 2.0   # ... or this long, whichever comes first
 
 # ---------- LLM SETTINGS (CREWAI + OPENROUTER) ----------
 LLM_ENABLED = True
@@ -37,7 +57,77 @@ LLM_TEMPERATURE = 0.0
 LLM_MAX_TOKENS = 512
 LLM_TIMEOUT = 15
 LLM_JSON_ONLY = True
+INTAKE_CONFIDENCE_THRESHOLD = 0.7   # deterministic intake at/above this skips the LLM
+INTAKE_FAST_PATH_MAX_CHARS = 2000   # longer texts always count as ambiguous
+INTAKE_CACHE_MAX_ENTRIES = 5000   # cached LLM intake responses (LRU)
+LLM_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+LLM_MAX_CONCURRENCY = 4           # in-flight OpenRouter requests per process
+LLM_RATE_LIMIT_PER_SECOND = 2.0   # token-bucket refill rate
+LLM_RATE_LIMIT_BURST = 4          # token-bucket capacity
+LLM_MAX_RETRIES = 3               # retries on 429 / 5xx / network errors
+LLM_BACKOFF_BASE_SECONDS = 0.5
+LLM_BACKOFF_MAX_SECONDS = 8.0
+
+# ---------- NEAR-DUPLICATE INDEX (forwarded messages) ----------
+NEAR_DUP_ENABLED = True
+NEAR_DUP_THRESHOLD = 0.85          # estimated Jaccard similarity to reuse a result
+NEAR_DUP_NUM_PERM = 128            # MinHash permutations (signature length)
+NEAR_DUP_BANDS = 16                # LSH bands (NUM_PERM / BANDS rows each)
+NEAR_DUP_SHINGLE_WORDS = 3         # word n-gram shingles
+NEAR_DUP_MIN_SHINGLES = 8          # shorter messages are not indexed
+NEAR_DUP_MAX_ENTRIES = 2000        # in-memory and stored entries (LRU)
+NEAR_DUP_TTL_SECONDS = 6 * 3600    # results older than this are re-analyzed
+
+# ---------- RESULT CACHE (guarded outputs) ----------
+RESULT_CACHE_ENABLED = True
+RESULT_CACHE_MEMORY_ENTRIES = 512     # in-process LRU in front of SQLite
+RESULT_CACHE_MAX_ENTRIES = 20000      # stored rows (LRU)
+RESULT_CACHE_TTL_SECONDS = 6 * 3600   # website checks inside a result go stale
+
+# ---------- SINGLEFLIGHT (concurrent identical analyses) ----------
+SINGLEFLIGHT_ENABLED = True
+SINGLEFLIGHT_WAIT_TIMEOUT_SECONDS = 60   # a waiter computes on its own after this
+SINGLEFLIGHT_HISTORY_SIZE = 100          # recent shared calls kept for inspection
+
+# ---------- TRACING (per-stage latency) ----------
+TRACING_ENABLED = True
+TRACE_DEBUG = False                              # attach the span trace to every output
+TRACE_WINDOW_SIZE = 1024                         # recent calls per stage behind p50 / p95 / p99
+TRACE_METRICS_PATH = "database/stage_latency.prom"   # Prometheus text-format stage summaries
+TRACE_METRICS_DUMP_SECONDS = 15                  # rewrite interval (0 = only on write_metrics())
+
+# ---------- PROFILING (sampled requests) ----------
+PROFILE_SAMPLE_RATE = 0.0          # fraction of requests profiled (env SAFE_INTERN_PROFILE_RATE)
+PROFILE_MEMORY = False             # also tracemalloc sampled requests (env SAFE_INTERN_PROFILE_MEMORY=1)
+PROFILE_DIR = "database/profiles"  # .prof / .alloc.txt files (python -m utils.profiling)
+PROFILE_MAX_FILES = 200            # newest profiles kept
+PROFILE_TOP_ALLOCATIONS = 25       # allocation sites per report
+
+# ---------- GUARDRAILS ----------
+GUARDRAIL_CACHE_SIZE = 4096   # memoized sanitized strings (explanation templates repeat)
 
 # ---------- GENERAL ----------
 DEFAULT_LANGUAGE = "en"
 WEB_REQUEST_TIMEOUT = 5
+
+# ---------- PDF EXTRACTION ----------
+PDF_MAX_PAGES = 50              # pages read at most per document
+PDF_TIME_BUDGET_SECONDS = 10    # stop starting new pages after this
+PDF_PARALLEL_MIN_PAGES = 24     # documents this long use the process pool
+PDF_PARALLEL_WORKERS = 4
+PDF_PAGES_PER_TASK = 8          # page range per worker task
+
+# ---------- URL FETCH (intake) ----------
+URL_FETCH_MAX_BYTES = 2 * 1024 * 1024   # stop reading the page body after this
+
+# ---------- WEBSITE REACHABILITY PROBE ----------
+PROBE_CONNECT_TIMEOUT = 3     # seconds to establish the TCP/TLS connection
+PROBE_READ_TIMEOUT = 5        # seconds to wait for the server to answer
+PROBE_MAX_BYTES = 4096        # body bytes read by the GET fallback
+PROBE_POOL_SIZE = 10          # keep-alive connections per host, per thread
+
+# ---------- DOMAIN CACHE (company_risk_stats) ----------
+DOMAIN_CACHE_TTL_SECONDS = 6 * 3600           # reachable answers are fresh this long
+DOMAIN_CACHE_NEGATIVE_TTL_SECONDS = 10 * 60   # unreachable answers expire sooner
+DOMAIN_CACHE_MAX_STALE_SECONDS = 7 * 86400    # older than this: probe synchronously
+DOMAIN_CACHE_REFRESH_WORKERS = 2
@@ -0,0 +1,260 @@
+# config/signals.py
+"""
+Signal codes for SAFE-INTERN.
+
+Agents report what they found as typed codes (+ parameters) instead of
+English sentences. This registry is the single place that maps a code to:
+- the section it belongs to (company / payment / behavior / ml / structure / trust)
+- the risk-score breakdown bucket it feeds and its point contribution
+- a short label (logs, analytics) and the user-facing explanation template
+
+utils/risk_engine and utils/explanation_engine only do lookups here;
+display text is produced at the edge (explanation engine / describe()).
+
+NO scoring logic beyond the point table
+NO user data
+"""
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Any, Iterable, List, Optional
+
+
+class SignalCode(str, Enum):
+    # company agent
+    TRUSTED_DOMAIN = "trusted_domain"
+    SUSPICIOUS_TLD = "suspicious_tld"
+    KEYWORD_DOMAIN = "keyword_domain"
+    HTTP_ONLY = "http_only"
+    WEBSITE_UNREACHABLE = "website_unreachable"
+    WEBSITE_SERVER_ERROR = "website_server_error"
+    FREE_EMAIL_DOMAIN = "free_email_domain"
+    EMAIL_DOMAIN_MISMATCH = "email_domain_mismatch"
+
+    # payment agent
+    PAYMENT_LANGUAGE = "payment_language"
+    UPFRONT_PAYMENT = "upfront_payment"
+    PAYMENT_AMOUNT = "payment_amount"
+    PAYMENT_NEGATED = "payment_negated"
+
+    # behavior agent
+    HARD_URGENCY = "hard_urgency"
+    SCARCITY = "scarcity"
+    MANIPULATION = "manipulation"
+    NO_SELECTION_PROCESS = "no_selection_process"
+
+    # ml agent
+    ML_LOW = "ml_low"
+    ML_MEDIUM = "ml_medium"
+    ML_HIGH = "ml_high"
+
+    # text-level legitimacy cues (risk engine, from the keyword scan)
+    PROCESS_STRUCTURE = "process_structure"
+    MENTORSHIP = "mentorship"
+    STIPEND = "stipend"
+    NO_FEE_STATED = "no_fee_stated"
+    CAREERS_PORTAL = "careers_portal"
+    COMPANY_EMAIL = "company_email"
+
+
+@dataclass(frozen=True)
+class Signal:
+    code: SignalCode
+    params: Dict[str, Any] = field(default_factory=dict, hash=False)
+
+
+@dataclass(frozen=True)
+class SignalSpec:
+    section: str                  # company | payment | behavior | ml | structure | trust
+    bucket: Optional[str]         # breakdown key the points go to (None = explanation only)
+    points: int
+    label: str
+    explanation: Optional[str]    # str.format template over params; None = not shown
+
+
+# ---------- SCORE BUCKETS ----------
+
+# breakdown keys in display order ("ml" is computed from the probability)
+BREAKDOWN_KEYS = ("financial", "pressure", "company", "company_trust", "ml", "structure_bonus", "trust_bonus")
+
+# a bucket never adds more than this, however many signals feed it
+BUCKET_CAPS = {
+    "financial": 45,
+    "pressure": 45,
+    "company": 15,
+}
+
+
+# ---------- REGISTRY ----------
+
+SIGNALS: Dict[SignalCode, SignalSpec] = {
+    # company
+    SignalCode.TRUSTED_DOMAIN: SignalSpec(
+        "company", "company_trust", -25,
+        "Recognized well-known company domain (trust signal)",
+        None,
+    ),
+    SignalCode.SUSPICIOUS_TLD: SignalSpec(
+        "company", "company", 15,
+        "Website uses a higher-risk domain extension (TLD)",
+        "The website uses a domain extension that is common among short-lived sites, which may require additional verification.",
+    ),
+    SignalCode.KEYWORD_DOMAIN: SignalSpec(
+        "company", "company", 15,
+        "Domain name contains recruitment/payment keywords",
+        "The website domain name contains recruitment or payment keywords, which can be misleading.",
+    ),
+    SignalCode.HTTP_ONLY: SignalSpec(
+        "company", None, 0,
+        "Website link uses HTTP (not HTTPS)",
+        "The company website does not use HTTPS, which is less common for established organizations.",
+    ),
+    SignalCode.WEBSITE_UNREACHABLE: SignalSpec(
+        "company", None, 0,
+        "Website could not be reached (network/timeout)",
+        "The company website could not be reached, which may make verification difficult.",
+    ),
+    SignalCode.WEBSITE_SERVER_ERROR: SignalSpec(
+        "company", None, 0,
+        "Website server error (could not verify reliably)",
+        "The company website returned a server error, so it could not be verified reliably.",
+    ),
+    SignalCode.FREE_EMAIL_DOMAIN: SignalSpec(
+        "company", None, 0,
+        "Free email domain used for communication",
+        "Communication appears to use a free email domain rather than an official company domain.",
+    ),
+    SignalCode.EMAIL_DOMAIN_MISMATCH: SignalSpec(
+        "company", "company", 15,
+        "Email domain does not match website domain",
+        "The email domain does not match the website domain, which may require additional verification.",
+    ),
+
+    # payment
+    SignalCode.PAYMENT_LANGUAGE: SignalSpec(
+        "payment", "financial", 45,
+        "Payment-related language detected",
+        "Payment-related terms are mentioned ({terms}), which may require careful verification.",
+    ),
+    SignalCode.UPFRONT_PAYMENT: SignalSpec(
+        "payment", "financial", 45,
+        "Payment appears to be requested before internship starts",
+        "Payment is requested before the internship begins, which is uncommon and may require careful verification.",
+    ),
+    SignalCode.PAYMENT_AMOUNT: SignalSpec(
+        "payment", "financial", 45,
+        "Specific payment amount mentioned",
+        "A specific payment amount is mentioned in the communication.",
+    ),
+    SignalCode.PAYMENT_NEGATED: SignalSpec(
+        "payment", None, 0,
+        "Explicitly states no fees/payment involved (trust signal)",
+        None,
+    ),
+
+    # behavior
+    SignalCode.HARD_URGENCY: SignalSpec(
+        "behavior", "pressure", 20,
+        "Strong urgency / pressure language detected",
+        "Urgency-focused language is used, which may encourage rushed decision-making.",
+    ),
+    SignalCode.SCARCITY: SignalSpec(
+        "behavior", "pressure", 6,
+        "Scarcity language detected (limited slots)",
+        "Limited-availability language is used, which can add pressure to decide quickly.",
+    ),
+    SignalCode.MANIPULATION: SignalSpec(
+        "behavior", "pressure", 25,
+        "Manipulative or guaranteed outcome language detected",
+        "Certain phrases suggest guaranteed outcomes or simplified processes, which may warrant caution.",
+    ),
+    SignalCode.NO_SELECTION_PROCESS: SignalSpec(
+        "behavior", "pressure", 10,
+        "No clear interview or selection process mentioned",
+        "No clear interview or selection process is described.",
+    ),
+
+    # ml (points come from the probability, see risk_engine)
+    SignalCode.ML_LOW: SignalSpec(
+        "ml", None, 0,
+        "ML similarity: low",
+        "Language patterns are similar to lower-risk internship communications.",
+    ),
+    SignalCode.ML_MEDIUM: SignalSpec(
+        "ml", None, 0,
+        "ML similarity: medium",
+        "Some language patterns resemble those found in higher-risk communications.",
+    ),
+    SignalCode.ML_HIGH: SignalSpec(
+        "ml", None, 0,
+        "ML similarity: high",
+        "The language shows multiple patterns commonly associated with higher-risk internship messages.",
+    ),
+
+    # legitimacy structure
+    SignalCode.PROCESS_STRUCTURE: SignalSpec(
+        "structure", "structure_bonus", -20,
+        "Interview / selection process described",
+        None,
+    ),
+    SignalCode.MENTORSHIP: SignalSpec(
+        "structure", "structure_bonus", -8,
+        "Mentorship / learning mentioned",
+        None,
+    ),
+    SignalCode.STIPEND: SignalSpec(
+        "structure", "structure_bonus", -5,
+        "Stipend mentioned",
+        None,
+    ),
+
+    # trust / green signals
+    SignalCode.NO_FEE_STATED: SignalSpec(
+        "trust", "trust_bonus", -30,
+        "States that no fee is charged",
+        None,
+    ),
+    SignalCode.CAREERS_PORTAL: SignalSpec(
+        "trust", "trust_bonus", -10,
+        "Official careers portal (HTTPS) referenced",
+        None,
+    ),
+    SignalCode.COMPANY_EMAIL: SignalSpec(
+        "trust", "trust_bonus", -5,
+        "Email from a non-free domain",
+        None,
+    ),
+}
+
+_missing = set(SignalCode) - set(SIGNALS)
+if _missing:
+    raise ValueError(f"Signal codes without a registry entry: {sorted(c.value for c in _missing)}")
+
+
+# ---------- HELPERS ----------
+
+def spec(code: SignalCode) -> SignalSpec:
+    return SIGNALS[code]
+
+
+def explain(signal: Signal) -> Optional[str]:
+    """
+    User-facing sentence for a signal (None if the code is not shown).
+    """
+    template = SIGNALS[signal.code].explanation
+    if template is None:
+        return None
+    params = {k: ", ".join(v) if isinstance(v, (list, tuple)) else v for k, v in signal.params.items()}
+    return template.format(**params)
+
+
+def describe(signals: Iterable[Signal]) -> List[str]:
+    """
+    Short labels (with parameters) for logs / debugging.
+    """
+    out = []
+    for s in signals:
+        label = SIGNALS[s.code].label
+        terms = s.params.get("terms")
+        out.append(f"{label}: {', '.join(terms)}" if terms else label)
+    return out
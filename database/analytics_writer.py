@@ -0,0 +1,251 @@
+# database/analytics_writer.py
+"""
+Write-behind analytics writer for SAFE-INTERN.
+
+Responsibilities:
+- Accept pattern / company events from the request path without touching
+  the database (bounded in-memory queue)
+- Coalesce repeated events into counters on a background thread
+- Flush counters in one transaction with batched UPSERTs
+  (pattern_repository.add_pattern_counts / company_repository.add_company_counts)
+  once ANALYTICS_FLUSH_MAX_EVENTS events are pending or
+  ANALYTICS_FLUSH_INTERVAL_SECONDS have passed
+- Drain and flush everything still queued at interpreter exit
+
+If a flush fails (e.g. tables not created yet) the counters are kept and
+retried on the next trigger.
+
+NO risk scoring
+NO user-facing logic
+"""
+
+from collections import Counter
+from typing import Dict, Any, List, Optional
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+
+from config.settings import (
+    ANALYTICS_ENABLED,
+    ANALYTICS_QUEUE_MAX_EVENTS,
+    ANALYTICS_ENQUEUE_TIMEOUT_SECONDS,
+    ANALYTICS_FLUSH_MAX_EVENTS,
+    ANALYTICS_FLUSH_INTERVAL_SECONDS,
+)
+from database import pattern_repository, company_repository
+from database.db_connection import transaction
+
+
+_STOP = object()
+
+_queue: "queue.Queue" = queue.Queue(maxsize=ANALYTICS_QUEUE_MAX_EVENTS)
+_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats = {"enqueued": 0, "dropped": 0, "flushed_events": 0, "flushes": 0, "failed_flushes": 0}
+
+
+# ---------- COALESCED STATE (writer thread only) ----------
+
+class _Pending:
+    def __init__(self):
+        self.patterns: Counter = Counter()
+        self.companies: Dict[str, List[int]] = {}
+        self.events = 0
+
+    def add(self, event: tuple) -> None:
+        kind, payload = event
+        if kind == "pattern":
+            self.patterns[payload] += 1
+        else:
+            domain, uses_free_email, unreachable = payload
+            row = self.companies.setdefault(domain, [0, 0, 0])
+            row[0] += 1
+            row[1] += uses_free_email
+            row[2] += unreachable
+        self.events += 1
+
+    def flush(self) -> bool:
+        """
+        Write the counters; False (counters kept) if the write failed.
+        """
+        if not self.events:
+            return True
+
+        try:
+            with transaction():
+                if self.patterns:
+                    pattern_repository.add_pattern_counts(
+                        (ptype, key, n) for (ptype, key), n in self.patterns.items()
+                    )
+                if self.companies:
+                    company_repository.add_company_counts(
+                        (domain, *row) for domain, row in self.companies.items()
+                    )
+        except sqlite3.Error:
+            # keep the counters; next trigger retries
+            _count("failed_flushes")
+            return False
+
+        _count("flushes")
+        _count("flushed_events", self.events)
+        self.patterns.clear()
+        self.companies.clear()
+        self.events = 0
+        return True
+
+
+class _FlushRequest:
+    """
+    An explicit flush() call: the writer records whether the write
+    succeeded, then wakes the caller.
+    """
+
+    __slots__ = ("done", "ok")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = False
+
+    def finish(self, ok: bool) -> None:
+        self.ok = ok
+        self.done.set()
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += n
+
+
+# ---------- WRITER THREAD ----------
+
+def _run() -> None:
+    pending = _Pending()
+    deadline = time.monotonic() + ANALYTICS_FLUSH_INTERVAL_SECONDS
+    stopping = False
+
+    while not stopping:
+        try:
+            item = _queue.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            item = None
+
+        if item is _STOP:
+            stopping = True
+        elif isinstance(item, _FlushRequest):
+            # explicit flush() request: write now, then wake the caller
+            item.finish(pending.flush())
+            continue
+        elif item is not None:
+            pending.add(item)
+
+        if stopping or pending.events >= ANALYTICS_FLUSH_MAX_EVENTS or time.monotonic() >= deadline:
+            pending.flush()
+            deadline = time.monotonic() + ANALYTICS_FLUSH_INTERVAL_SECONDS
+
+    # events enqueued by other threads after the stop marker
+    requests = []
+    while True:
+        try:
+            item = _queue.get_nowait()
+        except queue.Empty:
+            break
+        if isinstance(item, _FlushRequest):
+            requests.append(item)
+        elif item is not _STOP:
+            pending.add(item)
+    ok = pending.flush()
+    for request in requests:
+        request.finish(ok)
+
+
+def _ensure_started() -> None:
+    global _thread
+    if _thread is not None:
+        return
+    with _thread_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name="safe-intern-analytics", daemon=True)
+            _thread.start()
+
+
+def _enqueue(event) -> None:
+    if not ANALYTICS_ENABLED:
+        return
+    _ensure_started()
+    try:
+        _queue.put(event, timeout=ANALYTICS_ENQUEUE_TIMEOUT_SECONDS)
+        _count("enqueued")
+    except queue.Full:
+        # writer cannot keep up: never stall the analysis for statistics
+        _count("dropped")
+
+
+# ---------- PUBLIC API ----------
+
+def record_pattern_event(pattern_type: str, pattern_key: str) -> None:
+    """
+    Queue one occurrence of a risk pattern.
+
+    Args:
+        pattern_type: company | payment | behavior | ml
+        pattern_key: rule name or signal identifier
+    """
+    _enqueue(("pattern", (pattern_type, pattern_key)))
+
+
+def record_company_event(
+    domain: str,
+    uses_free_email: bool = False,
+    website_reachable: Optional[bool] = None
+) -> None:
+    """
+    Queue one analysis of a company/domain.
+
+    Args:
+        domain: Company website or email domain
+        uses_free_email: Whether a free email domain was detected
+        website_reachable: Probe outcome (None = no website checked)
+    """
+    _enqueue(("company", (domain, int(bool(uses_free_email)), int(website_reachable is False))))
+
+
+def flush(timeout: float = 5.0) -> bool:
+    """
+    Write everything queued so far and wait for it.
+
+    Returns:
+        True if the writer wrote everything within timeout; False on
+        timeout or if the write failed (the counters are kept and retried)
+    """
+    if _thread is None:
+        return True
+    request = _FlushRequest()
+    _queue.put(request)
+    return request.done.wait(timeout) and request.ok
+
+
+def shutdown(timeout: float = 10.0) -> None:
+    """
+    Stop the writer after draining the queue (registered with atexit).
+    """
+    global _thread
+    with _thread_lock:
+        thread, _thread = _thread, None
+    if thread is None:
+        return
+    _queue.put(_STOP)
+    thread.join(timeout)
+
+
+def writer_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["queued"] = _queue.qsize()
+    return stats
+
+
+atexit.register(shutdown)
@@ -16,8 +16,8 @@ NO risk scoring
 NO user-facing logic
 """
 
-from typing import Optional, Dict, Any
-from database.db_connection import get_db_connection
+from typing import Iterable, Optional, Dict, Any, Tuple
+from database.db_connection import get_db_connection, transaction
 
 
 # ---------- CREATE / UPDATE COMPANY ----------
@@ -35,59 +35,62 @@ def record_company(
         uses_free_email: Whether a free email domain was detected
         website_reachable: Whether website was reachable at analysis time
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT id FROM company_risk_stats
-        WHERE domain = ?
-        """,
-        (domain,)
-    )
-
-    row = cursor.fetchone()
-
-    if row:
-        # Update existing record
-        cursor.execute(
+    with transaction() as conn:
+        conn.execute(
             """
-            UPDATE company_risk_stats
-            SET 
+            INSERT INTO company_risk_stats (
+                domain,
+                total_checks,
+                free_email_hits,
+                unreachable_hits,
+                first_seen,
+                last_seen
+            )
+            VALUES (?, 1, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            ON CONFLICT(domain)
+            DO UPDATE SET
                 total_checks = total_checks + 1,
-                free_email_hits = free_email_hits + ?,
-                unreachable_hits = unreachable_hits + ?,
+                free_email_hits = free_email_hits + excluded.free_email_hits,
+                unreachable_hits = unreachable_hits + excluded.unreachable_hits,
                 last_seen = CURRENT_TIMESTAMP
-            WHERE id = ?
             """,
             (
+                domain,
                 1 if uses_free_email else 0,
-                0 if website_reachable else 1,
-                row[0]
+                0 if website_reachable else 1
             )
         )
-    else:
-        # Insert new company record
-        cursor.execute(
+
+
+def add_company_counts(counts: Iterable[Tuple[str, int, int, int]]) -> None:
+    """
+    Add pre-aggregated company statistics in one batch (analytics writer).
+
+    Args:
+        counts: (domain, checks, free_email_hits, unreachable_hits) rows
+    """
+    with transaction() as conn:
+        conn.executemany(
             """
             INSERT INTO company_risk_stats (
                 domain,
                 total_checks,
                 free_email_hits,
-                unreachable_hits
+                unreachable_hits,
+                first_seen,
+                last_seen
             )
-            VALUES (?, 1, ?, ?)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            ON CONFLICT(domain)
+            DO UPDATE SET
+                total_checks = total_checks + excluded.total_checks,
+                free_email_hits = free_email_hits + excluded.free_email_hits,
+                unreachable_hits = unreachable_hits + excluded.unreachable_hits,
+                last_seen = CURRENT_TIMESTAMP
             """,
-            (
-                domain,
-                1 if uses_free_email else 0,
-                0 if website_reachable else 1
-            )
+            counts
         )
 
-    conn.commit()
-    conn.close()
-
 
 # ---------- QUERY HELPERS ----------
 
@@ -120,7 +123,6 @@ def get_company_stats(domain: str) -> Optional[Dict[str, Any]]:
     )
 
     row = cursor.fetchone()
-    conn.close()
 
     if not row:
         return None
@@ -133,3 +135,87 @@ def get_company_stats(domain: str) -> Optional[Dict[str, Any]]:
         "first_seen": row[4],
         "last_seen": row[5]
     }
+
+
+# ---------- DOMAIN REACHABILITY CACHE ----------
+
+def get_domain_check(domain: str) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve the last stored reachability check for a domain.
+
+    Args:
+        domain: Website domain
+
+    Returns:
+        Dictionary with website_reachable, uses_https, status_code,
+        last_checked and age_seconds, or None if never checked
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """
+        SELECT
+            website_reachable,
+            uses_https,
+            status_code,
+            last_checked,
+            CAST(strftime('%s', 'now') - strftime('%s', last_checked) AS INTEGER)
+        FROM company_risk_stats
+        WHERE domain = ? AND website_reachable IS NOT NULL
+        """,
+        (domain,)
+    )
+
+    row = cursor.fetchone()
+
+    if not row:
+        return None
+
+    return {
+        "website_reachable": bool(row[0]),
+        "uses_https": bool(row[1]),
+        "status_code": row[2],
+        "last_checked": row[3],
+        "age_seconds": row[4]
+    }
+
+
+def save_domain_check(
+    domain: str,
+    website_reachable: bool,
+    uses_https: bool,
+    status_code: Optional[int]
+) -> None:
+    """
+    Store the outcome of a live reachability check for a domain.
+
+    Args:
+        domain: Website domain
+        website_reachable: Whether the site answered
+        uses_https: Whether the final URL used HTTPS
+        status_code: HTTP status of the final response (None if unreachable)
+    """
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            INSERT INTO company_risk_stats (
+                domain,
+                website_reachable,
+                uses_https,
+                status_code,
+                last_checked,
+                first_seen
+            )
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            ON CONFLICT(domain)
+            DO UPDATE SET
+                website_reachable = excluded.website_reachable,
+                uses_https = excluded.uses_https,
+                status_code = excluded.status_code,
+                last_checked = CURRENT_TIMESTAMP
+            """,
+            (domain, int(website_reachable), int(uses_https), status_code)
+        )
@@ -6,35 +6,125 @@ Responsibilities:
 - Create and manage SQLite database connections
 - Ensure foreign key support
 - Provide a single, reusable connection interface
+- Group several writes into one transaction
+
+Connections are persistent, one per thread and database file
+(sqlite3 connections must not be shared across threads). Each is opened
+once in WAL mode with a busy timeout, so readers do not block the writer
+and concurrent sessions wait for the lock instead of failing. Reusing
+the connection also reuses sqlite3's per-connection prepared-statement
+cache.
+
+Repositories must NOT close the connection returned here.
+
+The database file is runtime state (not tracked in git). Tests and
+scripts point SAFE_INTERN_DB_PATH at a scratch file so they never touch
+database/safe_intern.db.
 
 NO business logic
 NO queries
 """
 
-import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, Optional
+import os
+import sqlite3
+import threading
+
+from config.settings import (
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_STATEMENT_CACHE_SIZE,
+)
+
+# Database file path (SAFE_INTERN_DB_PATH overrides, e.g. for tests)
+DB_PATH = Path(os.environ.get("SAFE_INTERN_DB_PATH") or Path(__file__).parent / "safe_intern.db")
+
+_local = threading.local()
+
+
+def _open(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        path,
+        timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+        cached_statements=SQLITE_STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row  # Access columns by name
+
+    # WAL: readers and the single writer no longer block each other
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute(f"PRAGMA busy_timeout = {int(SQLITE_BUSY_TIMEOUT_MS)};")
+
+    # Enable foreign key constraints
+    conn.execute("PRAGMA foreign_keys = ON;")
+
+    return conn
 
-# Database file path
-DB_PATH = Path(__file__).parent / "safe_intern.db"
+
+def _connections() -> Dict[Path, sqlite3.Connection]:
+    conns = getattr(_local, "connections", None)
+    if conns is None:
+        conns = _local.connections = {}
+    return conns
 
 
 def get_db_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
     """
-    Create and return a SQLite database connection.
+    Return this thread's SQLite connection, opening it on first use.
 
     Args:
         db_path: Optional custom database path (defaults to safe_intern.db)
 
     Returns:
-        sqlite3.Connection object
+        sqlite3.Connection object (shared within the thread; do not close)
     """
-    path = db_path if db_path else DB_PATH
+    path = Path(db_path if db_path else DB_PATH)
 
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row  # Access columns by name
+    conns = _connections()
+    conn = conns.get(path)
+    if conn is None:
+        conn = conns[path] = _open(path)
+    return conn
 
-    # Enable foreign key constraints
-    conn.execute("PRAGMA foreign_keys = ON;")
 
-    return conn
+@contextmanager
+def transaction(db_path: Optional[Path] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Run a group of writes atomically on this thread's connection.
+
+    The outermost block starts an IMMEDIATE transaction (takes the write
+    lock up front, so it waits on busy_timeout rather than failing on
+    upgrade), commits on success and rolls back on error. Nested blocks
+    join the enclosing transaction.
+
+    Usage:
+        with transaction() as conn:
+            conn.execute(...)
+            conn.execute(...)
+    """
+    conn = get_db_connection(db_path)
+
+    if conn.in_transaction:
+        yield conn
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+
+def close_db_connection(db_path: Optional[Path] = None) -> None:
+    """
+    Close this thread's connection (e.g. before deleting the DB file).
+    """
+    path = Path(db_path if db_path else DB_PATH)
+
+    conn = _connections().pop(path, None)
+    if conn is not None:
+        conn.close()
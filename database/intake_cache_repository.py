@@ -0,0 +1,125 @@
+# database/intake_cache_repository.py
+"""
+Intake cache repository for SAFE-INTERN.
+
+Responsibilities:
+- Store structured LLM intake responses keyed by content hash
+- Track last use for size-bounded (LRU) eviction
+- Drop entries produced by a different model / prompt version
+
+NO LLM calls
+NO user-facing logic
+"""
+
+from typing import Optional
+from database.db_connection import get_db_connection, transaction
+
+
+# ---------- READ ----------
+
+def get_cached_response(cache_key: str) -> Optional[str]:
+    """
+    Fetch a cached intake response and mark it as recently used.
+
+    Args:
+        cache_key: Hash of normalized text + model + prompt version
+
+    Returns:
+        Stored JSON string or None
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """
+        SELECT response FROM intake_cache
+        WHERE cache_key = ?
+        """,
+        (cache_key,)
+    )
+
+    row = cursor.fetchone()
+
+    if row:
+        with transaction():
+            cursor.execute(
+                """
+                UPDATE intake_cache
+                SET last_used_at = CURRENT_TIMESTAMP, hits = hits + 1
+                WHERE cache_key = ?
+                """,
+                (cache_key,)
+            )
+
+    return row[0] if row else None
+
+
+# ---------- WRITE ----------
+
+def store_response(
+    cache_key: str,
+    model: str,
+    prompt_version: str,
+    response: str,
+    max_entries: int
+) -> None:
+    """
+    Insert/replace a cached response and evict least recently used
+    entries beyond max_entries.
+
+    Args:
+        cache_key: Hash of normalized text + model + prompt version
+        model: LLM model name used
+        prompt_version: Hash of the system prompt used
+        response: JSON string of the structured intake
+        max_entries: Upper bound on cached rows
+    """
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            INSERT INTO intake_cache (cache_key, model, prompt_version, response)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(cache_key)
+            DO UPDATE SET
+                response = excluded.response,
+                last_used_at = CURRENT_TIMESTAMP
+            """,
+            (cache_key, model, prompt_version, response)
+        )
+
+        cursor.execute(
+            """
+            DELETE FROM intake_cache
+            WHERE cache_key IN (
+                SELECT cache_key FROM intake_cache
+                ORDER BY last_used_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (max_entries,)
+        )
+
+
+def purge_other_versions(model: str, prompt_version: str) -> int:
+    """
+    Delete entries created with a different model or prompt.
+
+    Returns:
+        Number of deleted rows
+    """
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            DELETE FROM intake_cache
+            WHERE model != ? OR prompt_version != ?
+            """,
+            (model, prompt_version)
+        )
+
+        deleted = cursor.rowcount
+
+    return deleted
@@ -19,7 +19,7 @@ NO decision logic
 """
 
 from typing import Optional, Dict, Any
-from database.db_connection import get_db_connection
+from database.db_connection import get_db_connection, transaction
 
 
 # ---------- INSERT / UPDATE METADATA ----------
@@ -37,29 +37,26 @@ def upsert_metadata(
         value: Metadata value
         description: Optional human-readable description
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        INSERT INTO metadata (
-            key,
-            value,
-            description,
-            updated_at
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            INSERT INTO metadata (
+                key,
+                value,
+                description,
+                updated_at
+            )
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(key)
+            DO UPDATE SET
+                value = excluded.value,
+                description = excluded.description,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (key, value, description)
         )
-        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(key)
-        DO UPDATE SET
-            value = excluded.value,
-            description = excluded.description,
-            updated_at = CURRENT_TIMESTAMP
-        """,
-        (key, value, description)
-    )
-
-    conn.commit()
-    conn.close()
 
 
 # ---------- QUERY HELPERS ----------
@@ -87,7 +84,6 @@ def get_metadata(key: str) -> Optional[Dict[str, Any]]:
     )
 
     row = cursor.fetchone()
-    conn.close()
 
     if not row:
         return None
@@ -119,7 +115,6 @@ def get_all_metadata() -> Dict[str, Dict[str, Any]]:
     )
 
     rows = cursor.fetchall()
-    conn.close()
 
     return {
         row[0]: {
@@ -129,3 +124,46 @@ def get_all_metadata() -> Dict[str, Dict[str, Any]]:
         }
         for row in rows
     }
+
+
+# ---------- ML MODEL METADATA ----------
+
+MODEL_VERSION_KEY = "ml_model_version"
+MODEL_LOADED_AT_KEY = "ml_model_loaded_at"
+MODEL_LOAD_SECONDS_KEY = "ml_model_load_seconds"
+
+
+def record_model_metadata(
+    model_version: str,
+    loaded_at: str,
+    load_seconds: float
+) -> None:
+    """
+    Record which ML model is being served and how long it took to load.
+
+    Args:
+        model_version: Content hash of the loaded artifacts
+        loaded_at: ISO timestamp of the load
+        load_seconds: Wall time spent unpickling the artifacts
+    """
+    upsert_metadata(MODEL_VERSION_KEY, model_version, "Content hash of ML artifacts in use")
+    upsert_metadata(MODEL_LOADED_AT_KEY, loaded_at, "When the ML artifacts were loaded")
+    upsert_metadata(MODEL_LOAD_SECONDS_KEY, str(load_seconds), "Seconds spent loading ML artifacts")
+
+
+def get_model_metadata() -> Dict[str, Optional[str]]:
+    """
+    Retrieve the last recorded ML model metadata.
+
+    Returns:
+        Dictionary with model_version, loaded_at and load_seconds (None if unknown)
+    """
+    def _value(key: str) -> Optional[str]:
+        row = get_metadata(key)
+        return row["value"] if row else None
+
+    return {
+        "model_version": _value(MODEL_VERSION_KEY),
+        "loaded_at": _value(MODEL_LOADED_AT_KEY),
+        "load_seconds": _value(MODEL_LOAD_SECONDS_KEY),
+    }
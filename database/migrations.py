@@ -0,0 +1,249 @@
+# database/migrations.py
+"""
+Versioned schema migrations for SAFE-INTERN.
+
+Responsibilities:
+- Define the schema as an ordered list of numbered migrations
+- Record the applied version in the database (PRAGMA user_version)
+- Bring databases created by any earlier release up to date
+
+Every migration is idempotent (IF NOT EXISTS / column checks), so a
+database whose tables predate version tracking (user_version = 0)
+converges to the same schema as a fresh one. Each migration runs in its
+own transaction together with the version bump.
+
+NO application logic
+NO data insertion (except carrying existing data forward)
+"""
+
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+import sqlite3
+
+from database.db_connection import get_db_connection, transaction
+
+
+# ---------- HELPERS ----------
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table,)
+    ).fetchone()
+    return row is not None
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> Set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, ddl: str) -> bool:
+    # ALTER TABLE has no IF NOT EXISTS for columns
+    if column in _columns(conn, table):
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+    return True
+
+
+# ---------- MIGRATIONS ----------
+
+def _v1_baseline(conn: sqlite3.Connection) -> None:
+    # tables as created by the original init_database
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS risk_patterns (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pattern_type TEXT NOT NULL,          -- company / payment / behavior / ml
+        pattern_key TEXT NOT NULL,           -- rule or signal name
+        occurrences INTEGER DEFAULT 0,
+        last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS company_risk_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        domain TEXT UNIQUE,
+        total_checks INTEGER DEFAULT 0,
+        high_risk_count INTEGER DEFAULT 0,
+        last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+
+def _v2_metadata_table(conn: sqlite3.Connection) -> None:
+    # metadata_repository always used `metadata`; the old `system_metadata`
+    # table was never read. Carry its rows over, then drop it.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS metadata (
+        key TEXT PRIMARY KEY,
+        value TEXT,
+        description TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+    if _table_exists(conn, "system_metadata"):
+        conn.execute("""
+        INSERT INTO metadata (key, value, updated_at)
+        SELECT key, value, updated_at FROM system_metadata
+        WHERE key IS NOT NULL
+        ON CONFLICT(key) DO NOTHING
+        """)
+        conn.execute("DROP TABLE system_metadata")
+
+
+def _v3_company_stats_columns(conn: sqlite3.Connection) -> None:
+    # columns used by company_repository / the domain cache
+    _add_column(conn, "company_risk_stats", "free_email_hits", "INTEGER DEFAULT 0")
+    _add_column(conn, "company_risk_stats", "unreachable_hits", "INTEGER DEFAULT 0")
+    _add_column(conn, "company_risk_stats", "website_reachable", "INTEGER")
+    _add_column(conn, "company_risk_stats", "uses_https", "INTEGER")
+    _add_column(conn, "company_risk_stats", "status_code", "INTEGER")
+    _add_column(conn, "company_risk_stats", "last_seen", "TIMESTAMP")
+
+    # ADD COLUMN cannot default to CURRENT_TIMESTAMP: writers set it on insert
+    if _add_column(conn, "company_risk_stats", "first_seen", "TIMESTAMP"):
+        conn.execute("""
+        UPDATE company_risk_stats
+        SET first_seen = COALESCE(last_checked, CURRENT_TIMESTAMP)
+        WHERE first_seen IS NULL
+        """)
+
+
+def _v4_unique_risk_patterns(conn: sqlite3.Connection) -> None:
+    # merge duplicate (pattern_type, pattern_key) rows into the oldest one
+    conn.execute("""
+    UPDATE risk_patterns
+    SET
+        occurrences = (
+            SELECT SUM(r.occurrences) FROM risk_patterns r
+            WHERE r.pattern_type = risk_patterns.pattern_type
+              AND r.pattern_key = risk_patterns.pattern_key
+        ),
+        last_seen = (
+            SELECT MAX(r.last_seen) FROM risk_patterns r
+            WHERE r.pattern_type = risk_patterns.pattern_type
+              AND r.pattern_key = risk_patterns.pattern_key
+        )
+    WHERE id IN (
+        SELECT MIN(id) FROM risk_patterns
+        GROUP BY pattern_type, pattern_key
+        HAVING COUNT(*) > 1
+    )
+    """)
+    conn.execute("""
+    DELETE FROM risk_patterns
+    WHERE id NOT IN (
+        SELECT MIN(id) FROM risk_patterns
+        GROUP BY pattern_type, pattern_key
+    )
+    """)
+
+    conn.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_risk_patterns_type_key
+    ON risk_patterns (pattern_type, pattern_key);
+    """)
+
+
+def _v5_intake_cache(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS intake_cache (
+        cache_key TEXT PRIMARY KEY,          -- sha256(text + model + prompt version)
+        model TEXT NOT NULL,
+        prompt_version TEXT NOT NULL,
+        response TEXT NOT NULL,              -- structured intake JSON
+        hits INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+    # LRU eviction orders by last_used_at
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_intake_cache_last_used
+    ON intake_cache (last_used_at);
+    """)
+
+
+def _v6_near_duplicates(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS near_duplicates (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        signature BLOB NOT NULL,             -- MinHash signature (uint32 array)
+        signal_key TEXT NOT NULL,            -- hash of URLs / emails / phones / amounts / lexicon hits
+        version TEXT NOT NULL,               -- model + lexicon version of the output
+        output TEXT NOT NULL,                -- guarded analysis output (JSON)
+        hits INTEGER DEFAULT 0,
+        created_at REAL NOT NULL,            -- unix seconds (TTL)
+        last_used_at REAL NOT NULL           -- unix seconds (LRU)
+    );
+    """)
+
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_near_duplicates_last_used
+    ON near_duplicates (last_used_at);
+    """)
+
+
+def _v7_result_cache(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS result_cache (
+        cache_key TEXT PRIMARY KEY,          -- sha256(cleaned text + result version)
+        version TEXT NOT NULL,               -- model + lexicon + scoring version
+        output TEXT NOT NULL,                -- guarded analysis output (JSON)
+        hits INTEGER DEFAULT 0,
+        created_at REAL NOT NULL,            -- unix seconds (TTL)
+        last_used_at REAL NOT NULL           -- unix seconds (LRU)
+    );
+    """)
+
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_result_cache_last_used
+    ON result_cache (last_used_at);
+    """)
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "baseline tables", _v1_baseline),
+    (2, "metadata table (replaces system_metadata)", _v2_metadata_table),
+    (3, "company_risk_stats counters and reachability columns", _v3_company_stats_columns),
+    (4, "unique index on risk_patterns(pattern_type, pattern_key)", _v4_unique_risk_patterns),
+    (5, "intake_cache table", _v5_intake_cache),
+    (6, "near_duplicates table (MinHash index of analyzed messages)", _v6_near_duplicates),
+    (7, "result_cache table (guarded outputs by text + version)", _v7_result_cache),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# ---------- RUNNER ----------
+
+def get_schema_version(db_path: Optional[Path] = None) -> int:
+    """
+    Return the schema version recorded in the database (0 = untracked).
+    """
+    return get_db_connection(db_path).execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db_path: Optional[Path] = None) -> int:
+    """
+    Apply all pending migrations in order.
+
+    Args:
+        db_path: Optional custom database path (defaults to safe_intern.db)
+
+    Returns:
+        Schema version after migrating
+    """
+    for version, _description, apply in MIGRATIONS:
+        if get_schema_version(db_path) >= version:
+            continue
+
+        with transaction(db_path) as conn:
+            # another process may have applied it while we waited for the lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                continue
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+
+    return get_schema_version(db_path)
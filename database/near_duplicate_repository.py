@@ -0,0 +1,147 @@
+# database/near_duplicate_repository.py
+"""
+Near-duplicate index repository for SAFE-INTERN.
+
+Responsibilities:
+- Persist MinHash signatures of analyzed messages with their guarded output
+- Load the most recently used entries to warm the in-memory index
+- Track last use for size-bounded (LRU) eviction
+- Drop entries produced by a different model / lexicon version
+
+NO hashing / similarity logic (see utils/near_duplicate.py)
+NO user-facing logic
+"""
+
+from typing import Any, Dict, List
+from database.db_connection import get_db_connection, transaction
+
+
+# ---------- READ ----------
+
+def load_recent(version: str, min_created_at: float, limit: int) -> List[Dict[str, Any]]:
+    """
+    Fetch the most recently used entries of one version.
+
+    Args:
+        version: Model + lexicon version the outputs must come from
+        min_created_at: Unix seconds; older entries are expired
+        limit: Maximum number of rows
+
+    Returns:
+        List of entry dicts, most recently used first
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """
+        SELECT id, signature, signal_key, output, created_at
+        FROM near_duplicates
+        WHERE version = ? AND created_at >= ?
+        ORDER BY last_used_at DESC
+        LIMIT ?
+        """,
+        (version, min_created_at, limit)
+    )
+
+    return [
+        {
+            "id": row[0],
+            "signature": row[1],
+            "signal_key": row[2],
+            "output": row[3],
+            "created_at": row[4],
+        }
+        for row in cursor.fetchall()
+    ]
+
+
+# ---------- WRITE ----------
+
+def store_entry(
+    signature: bytes,
+    signal_key: str,
+    version: str,
+    output: str,
+    created_at: float,
+    max_entries: int
+) -> int:
+    """
+    Insert an entry and evict least recently used rows beyond max_entries.
+
+    Args:
+        signature: MinHash signature bytes
+        signal_key: Hash of URLs / emails / phones / amounts / lexicon
+            hits (see utils.near_duplicate.signal_key)
+        version: Model + lexicon version of the output
+        output: Guarded analysis output (JSON)
+        created_at: Unix seconds
+        max_entries: Upper bound on stored rows
+
+    Returns:
+        Row id of the new entry
+    """
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            INSERT INTO near_duplicates
+                (signature, signal_key, version, output, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (signature, signal_key, version, output, created_at, created_at)
+        )
+        entry_id = cursor.lastrowid
+
+        cursor.execute(
+            """
+            DELETE FROM near_duplicates
+            WHERE id IN (
+                SELECT id FROM near_duplicates
+                ORDER BY last_used_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (max_entries,)
+        )
+
+    return entry_id
+
+
+def mark_used(entry_id: int, used_at: float) -> None:
+    """
+    Record a near-duplicate hit on an entry.
+    """
+    with transaction() as conn:
+        conn.execute(
+            """
+            UPDATE near_duplicates
+            SET last_used_at = ?, hits = hits + 1
+            WHERE id = ?
+            """,
+            (used_at, entry_id)
+        )
+
+
+def purge(version: str, min_created_at: float) -> int:
+    """
+    Delete entries of another version or older than min_created_at.
+
+    Returns:
+        Number of deleted rows
+    """
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            DELETE FROM near_duplicates
+            WHERE version != ? OR created_at < ?
+            """,
+            (version, min_created_at)
+        )
+
+        deleted = cursor.rowcount
+
+    return deleted
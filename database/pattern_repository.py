@@ -17,8 +17,8 @@ NO risk decisions
 NO user-facing logic
 """
 
-from typing import Optional
-from database.db_connection import get_db_connection
+from typing import Iterable, Optional, Tuple
+from database.db_connection import get_db_connection, transaction
 
 
 # ---------- CREATE / UPDATE PATTERN ----------
@@ -31,44 +31,41 @@ def record_pattern(pattern_type: str, pattern_key: str) -> None:
         pattern_type: company | payment | behavior | ml
         pattern_key: rule name or signal identifier
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    # Check if pattern already exists
-    cursor.execute(
-        """
-        SELECT id, occurrences FROM risk_patterns
-        WHERE pattern_type = ? AND pattern_key = ?
-        """,
-        (pattern_type, pattern_key)
-    )
-
-    row = cursor.fetchone()
-
-    if row:
-        # Update existing pattern
-        cursor.execute(
+    with transaction() as conn:
+        # one statement: relies on the unique (pattern_type, pattern_key) index
+        conn.execute(
             """
-            UPDATE risk_patterns
-            SET occurrences = occurrences + 1,
+            INSERT INTO risk_patterns (pattern_type, pattern_key, occurrences, last_seen)
+            VALUES (?, ?, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT(pattern_type, pattern_key)
+            DO UPDATE SET
+                occurrences = occurrences + 1,
                 last_seen = CURRENT_TIMESTAMP
-            WHERE id = ?
             """,
-            (row[0],)
+            (pattern_type, pattern_key)
         )
-    else:
-        # Insert new pattern
-        cursor.execute(
+
+
+def add_pattern_counts(counts: Iterable[Tuple[str, str, int]]) -> None:
+    """
+    Add pre-aggregated occurrence counts in one batch (analytics writer).
+
+    Args:
+        counts: (pattern_type, pattern_key, occurrences_to_add) rows
+    """
+    with transaction() as conn:
+        conn.executemany(
             """
-            INSERT INTO risk_patterns (pattern_type, pattern_key, occurrences)
-            VALUES (?, ?, 1)
+            INSERT INTO risk_patterns (pattern_type, pattern_key, occurrences, last_seen)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(pattern_type, pattern_key)
+            DO UPDATE SET
+                occurrences = occurrences + excluded.occurrences,
+                last_seen = CURRENT_TIMESTAMP
             """,
-            (pattern_type, pattern_key)
+            counts
         )
 
-    conn.commit()
-    conn.close()
-
 
 # ---------- QUERY HELPERS ----------
 
@@ -95,7 +92,6 @@ def get_pattern_occurrences(pattern_type: str, pattern_key: str) -> int:
     )
 
     row = cursor.fetchone()
-    conn.close()
 
     return row[0] if row else 0
 
@@ -124,5 +120,4 @@ def get_top_patterns(limit: int = 10):
     )
 
     rows = cursor.fetchall()
-    conn.close()
     return rows
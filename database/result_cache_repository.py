@@ -0,0 +1,128 @@
+# database/result_cache_repository.py
+"""
+Result cache repository for SAFE-INTERN.
+
+Responsibilities:
+- Store guarded analysis outputs keyed by text + result version hash
+- Track last use for size-bounded (LRU) eviction
+- Drop entries produced by a different model / lexicon / scoring version
+
+NO analysis logic
+NO user-facing logic
+"""
+
+from typing import Optional, Tuple
+from database.db_connection import get_db_connection, transaction
+
+
+# ---------- READ ----------
+
+def get_result(cache_key: str, min_created_at: float, used_at: float) -> Optional[Tuple[str, float]]:
+    """
+    Fetch a cached output and mark it as recently used.
+
+    Args:
+        cache_key: Hash of cleaned text + result version
+        min_created_at: Unix seconds; older entries count as a miss
+        used_at: Unix seconds recorded as last use on a hit
+
+    Returns:
+        (output JSON, created_at) or None
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """
+        SELECT output, created_at FROM result_cache
+        WHERE cache_key = ? AND created_at >= ?
+        """,
+        (cache_key, min_created_at)
+    )
+
+    row = cursor.fetchone()
+
+    if row:
+        with transaction():
+            cursor.execute(
+                """
+                UPDATE result_cache
+                SET last_used_at = ?, hits = hits + 1
+                WHERE cache_key = ?
+                """,
+                (used_at, cache_key)
+            )
+
+    return (row[0], row[1]) if row else None
+
+
+# ---------- WRITE ----------
+
+def store_result(
+    cache_key: str,
+    version: str,
+    output: str,
+    created_at: float,
+    max_entries: int
+) -> None:
+    """
+    Insert/replace a cached output and evict least recently used
+    entries beyond max_entries.
+
+    Args:
+        cache_key: Hash of cleaned text + result version
+        version: Model + lexicon + scoring version
+        output: Guarded analysis output (JSON)
+        created_at: Unix seconds
+        max_entries: Upper bound on cached rows
+    """
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            INSERT INTO result_cache (cache_key, version, output, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(cache_key)
+            DO UPDATE SET
+                output = excluded.output,
+                created_at = excluded.created_at,
+                last_used_at = excluded.last_used_at
+            """,
+            (cache_key, version, output, created_at, created_at)
+        )
+
+        cursor.execute(
+            """
+            DELETE FROM result_cache
+            WHERE cache_key IN (
+                SELECT cache_key FROM result_cache
+                ORDER BY last_used_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (max_entries,)
+        )
+
+
+def purge_other_versions(version: str) -> int:
+    """
+    Delete entries created with a different result version.
+
+    Returns:
+        Number of deleted rows
+    """
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            DELETE FROM result_cache
+            WHERE version != ?
+            """,
+            (version,)
+        )
+
+        deleted = cursor.rowcount
+
+    return deleted
@@ -11,8 +11,8 @@ Supported input types:
 
 from typing import Optional, Tuple, Dict
 
-from utils.pdf_parser import extract_text_from_pdf
-from utils.url_fetcher import fetch_text_from_url
+from utils.pdf_parser import extract_pdf
+from utils.url_fetcher import fetch_url_text
 from utils.text_cleaner import basic_clean_text
 
 
@@ -37,14 +37,18 @@ def route_input(
             raise ValueError("Text input too long")
 
     elif pdf_file:
-        raw_text = extract_text_from_pdf(pdf_file)
+        # same length cap as text input, but truncate instead of rejecting
+        raw_text, pdf_metadata = extract_pdf(pdf_file, max_chars=MAX_TEXT_LENGTH)
         metadata["input_type"] = "pdf"
         metadata["file_size_bytes"] = len(pdf_file)
+        metadata["pdf"] = pdf_metadata
 
     elif url and url.strip():
-        raw_text = fetch_text_from_url(url.strip())
+        raw_text, fetch_metadata = fetch_url_text(url.strip())
+        raw_text = raw_text[:MAX_TEXT_LENGTH]
         metadata["input_type"] = "url"
         metadata["url"] = url.strip()
+        metadata["fetch"] = fetch_metadata
 
     else:
         raise ValueError("No valid input provided")
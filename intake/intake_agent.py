@@ -4,48 +4,95 @@ Intake agent for SAFE-INTERN.
 
 Responsibilities:
 - Convert raw cleaned text into structured IntakeSchema
-- Uses OpenRouter LLM (JSON-only)
+- Deterministic (regex/keyword) extraction first, with a confidence score
+- OpenRouter LLM (JSON-only) only when fields are missing or ambiguous
 - Safe fallback if LLM fails
+- Routing decision recorded in intake_metadata and counted
+  (route_stats, exported with the pipeline metrics)
 
-ONLY FILE USING OPENROUTER
+ONLY FILE USING OPENROUTER (requests go through intake/llm_client.py)
 """
 
-from typing import Dict, Any
-import os
-import re
-import json
-import requests
+from collections import Counter
+from typing import Dict, Any, List, Tuple
+import hashlib
+import threading
 
 from intake.schema import IntakeSchema, build_intake_schema
+from intake.intake_cache import get_cached_intake, store_intake
+from intake.llm_client import OpenRouterClient
+from utils.keyword_matcher import match_keywords
+from utils.text_cleaner import AMOUNT_PATTERN, EMAIL_PATTERN, PHONE_PATTERN, URL_PATTERN
 from config.settings import (
     LLM_ENABLED,
-    LLM_MODEL_NAME,
-    LLM_TEMPERATURE,
-    LLM_MAX_TOKENS,
+    LLM_API_URL,
+    INTAKE_CONFIDENCE_THRESHOLD,
+    INTAKE_FAST_PATH_MAX_CHARS,
 )
 
-OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_API_URL = LLM_API_URL
 
+LLM_INTAKE_SYSTEM_PROMPT = """
+You are an intake parser for an internship safety system.
 
-# ---------- FALLBACK (SAFE MODE) ----------
+Rules:
+- Output ONLY valid JSON
+- Do NOT add explanations
+- Do NOT accuse or judge
+- Use null when information is missing
+
+Return JSON matching this structure:
+
+{
+  "clean_text": string,
+  "company_name": string | null,
+  "email": string | null,
+  "website": string | null,
+  "payment_mentions": boolean,
+  "payment_required": boolean,
+  "urgency_mentions": boolean,
+  "input_length": number
+}
+"""
+
+# Changes whenever the prompt text changes; part of the intake cache key
+PROMPT_VERSION = hashlib.sha256(LLM_INTAKE_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+
+# ---------- DETERMINISTIC EXTRACTOR (FAST PATH + SAFE MODE) ----------
+
+# Confidence penalties: anything the regex extractor cannot settle on its own
+CONFIDENCE_PENALTIES = {
+    "no_contact_details": 0.4,      # neither email nor website found
+    "multiple_websites": 0.3,       # which one is the company's?
+    "multiple_emails": 0.2,
+    "payment_negation_mixed": 0.3,  # "fee" and "no fee" both present
+    "long_text": 0.4,               # structure likely beyond keyword extraction
+}
 
-def fallback_structuring(text: str) -> Dict[str, Any]:
-    email_match = re.search(
-        r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text
-    )
-    url_match = re.search(r"https?://\S+|www\.\S+", text)
 
-    payment_keywords = ["fee", "payment", "deposit", "registration", "charges"]
-    urgency_keywords = ["urgent", "immediately", "limited", "asap", "hurry"]
+def deterministic_structuring(text: str) -> Tuple[Dict[str, Any], float, List[str]]:
+    """
+    Regex/keyword extraction of the intake schema.
 
-    return {
+    Returns:
+        (structured dict, confidence 0–1, reasons confidence was reduced)
+    """
+    emails = list(dict.fromkeys(EMAIL_PATTERN.findall(text)))
+    urls = list(dict.fromkeys(URL_PATTERN.findall(text)))
+    phone_match = PHONE_PATTERN.search(text)
+    amount_match = AMOUNT_PATTERN.search(text)
+
+    matches = match_keywords(text)
+
+    structured = {
         "clean_text": text,
 
         "company_name": None,
         "contact_person": None,
-        "email": email_match.group(0) if email_match else None,
-        "phone": None,
-        "website": url_match.group(0) if url_match else None,
+        "email": emails[0] if emails else None,
+        "phone": phone_match.group(0) if phone_match else None,
+        "website": urls[0] if urls else None,
         "social_media": [],
 
         "job_title": None,
@@ -55,14 +102,14 @@ def fallback_structuring(text: str) -> Dict[str, Any]:
         "compensation": None,
         "start_date": None,
 
-        "payment_mentions": any(k in text.lower() for k in payment_keywords),
+        "payment_mentions": matches.has("intake_payment"),
         "payment_required": False,
-        "payment_amount": None,
+        "payment_amount": amount_match.group(0) if amount_match else None,
 
-        "urgency_mentions": any(k in text.lower() for k in urgency_keywords),
-        "urgency_phrases": [],
+        "urgency_mentions": matches.has("intake_urgency"),
+        "urgency_phrases": matches.terms("hard_urgency"),
 
-        "interview_process_described": False,
+        "interview_process_described": matches.has("process"),
         "communication_channels": [],
 
         "missing_information": [],
@@ -73,64 +120,110 @@ def fallback_structuring(text: str) -> Dict[str, Any]:
         "language_detected": None,
     }
 
+    reasons = []
+    if not emails and not urls:
+        reasons.append("no_contact_details")
+    if len(urls) > 1:
+        reasons.append("multiple_websites")
+    if len(emails) > 1:
+        reasons.append("multiple_emails")
+    if structured["payment_mentions"] and matches.has("payment_negation"):
+        reasons.append("payment_negation_mixed")
+    if len(text) > INTAKE_FAST_PATH_MAX_CHARS:
+        reasons.append("long_text")
 
-# ---------- OPENROUTER LLM ----------
+    confidence = max(0.0, 1.0 - sum(CONFIDENCE_PENALTIES[r] for r in reasons))
 
-def run_llm_intake(text: str) -> Dict[str, Any]:
-    api_key = os.getenv("OPENROUTER_API_KEY")
+    return structured, round(confidence, 2), reasons
 
-    if not api_key:
-        raise RuntimeError("OPENROUTER_API_KEY not set")
 
-    system_prompt = """
-You are an intake parser for an internship safety system.
+def fallback_structuring(text: str) -> Dict[str, Any]:
+    return deterministic_structuring(text)[0]
 
-Rules:
-- Output ONLY valid JSON
-- Do NOT add explanations
-- Do NOT accuse or judge
-- Use null when information is missing
 
-Return JSON matching this structure:
+ROUTES = ("deterministic", "llm", "fallback")
 
-{
-  "clean_text": string,
-  "company_name": string | null,
-  "email": string | null,
-  "website": string | null,
-  "payment_mentions": boolean,
-  "payment_required": boolean,
-  "urgency_mentions": boolean,
-  "input_length": number
-}
-"""
+_route_lock = threading.Lock()
+_route_counts: Counter = Counter()
 
-    payload = {
-        "model": LLM_MODEL_NAME,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": text}
-        ],
-        "temperature": LLM_TEMPERATURE,
-        "max_tokens": LLM_MAX_TOKENS
-    }
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
+def _with_route(structured: Dict[str, Any], route: str, confidence: float, reasons: List[str]) -> Dict[str, Any]:
+    with _route_lock:
+        _route_counts[route] += 1
+        for reason in reasons:
+            _route_counts[f"penalty_{reason}"] += 1
+
+    structured = dict(structured)
+    structured["intake_metadata"] = {
+        "route": route,                  # deterministic | llm | fallback
+        "confidence": confidence,
+        "reasons": reasons,
     }
+    return structured
 
-    response = requests.post(
-        OPENROUTER_API_URL,
-        headers=headers,
-        json=payload,
-        timeout=15
-    )
 
-    response.raise_for_status()
-    content = response.json()["choices"][0]["message"]["content"]
+def route_stats() -> Dict[str, Any]:
+    """
+    Routing decisions since process start: count per route, how often
+    each confidence penalty applied, and the share that skipped the LLM.
+    """
+    with _route_lock:
+        counts = dict(_route_counts)
 
-    return json.loads(content)
+    stats = {route: counts.pop(route, 0) for route in ROUTES}
+    stats.update({f"penalty_{reason}": counts.get(f"penalty_{reason}", 0) for reason in CONFIDENCE_PENALTIES})
+
+    total = sum(stats[route] for route in ROUTES)
+    stats["llm_skip_rate"] = round(stats["deterministic"] / total, 4) if total else 0.0
+    return stats
+
+
+# ---------- OPENROUTER LLM ----------
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> OpenRouterClient:
+    """
+    Process-wide client: pooled connections, bounded concurrency,
+    rate limiting and retries are shared by every caller.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenRouterClient(OPENROUTER_API_URL, LLM_INTAKE_SYSTEM_PROMPT)
+    return _client
+
+
+def run_llm_intake(text: str) -> Dict[str, Any]:
+    # same text + model + prompt seen before: no network round trip
+    cached = get_cached_intake(text, PROMPT_VERSION)
+    if cached is not None:
+        return cached
+
+    structured = get_llm_client().complete(text)
+    store_intake(text, PROMPT_VERSION, structured)
+
+    return structured
+
+
+def run_llm_intake_many(texts: List[str]) -> List[Any]:
+    """
+    Cache-aware concurrent intake. Items are structured dicts or the
+    exception raised for that text, in input order.
+    """
+    results: List[Any] = [get_cached_intake(t, PROMPT_VERSION) for t in texts]
+    misses = [i for i, r in enumerate(results) if r is None]
+
+    fetched = get_llm_client().complete_many([texts[i] for i in misses])
+    for i, structured in zip(misses, fetched):
+        if not isinstance(structured, Exception):
+            store_intake(texts[i], PROMPT_VERSION, structured)
+        results[i] = structured
+
+    return results
 
 
 # ---------- MAIN ENTRY ----------
@@ -139,12 +232,47 @@ def run_intake(text: str) -> IntakeSchema:
     if not text or not text.strip():
         raise ValueError("Input text is empty")
 
-    if not LLM_ENABLED:
-        structured = fallback_structuring(text)
-    else:
-        try:
-            structured = run_llm_intake(text)
-        except Exception:
-            structured = fallback_structuring(text)
-
-    return build_intake_schema(structured)
+    structured, confidence, reasons = deterministic_structuring(text)
+
+    # Tier 1: regex extraction already settled every field -> no LLM latency
+    if not LLM_ENABLED or confidence >= INTAKE_CONFIDENCE_THRESHOLD:
+        return build_intake_schema(_with_route(structured, "deterministic", confidence, reasons))
+
+    # Tier 2: LLM for missing / ambiguous fields; deterministic result as fallback
+    try:
+        routed = _with_route(run_llm_intake(text), "llm", confidence, reasons)
+    except Exception:
+        routed = _with_route(structured, "fallback", confidence, reasons)
+
+    return build_intake_schema(routed)
+
+
+def run_intake_batch(texts: List[str]) -> List[IntakeSchema]:
+    """
+    Batch version of run_intake: only low-confidence texts go to the LLM,
+    and those calls run concurrently through the shared client.
+    """
+    for text in texts:
+        if not text or not text.strip():
+            raise ValueError("Input text is empty")
+
+    extracted = [deterministic_structuring(t) for t in texts]
+    routed: List[Any] = [None] * len(texts)
+    needs_llm = []
+
+    for i, (structured, confidence, reasons) in enumerate(extracted):
+        if not LLM_ENABLED or confidence >= INTAKE_CONFIDENCE_THRESHOLD:
+            routed[i] = _with_route(structured, "deterministic", confidence, reasons)
+        else:
+            needs_llm.append(i)
+
+    if needs_llm:
+        llm_results = run_llm_intake_many([texts[i] for i in needs_llm])
+        for i, result in zip(needs_llm, llm_results):
+            structured, confidence, reasons = extracted[i]
+            if isinstance(result, Exception):
+                routed[i] = _with_route(structured, "fallback", confidence, reasons)
+            else:
+                routed[i] = _with_route(result, "llm", confidence, reasons)
+
+    return [build_intake_schema(r) for r in routed]
@@ -0,0 +1,67 @@
+# intake/intake_cache.py
+"""
+Persistent cache for LLM intake responses.
+
+Responsibilities:
+- Key responses by sha256(normalized text + model name + prompt version)
+- Skip the OpenRouter round trip entirely on a hit
+- Drop entries from older models / prompts on first use in a process
+- Keep the table size-bounded (LRU eviction)
+
+Cache failures never break intake: any DB error is treated as a miss.
+"""
+
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import sqlite3
+import threading
+
+from config.settings import LLM_MODEL_NAME, INTAKE_CACHE_MAX_ENTRIES
+from database import intake_cache_repository
+
+
+_purged = False
+_purge_lock = threading.Lock()
+
+
+def normalize_for_cache(text: str) -> str:
+    # forwarded copies often differ only in whitespace / line breaks
+    return " ".join(text.split())
+
+
+def cache_key(text: str, prompt_version: str, model: str = LLM_MODEL_NAME) -> str:
+    payload = "\x00".join([normalize_for_cache(text), model, prompt_version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _purge_once(prompt_version: str) -> None:
+    global _purged
+    if _purged:
+        return
+    with _purge_lock:
+        if not _purged:
+            intake_cache_repository.purge_other_versions(LLM_MODEL_NAME, prompt_version)
+            _purged = True
+
+
+def get_cached_intake(text: str, prompt_version: str) -> Optional[Dict[str, Any]]:
+    try:
+        _purge_once(prompt_version)
+        raw = intake_cache_repository.get_cached_response(cache_key(text, prompt_version))
+    except sqlite3.Error:
+        return None
+    return json.loads(raw) if raw else None
+
+
+def store_intake(text: str, prompt_version: str, structured: Dict[str, Any]) -> None:
+    try:
+        intake_cache_repository.store_response(
+            cache_key(text, prompt_version),
+            model=LLM_MODEL_NAME,
+            prompt_version=prompt_version,
+            response=json.dumps(structured),
+            max_entries=INTAKE_CACHE_MAX_ENTRIES,
+        )
+    except sqlite3.Error:
+        pass
@@ -0,0 +1,209 @@
+# intake/llm_client.py
+"""
+OpenRouter chat-completions client for SAFE-INTERN intake.
+
+Responsibilities:
+- Reuse keep-alive HTTP connections (one requests.Session per thread)
+- Bound concurrent requests and smooth them with a token bucket
+- Retry 429 / 5xx / transient network errors with jittered exponential backoff
+- Submit many texts at once and collect results in input order
+
+The API URL is a constructor argument so the client can be exercised
+against a local stub server that mimics the chat-completions response.
+
+NO risk scoring
+NO prompt construction beyond the intake system prompt passed in
+"""
+
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, List, Optional, Union
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import (
+    LLM_MODEL_NAME,
+    LLM_TEMPERATURE,
+    LLM_MAX_TOKENS,
+    LLM_TIMEOUT,
+    LLM_MAX_CONCURRENCY,
+    LLM_RATE_LIMIT_PER_SECOND,
+    LLM_RATE_LIMIT_BURST,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMRequestError(RuntimeError):
+    """Raised when a request still fails after all retries."""
+
+
+# ---------- RATE LIMITING ----------
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, at most `capacity`
+    banked. acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# ---------- CLIENT ----------
+
+class OpenRouterClient:
+    def __init__(
+        self,
+        api_url: str,
+        system_prompt: str,
+        api_key: Optional[str] = None,
+        model: str = LLM_MODEL_NAME,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        rate_per_second: float = LLM_RATE_LIMIT_PER_SECOND,
+        burst: int = LLM_RATE_LIMIT_BURST,
+        max_retries: int = LLM_MAX_RETRIES,
+        timeout: float = LLM_TIMEOUT,
+    ):
+        self.api_url = api_url
+        self.system_prompt = system_prompt
+        self.api_key = api_key
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self._bucket = TokenBucket(rate_per_second, burst)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    # ----- plumbing -----
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix="safe-intern-llm",
+                    )
+        return self._executor
+
+    def _headers(self) -> Dict[str, str]:
+        api_key = self.api_key or os.getenv("OPENROUTER_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENROUTER_API_KEY not set")
+        return {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), LLM_BACKOFF_MAX_SECONDS)
+            except ValueError:
+                pass
+        # "full jitter": uniform in [0, base * 2^attempt], capped
+        ceiling = min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    # ----- public API -----
+
+    def complete(self, text: str) -> Dict[str, Any]:
+        """
+        Send one text and return the parsed JSON content of the reply.
+        """
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": text}
+            ],
+            "temperature": LLM_TEMPERATURE,
+            "max_tokens": LLM_MAX_TOKENS
+        }
+        headers = self._headers()
+
+        for attempt in range(self.max_retries + 1):
+            self._bucket.acquire()
+            retry_after = None
+
+            with self._slots:
+                try:
+                    response = self._session().post(
+                        self.api_url, headers=headers, json=payload, timeout=self.timeout
+                    )
+                except (requests.ConnectionError, requests.Timeout) as err:
+                    if attempt == self.max_retries:
+                        raise LLMRequestError(f"LLM request failed: {type(err).__name__}") from err
+                    response = None
+
+            if response is not None:
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    content = response.json()["choices"][0]["message"]["content"]
+                    return json.loads(content)
+
+                if attempt == self.max_retries:
+                    raise LLMRequestError(f"LLM request failed with HTTP {response.status_code}")
+                retry_after = response.headers.get("Retry-After")
+
+            time.sleep(self._backoff(attempt, retry_after))
+
+        raise LLMRequestError("LLM request failed")  # pragma: no cover
+
+    def submit(self, text: str) -> Future:
+        return self._pool().submit(self.complete, text)
+
+    def complete_many(self, texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Run many texts concurrently (bounded by max_concurrency and the
+        rate limit). Results are in input order; a failed item holds its
+        exception instead of aborting the batch.
+        """
+        futures = [self.submit(t) for t in texts]
+        results: List[Union[Dict[str, Any], Exception]] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as err:
+                results.append(err)
+        return results
@@ -8,7 +8,7 @@ Responsibilities:
 - Normalize missing optional fields
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 
 
@@ -53,6 +53,10 @@ class IntakeSchema:
     input_length: int
     language_detected: Optional[str]
 
+    # How the intake was produced: route (deterministic / llm / fallback),
+    # extractor confidence and the reasons it was reduced
+    intake_metadata: Dict[str, Any] = field(default_factory=dict)
+
     def to_dict(self) -> Dict[str, Any]:
         return self.__dict__
 
@@ -109,5 +113,7 @@ def build_intake_schema(data: Dict[str, Any]) -> IntakeSchema:
         entities=data.get("entities", {}),
 
         input_length=data.get("input_length", len(data.get("clean_text", ""))),
-        language_detected=data.get("language_detected")
+        language_detected=data.get("language_detected"),
+
+        intake_metadata=data.get("intake_metadata", {})
     )
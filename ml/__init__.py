@@ -0,0 +1,7 @@
+# ml/__init__.py
+"""
+ML artifacts and inference helpers for SAFE-INTERN.
+
+- model.pkl / vectorizer.pkl: sklearn artifacts from train_model.ipynb
+- linear_scorer: exported term table + dependency-free inference
+"""
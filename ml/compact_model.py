@@ -0,0 +1,208 @@
+# ml/compact_model.py
+"""
+Model compaction for SAFE-INTERN.
+
+Purpose:
+- Drop term-table features whose |coef| is below a threshold, or keep only
+  the top-k terms by |coef|
+- Optionally store weights as float16 or int8 (symmetric, one scale per array)
+- Report, per setting: accuracy / F1 on data/fake_internships.csv (label 1)
+  and data/real_internships.csv (label 0), agreement with the full model,
+  artifact size, load time and per-message latency
+- Write one chosen setting as a linear_scorer artifact (same source
+  version, so MLAgent accepts it when ML_SCORER_PATH points at it; its
+  artifact_version names the settings, e.g. "<source>+top_k=5000,int8",
+  and the registry's model_version changes with it)
+
+Pruned terms also leave the tf-idf norm, so scores shift slightly beyond
+the removed contributions; the agreement columns show by how much.
+
+Usage:
+    python -m ml.compact_model                                    # default grid
+    python -m ml.compact_model --top-k 2000 5000 --dtype float16 int8
+    python -m ml.compact_model --threshold 0.05 --dtype int8 --out ml/linear_scorer_compact
+
+NO training
+NO pipeline changes (the served artifact is whatever ML_SCORER_PATH points to)
+"""
+
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import argparse
+import csv
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from config.settings import ML_MODEL_PATH, ML_VECTORIZER_PATH
+from ml.linear_scorer import ARRAY_FILES, META_FILE, LinearScorer, content_version
+from utils.text_cleaner import normalize_model_text
+
+DATA_FILES = (
+    ("data/fake_internships.csv", 1),
+    ("data/real_internships.csv", 0),
+)
+
+DEFAULT_TOP_K = (20000, 10000, 5000, 2000, 1000)
+DEFAULT_DTYPES = ("float32", "float16", "int8")
+
+
+# ---------- DATA / METRICS ----------
+
+def load_labeled(files=DATA_FILES) -> Tuple[List[str], np.ndarray]:
+    texts, labels = [], []
+    for path, label in files:
+        with open(path, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                texts.append(normalize_model_text(row["text"]))
+                labels.append(label)
+    return texts, np.array(labels)
+
+
+def accuracy_f1(labels: np.ndarray, probs: np.ndarray) -> Tuple[float, float]:
+    pred = (probs >= 0.5).astype(int)
+    tp = int(np.sum((pred == 1) & (labels == 1)))
+    fp = int(np.sum((pred == 1) & (labels == 0)))
+    fn = int(np.sum((pred == 0) & (labels == 1)))
+    accuracy = float(np.mean(pred == labels))
+    f1 = 2 * tp / (2 * tp + fp + fn) if tp else 0.0
+    return accuracy, f1
+
+
+# ---------- COMPACTION ----------
+
+def prune(scorer: LinearScorer, threshold: Optional[float] = None, top_k: Optional[int] = None) -> LinearScorer:
+    """
+    Keep terms with |coef| >= threshold, or the top_k terms by |coef|.
+    """
+    magnitude = np.abs(scorer.weights()[1])
+
+    if threshold is not None:
+        return scorer.subset(magnitude >= threshold, pruning={"threshold": threshold})
+
+    if top_k is not None and top_k < len(scorer):
+        keep = np.zeros(len(scorer), dtype=bool)
+        keep[np.argsort(-magnitude, kind="stable")[:top_k]] = True
+        return scorer.subset(keep, pruning={"top_k": top_k})
+
+    return scorer
+
+
+def artifact_bytes(directory: Path) -> int:
+    names = [META_FILE] + [f"{name}.npy" for name in ARRAY_FILES]
+    return sum((Path(directory) / name).stat().st_size for name in names)
+
+
+def evaluate(
+    scorer: LinearScorer,
+    dtype: str,
+    texts: List[str],
+    labels: np.ndarray,
+    reference: np.ndarray,
+    workdir: Path,
+) -> Dict[str, Any]:
+    """
+    Save with the given dtype, reload (mmap) and measure it.
+    """
+    directory = workdir / f"{len(scorer)}_{dtype}"
+    scorer.save(directory, dtype=dtype)
+
+    started = time.perf_counter()
+    loaded = LinearScorer.load(directory)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    probs = np.array(loaded.predict_probs(texts))
+
+    started = time.perf_counter()
+    for t in texts:
+        loaded.predict_prob(t)
+    latency_us = (time.perf_counter() - started) / len(texts) * 1e6
+
+    accuracy, f1 = accuracy_f1(labels, probs)
+    return {
+        "terms": len(loaded),
+        "dtype": dtype,
+        "size_kb": artifact_bytes(directory) / 1024,
+        "load_ms": load_ms,
+        "latency_us": latency_us,
+        "accuracy": accuracy,
+        "f1": f1,
+        "agreement": float(np.mean((probs >= 0.5) == (reference >= 0.5))),
+        "max_dp": float(np.max(np.abs(probs - reference))),
+    }
+
+
+def print_report(rows: List[Dict[str, Any]]) -> None:
+    print(
+        f"{'setting':>16} {'terms':>6} {'dtype':>8} {'size KB':>8} {'load ms':>8} "
+        f"{'us/msg':>7} {'acc':>6} {'F1':>6} {'agree':>6} {'max|dp|':>8}"
+    )
+    for r in rows:
+        print(
+            f"{r['setting']:>16} {r['terms']:6d} {r['dtype']:>8} {r['size_kb']:8.1f} {r['load_ms']:8.2f} "
+            f"{r['latency_us']:7.1f} {r['accuracy']:6.3f} {r['f1']:6.3f} {r['agreement']:6.3f} {r['max_dp']:8.4f}"
+        )
+
+
+# ---------- CLI ----------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prune / quantize the linear term table and report the trade-offs.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--threshold", type=float, nargs="+", help="keep terms with |coef| >= each value")
+    group.add_argument("--top-k", type=int, nargs="+", help="keep the k terms with the largest |coef|")
+    parser.add_argument("--dtype", nargs="+", default=list(DEFAULT_DTYPES), choices=["float64", "float32", "float16", "int8"])
+    parser.add_argument("--model", default=ML_MODEL_PATH)
+    parser.add_argument("--vectorizer", default=ML_VECTORIZER_PATH)
+    parser.add_argument("--out", help="write the (single) selected setting as an artifact directory")
+    args = parser.parse_args()
+
+    if args.threshold:
+        settings = [({"threshold": t}, f"|coef|>={t:g}") for t in args.threshold]
+    else:
+        settings = [({"top_k": k}, f"top-{k}") for k in (args.top_k or DEFAULT_TOP_K)]
+
+    if args.out and len(settings) * len(args.dtype) != 1:
+        parser.error("--out needs exactly one pruning value and one --dtype")
+
+    texts, labels = load_labeled()
+
+    workdir = Path(tempfile.mkdtemp(prefix="safe_intern_compact_"))
+    try:
+        # exact float64 table straight from the pickles is the reference
+        full = _load_full(args.model, args.vectorizer)
+        reference = np.array(full.predict_probs(texts))
+
+        rows = []
+        for options, label in settings:
+            pruned = prune(full, **options)
+            for dtype in args.dtype:
+                row = evaluate(pruned, dtype, texts, labels, reference, workdir)
+                row["setting"] = label
+                rows.append(row)
+
+        print(f"messages: {len(texts)} (fake {int(labels.sum())}, real {int(len(labels) - labels.sum())})")
+        print_report(rows)
+
+        if args.out:
+            pruned = prune(full, **settings[0][0])
+            pruned.save(Path(args.out), dtype=args.dtype[0])
+            print(f"Wrote {len(pruned)} terms ({args.dtype[0]}) to {args.out}/ as {pruned.artifact_version}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _load_full(model_path: str, vectorizer_path: str) -> LinearScorer:
+    import joblib
+
+    return LinearScorer.from_sklearn(
+        joblib.load(vectorizer_path),
+        joblib.load(model_path),
+        source_version=content_version((Path(model_path), Path(vectorizer_path))),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+# ml/linear_scorer.py
+"""
+Linear term-table scorer for SAFE-INTERN.
+
+Purpose:
+- Fold the fitted TfidfVectorizer (vocabulary, IDF, tf/norm settings) and
+  the linear model (coefficients, intercept) into one term table
+- Score messages with NumPy only: tokenize, look up n-grams in the sorted
+  term array, apply tf/IDF/norm and the dot product, then the sigmoid
+- Skip sklearn's per-call validation and sparse-matrix construction, which
+  dominate the cost of scoring a single document
+
+The score is
+
+    decision = sum(tf * idf * coef) / norm(tf * idf) + intercept
+    probability = 1 / (1 + exp(-decision))
+
+which is what MLAgent computes through sklearn (LinearSVC: sigmoid over
+decision_function; binary LogisticRegression: predict_proba is the same
+sigmoid).
+
+Artifact (a directory, no pickle anywhere):
+    meta.json   vectorizer settings, intercept, source version
+    terms.npy   vocabulary as a sorted fixed-width UTF-8 byte array
+    idf.npy     float32 IDF weights, aligned with terms
+    coef.npy    float32 model coefficients, aligned with terms
+    (compacted artifacts may store float16, or int8 with a per-array
+    scale in meta.json; see ml/compact_model.py)
+
+The .npy files are opened with mmap_mode="r": loading is near-instant and
+forked / concurrent workers share the same page-cache pages instead of
+each unpickling a private vocabulary dict.
+
+The artifact records the content version of the pickles it was exported
+from; MLAgent ignores an artifact whose version does not match.
+
+Export (after retraining):
+    python -m ml.linear_scorer [--model ml/model.pkl] [--vectorizer ml/vectorizer.pkl] [--out ml/linear_scorer]
+
+NO training
+NO sklearn / pickle at inference time
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import argparse
+import hashlib
+import json
+import re
+
+import numpy as np
+
+FORMAT_VERSION = 2
+
+META_FILE = "meta.json"
+ARRAY_FILES = ("terms", "idf", "coef")
+WEIGHT_DTYPES = ("float64", "float32", "float16", "int8")
+
+
+# ---------- ARTIFACT VERSION ----------
+
+def content_version(paths: Iterable[Path]) -> str:
+    """Short sha256 over all artifact bytes (the served model version)."""
+    h = hashlib.sha256()
+    for p in paths:
+        with open(p, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()[:12]
+
+
+def bytes_version(blobs: Iterable[bytes]) -> str:
+    """content_version of artifact bytes already read (same digest)."""
+    h = hashlib.sha256()
+    for blob in blobs:
+        h.update(blob)
+    return h.hexdigest()[:12]
+
+
+# ---------- SCORER ----------
+
+class LinearScorer:
+    def __init__(
+        self,
+        terms: np.ndarray,
+        idf: np.ndarray,
+        coef: np.ndarray,
+        intercept: float,
+        ngram_range: Tuple[int, int] = (1, 1),
+        token_pattern: str = r"(?u)\b\w\w+\b",
+        lowercase: bool = True,
+        stop_words: Optional[Iterable[str]] = None,
+        binary: bool = False,
+        sublinear_tf: bool = False,
+        norm: Optional[str] = "l2",
+        source_version: Optional[str] = None,
+        idf_scale: float = 1.0,
+        coef_scale: float = 1.0,
+        extra: Optional[Dict[str, Any]] = None,
+        artifact_version: Optional[str] = None,
+    ):
+        if norm not in ("l1", "l2", None):
+            raise ValueError(f"Unsupported norm: {norm!r}")
+        if not (len(terms) == len(idf) == len(coef)):
+            raise ValueError("terms, idf and coef must have the same length")
+
+        self.terms = terms                  # sorted bytes, dtype S<width>
+        self.idf = idf
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.ngram_range = tuple(ngram_range)
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.stop_words = frozenset(stop_words) if stop_words else None
+        self.binary = binary
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.source_version = source_version
+        self.idf_scale = float(idf_scale)       # int8 artifacts: value = q * scale
+        self.coef_scale = float(coef_scale)
+        self.extra = extra or {}                # provenance (e.g. pruning settings)
+        # source_version + pruning / quantization ("23eb4bb896a0+top_k=5000,int8");
+        # equals source_version for a plain export
+        self.artifact_version = artifact_version or source_version
+
+        self._width = terms.dtype.itemsize
+        self._tokenize = re.compile(token_pattern).findall
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    # ---------- INFERENCE ----------
+
+    def ngrams(self, text: str) -> List[str]:
+        """
+        n-grams of one text, generated the way sklearn's word analyzer does.
+        """
+        tokens = self._tokenize(text.lower() if self.lowercase else text)
+        if self.stop_words:
+            tokens = [t for t in tokens if t not in self.stop_words]
+
+        min_n, max_n = self.ngram_range
+        n_tokens = len(tokens)
+        grams: List[str] = []
+
+        for n in range(min_n, min(max_n, n_tokens) + 1):
+            if n == 1:
+                grams.extend(tokens)
+            else:
+                grams.extend(" ".join(tokens[i:i + n]) for i in range(n_tokens - n + 1))
+
+        return grams
+
+    def decisions(self, texts: List[str]) -> np.ndarray:
+        """
+        Decision values for many texts with one vocabulary lookup.
+        """
+        width = self._width
+        keys: List[bytes] = []
+        docs: List[int] = []
+
+        for d, text in enumerate(texts):
+            for gram in self.ngrams(text):
+                key = gram.encode("utf-8")
+                # longer than every term: cannot be in the vocabulary
+                # (and must not be truncated into a false match)
+                if len(key) <= width:
+                    keys.append(key)
+                    docs.append(d)
+
+        out = np.full(len(texts), self.intercept)
+        if not keys:
+            return out
+
+        query = np.array(keys, dtype=self.terms.dtype)
+        pos = np.searchsorted(self.terms, query)
+        pos[pos == len(self.terms)] = 0
+        found = self.terms[pos] == query
+
+        # (doc, term) pairs -> term counts per doc
+        n_terms = len(self.terms)
+        pairs = np.asarray(docs, dtype=np.int64)[found] * n_terms + pos[found]
+        pairs, counts = np.unique(pairs, return_counts=True)
+        doc, term = np.divmod(pairs, n_terms)
+
+        if self.binary:
+            tf = np.ones(len(counts))
+        elif self.sublinear_tf:
+            tf = 1.0 + np.log(counts)
+        else:
+            tf = counts.astype(np.float64)
+
+        x = tf * (self.idf[term].astype(np.float64) * self.idf_scale)
+        coef = self.coef[term].astype(np.float64) * self.coef_scale
+        dot = np.bincount(doc, weights=x * coef, minlength=len(texts))
+
+        if self.norm == "l2":
+            length = np.sqrt(np.bincount(doc, weights=x * x, minlength=len(texts)))
+        elif self.norm == "l1":
+            length = np.bincount(doc, weights=np.abs(x), minlength=len(texts))
+        else:
+            length = np.ones(len(texts))
+
+        scored = length > 0
+        out[scored] += dot[scored] / length[scored]
+        return out
+
+    def decision(self, text: str) -> float:
+        return float(self.decisions([text])[0])
+
+    def predict_probs(self, texts: List[str]) -> List[float]:
+        z = self.decisions(texts)
+        return [float(p) for p in 1 / (1 + np.exp(-z))]
+
+    def predict_prob(self, text: str) -> float:
+        return self.predict_probs([text])[0]
+
+    # ---------- EXPORT ----------
+
+    @classmethod
+    def from_sklearn(cls, vectorizer: Any, model: Any, source_version: Optional[str] = None) -> "LinearScorer":
+        """
+        Fold a fitted TfidfVectorizer and a binary linear model into sorted
+        float64 arrays (exact; save() narrows them to float32).
+        """
+        params = vectorizer.get_params()
+        if params["analyzer"] != "word" or params["tokenizer"] or params["preprocessor"]:
+            raise ValueError("Only the built-in word analyzer can be exported")
+        if params["strip_accents"]:
+            raise ValueError("strip_accents is not supported by the linear scorer")
+        if not params["use_idf"]:
+            raise ValueError("Vectorizer without IDF weights is not supported")
+
+        coef = np.asarray(model.coef_)
+        if coef.shape[0] != 1:
+            raise ValueError("Only binary linear models can be exported")
+
+        vocabulary = sorted((term.encode("utf-8"), i) for term, i in vectorizer.vocabulary_.items())
+        order = np.array([i for _, i in vocabulary], dtype=np.int64)
+
+        stop_words = vectorizer.get_stop_words()
+
+        return cls(
+            terms=np.array([term for term, _ in vocabulary]),
+            idf=np.asarray(vectorizer.idf_, dtype=np.float64)[order],
+            coef=coef[0].astype(np.float64)[order],
+            intercept=float(model.intercept_[0]),
+            ngram_range=params["ngram_range"],
+            token_pattern=params["token_pattern"],
+            lowercase=params["lowercase"],
+            stop_words=sorted(stop_words) if stop_words else None,
+            binary=params["binary"],
+            sublinear_tf=params["sublinear_tf"],
+            norm=params["norm"],
+            source_version=source_version,
+        )
+
+    def weights(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(idf, coef) as float64, scales applied."""
+        return (
+            self.idf.astype(np.float64) * self.idf_scale,
+            self.coef.astype(np.float64) * self.coef_scale,
+        )
+
+    def subset(self, keep: np.ndarray, **extra: Any) -> "LinearScorer":
+        """
+        Scorer restricted to the terms where `keep` is True (order kept, so
+        the term array stays sorted). Dropped terms no longer count towards
+        the tf-idf norm either.
+        """
+        idf, coef = self.weights()
+        return LinearScorer(
+            # rebuilt so the fixed width shrinks to the longest kept term
+            terms=np.array(self.terms[keep].tolist(), dtype=bytes),
+            idf=idf[keep],
+            coef=coef[keep],
+            intercept=self.intercept,
+            ngram_range=self.ngram_range,
+            token_pattern=self.token_pattern,
+            lowercase=self.lowercase,
+            stop_words=self.stop_words,
+            binary=self.binary,
+            sublinear_tf=self.sublinear_tf,
+            norm=self.norm,
+            source_version=self.source_version,
+            extra={**self.extra, **extra},
+        )
+
+    def save(self, directory: Path, dtype="float32") -> None:
+        """
+        Write the artifact directory (arrays first, meta.json last).
+
+        dtype: float64 | float32 | float16 | int8 (symmetric, one scale per array)
+        """
+        dtype = np.dtype(dtype).name
+        if dtype not in WEIGHT_DTYPES:
+            raise ValueError(f"Unsupported weight dtype: {dtype}")
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        idf, coef = self.weights()
+        scales = {}
+        if dtype == "int8":
+            idf, scales["idf"] = _quantize_int8(idf)
+            coef, scales["coef"] = _quantize_int8(coef)
+        else:
+            idf, coef = idf.astype(dtype), coef.astype(dtype)
+
+        arrays = {"terms": self.terms, "idf": idf, "coef": coef}
+        for name, array in arrays.items():
+            tmp = directory / f"{name}.tmp.npy"
+            np.save(tmp, np.ascontiguousarray(array), allow_pickle=False)
+            tmp.replace(directory / f"{name}.npy")
+
+        variant = _variant(self.extra.get("pruning"), dtype)
+        self.artifact_version = f"{self.source_version}+{variant}" if variant else self.source_version
+
+        meta: Dict[str, Any] = {
+            "format": FORMAT_VERSION,
+            "source_version": self.source_version,
+            "artifact_version": self.artifact_version,
+            "n_terms": len(self.terms),
+            "dtype": dtype,
+            "scales": scales,
+            "intercept": self.intercept,
+            "ngram_range": list(self.ngram_range),
+            "token_pattern": self.token_pattern,
+            "lowercase": self.lowercase,
+            "stop_words": sorted(self.stop_words) if self.stop_words else None,
+            "binary": self.binary,
+            "sublinear_tf": self.sublinear_tf,
+            "norm": self.norm,
+            "extra": self.extra,
+        }
+        tmp = directory / (META_FILE + ".tmp")
+        tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        tmp.replace(directory / META_FILE)
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "LinearScorer":
+        directory = Path(directory)
+        meta = json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+
+        if meta.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported linear scorer format: {meta.get('format')!r}")
+
+        mode = "r" if mmap else None
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mode, allow_pickle=False)
+            for name in ARRAY_FILES
+        }
+        if len(arrays["terms"]) != meta["n_terms"]:
+            raise ValueError(f"Linear scorer artifact in {directory} is incomplete")
+
+        return cls(
+            terms=arrays["terms"],
+            idf=arrays["idf"],
+            coef=arrays["coef"],
+            intercept=meta["intercept"],
+            ngram_range=tuple(meta["ngram_range"]),
+            token_pattern=meta["token_pattern"],
+            lowercase=meta["lowercase"],
+            stop_words=meta["stop_words"],
+            binary=meta["binary"],
+            sublinear_tf=meta["sublinear_tf"],
+            norm=meta["norm"],
+            source_version=meta["source_version"],
+            idf_scale=meta.get("scales", {}).get("idf", 1.0),
+            coef_scale=meta.get("scales", {}).get("coef", 1.0),
+            extra=meta.get("extra"),
+            artifact_version=meta.get("artifact_version"),
+        )
+
+    @staticmethod
+    def exists(directory: Path) -> bool:
+        directory = Path(directory)
+        return (directory / META_FILE).exists() and all(
+            (directory / f"{name}.npy").exists() for name in ARRAY_FILES
+        )
+
+
+def _variant(pruning: Optional[Dict[str, Any]], dtype: str) -> str:
+    """
+    Compaction settings as a version suffix ("" for a plain float32 export).
+    """
+    parts = [f"{key}={value:g}" for key, value in sorted((pruning or {}).items())]
+    if dtype != "float32":
+        parts.append(dtype)
+    return ",".join(parts)
+
+
+def _quantize_int8(values: np.ndarray) -> Tuple[np.ndarray, float]:
+    peak = float(np.max(np.abs(values))) if len(values) else 0.0
+    scale = peak / 127 if peak > 0 else 1.0
+    return np.round(values / scale).astype(np.int8), scale
+
+
+def export_linear_scorer(model_path: Path, vectorizer_path: Path, out_dir: Path) -> LinearScorer:
+    """
+    Load the sklearn pickles and write the artifact directory.
+    """
+    import joblib
+
+    model_path, vectorizer_path = Path(model_path), Path(vectorizer_path)
+    scorer = LinearScorer.from_sklearn(
+        joblib.load(vectorizer_path),
+        joblib.load(model_path),
+        source_version=content_version((model_path, vectorizer_path)),
+    )
+    scorer.save(Path(out_dir))
+    return scorer
+
+
+# ---------- CLI ----------
+
+if __name__ == "__main__":
+    from config.settings import ML_MODEL_PATH, ML_VECTORIZER_PATH, ML_SCORER_PATH
+
+    parser = argparse.ArgumentParser(description="Export the linear term table from the sklearn pickles.")
+    parser.add_argument("--model", default=ML_MODEL_PATH)
+    parser.add_argument("--vectorizer", default=ML_VECTORIZER_PATH)
+    parser.add_argument("--out", default=ML_SCORER_PATH)
+    args = parser.parse_args()
+
+    scorer = export_linear_scorer(args.model, args.vectorizer, args.out)
+    print(f"Exported {len(scorer)} terms to {args.out}/ (source {scorer.source_version}).")
@@ -0,0 +1,192 @@
+# pipeline.py
+"""
+End-to-end analysis pipeline for SAFE-INTERN.
+
+Flow:
+    route_input → [result cache] → [singleflight] → [near-duplicate lookup] → run_intake
+    → run_planner → calculate_risk → generate_explanation
+    → apply_full_guardrails
+
+Every stage runs in a tracing span (utils/tracing.py); agents get their
+own spans from the planner. Intake routing, cache, near-duplicate,
+singleflight and analytics writer stats are exported with the stage
+latencies. A sampled fraction of requests is also profiled
+(utils/profiling.py).
+
+Entry points:
+- analyze_text: one message (used by the Streamlit UI)
+- analyze_batch: many messages (bulk rescans of scraped postings)
+
+NO UI logic
+"""
+
+from typing import Dict, Any, List
+import copy
+
+from config.lexicon import LEXICON_VERSION
+from config.settings import SINGLEFLIGHT_ENABLED, TRACE_DEBUG
+from database import analytics_writer
+from intake.input_router import route_input
+from intake.intake_agent import route_stats, run_intake, run_intake_batch
+from agents.model_registry import get_model_info
+from agents.planner_agent import run_planner, run_planner_batch
+from utils.risk_engine import SCORING_VERSION, calculate_risk
+from utils.explanation_engine import generate_explanation
+from utils.guardrails import apply_full_guardrails
+from utils import domain_cache
+from utils.near_duplicate import find_near_duplicate, index_stats, remember
+from utils.result_cache import cache_key, cache_stats, get_cached_result, store_result
+from utils.profiling import sample_request
+from utils.singleflight import SingleFlight
+from utils.tracing import register_metrics, span, start_trace
+
+# concurrent analyses of the same cleaned text share one computation
+analysis_flight = SingleFlight()
+
+register_metrics("intake", route_stats)
+register_metrics("domain_cache", domain_cache.cache_stats)
+register_metrics("result_cache", cache_stats)
+register_metrics("near_duplicate", index_stats)
+register_metrics("analytics_writer", analytics_writer.writer_stats)
+register_metrics("singleflight", analysis_flight.stats)
+
+
+def result_version() -> str:
+    """
+    Version of everything that shapes an output (model + lexicon +
+    scoring); stored results from another version are never reused.
+    """
+    return f"{get_model_info()['model_version']}:{LEXICON_VERSION}:{SCORING_VERSION}"
+
+
+def _reusable(agent_results: Dict[str, Any]) -> bool:
+    """
+    Whether an output may be served again from the result cache /
+    near-duplicate index. Not when an agent timed out / failed, nor when
+    the website probe failed: unreachable answers are kept only
+    DOMAIN_CACHE_NEGATIVE_TTL_SECONDS by the domain cache, and a cached
+    output would pin a transient outage for RESULT_CACHE_TTL_SECONDS.
+    """
+    if agent_results.get("degraded"):
+        return False
+    return agent_results.get("company", {}).get("website_reachable") is not False
+
+
+# ---------- SINGLE MESSAGE ----------
+
+def analyze_text(text: str, debug: bool = False) -> Dict[str, Any]:
+    """
+    Run the full pipeline for one message and return guarded output.
+
+    A forwarded copy of an already analyzed message (near-identical text,
+    same URLs / emails / phones / amounts / keyword hits) returns the
+    earlier output, annotated with "near_duplicate": {"similarity",
+    "analyzed_at"}. Concurrent calls with
+    the same cleaned text share one run (see analysis_flight).
+
+    With debug (or TRACE_DEBUG) the output also carries "trace": the
+    request's spans ({"name", "parent", "start_ms", "duration_ms"}).
+    """
+    with sample_request(len(text)), start_trace("analyze") as root:
+        output = _analyze(text)
+
+    if (debug or TRACE_DEBUG) and root.trace is not None:
+        output["trace"] = root.trace.to_list()
+    return output
+
+
+def _analyze(text: str) -> Dict[str, Any]:
+    with span("route"):
+        routed_text = route_input(text_input=text)
+
+    # same cleaned text analyzed before (any session / process)
+    version = result_version()
+    with span("result_cache"):
+        cached = get_cached_result(routed_text, version)
+    if cached is not None:
+        return cached
+
+    if not SINGLEFLIGHT_ENABLED:
+        return _analyze_routed(routed_text, version)
+
+    # same text already being analyzed: wait for that run instead
+    output, shared = analysis_flight.do(
+        cache_key(routed_text, version),
+        lambda: _analyze_routed(routed_text, version),
+    )
+    return copy.deepcopy(output) if shared else output
+
+
+def _analyze_routed(routed_text: str, version: str) -> Dict[str, Any]:
+    with span("near_duplicate"):
+        duplicate = find_near_duplicate(routed_text, version)
+    if duplicate is not None:
+        return duplicate
+
+    with span("intake"):
+        intake_schema = run_intake(routed_text)
+
+    with span("planner"):
+        agent_results = run_planner(intake_schema)
+    with span("risk"):
+        risk_result = calculate_risk(agent_results)
+    with span("explanation"):
+        explanation = generate_explanation(risk_result)
+    with span("guardrails"):
+        output = apply_full_guardrails(explanation)
+
+    if _reusable(agent_results):
+        with span("store"):
+            store_result(routed_text, version, output)
+            remember(routed_text, version, output)
+
+    return output
+
+
+# ---------- BATCH ----------
+
+def analyze_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Run the full pipeline for many messages.
+
+    LLM intake runs concurrently (see run_intake_batch) and ML scoring is
+    done once for the whole batch (see run_planner_batch).
+    Results come back in input order; an input that cannot be routed
+    (empty / too long) yields {"error": "..."} in its slot instead of
+    failing the whole batch. Texts found in the result cache skip the
+    pipeline.
+    """
+    outputs: List[Dict[str, Any]] = [{} for _ in texts]
+    routed = []
+    positions = []
+    version = result_version()
+
+    for i, text in enumerate(texts):
+        try:
+            routed_text = route_input(text_input=text)
+        except ValueError as err:
+            outputs[i] = {"error": str(err)}
+            continue
+
+        cached = get_cached_result(routed_text, version)
+        if cached is not None:
+            outputs[i] = cached
+        else:
+            routed.append(routed_text)
+            positions.append(i)
+
+    if not routed:
+        return outputs
+
+    # LLM intake calls run concurrently through the shared client
+    intakes = run_intake_batch(routed)
+    agent_results = run_planner_batch(intakes)
+
+    for i, routed_text, results in zip(positions, routed, agent_results):
+        risk_result = calculate_risk(results)
+        explanation = generate_explanation(risk_result)
+        outputs[i] = apply_full_guardrails(explanation)
+        if _reusable(results):
+            store_result(routed_text, version, outputs[i])
+
+    return outputs
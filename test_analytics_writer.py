@@ -0,0 +1,36 @@
+import os
+import tempfile
+
+# scratch database: never touch database/safe_intern.db
+os.environ.setdefault("SAFE_INTERN_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="safe_intern_test_"), "test.db"))
+
+from database import analytics_writer
+from database.db_connection import get_db_connection
+from database.db_init import init_database
+
+print("test_analytics_writer.py started ✅")
+
+init_database()
+conn = get_db_connection()
+KEY = "FLUSH_TEST"
+
+# ---------- FAILED WRITE IS NOT CONFIRMED ----------
+
+# hide the table so the writer's transaction fails
+conn.execute("ALTER TABLE risk_patterns RENAME TO risk_patterns_hidden")
+conn.commit()
+analytics_writer.record_pattern_event("payment", KEY)
+assert analytics_writer.flush() is False, "no risk_patterns table: nothing was written"
+assert analytics_writer.writer_stats()["failed_flushes"] >= 1
+print("flush() reports a failed write ✅", analytics_writer.writer_stats())
+
+# ---------- RETRIED ONCE THE TABLE EXISTS ----------
+
+conn.execute("ALTER TABLE risk_patterns_hidden RENAME TO risk_patterns")
+conn.commit()
+assert analytics_writer.flush() is True
+row = conn.execute(
+    "SELECT occurrences FROM risk_patterns WHERE pattern_type = 'payment' AND pattern_key = ?", (KEY,)
+).fetchone()
+assert row is not None and row[0] == 1, row
+print("kept counters written on the next flush ✅")
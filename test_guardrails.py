@@ -0,0 +1,45 @@
+from config.guardrail_words import FORBIDDEN_WORDS
+from utils.guardrails import SHORT_WORD_LENGTH, apply_full_guardrails, final_output_check, sanitize_text
+
+print("test_guardrails.py started ✅")
+
+
+def legacy_flags(text):
+    # the previous check: plain substring test per forbidden word
+    return {w for w in FORBIDDEN_WORDS if w in text.lower()}
+
+
+# ---------- LONG WORDS: substring semantics kept ----------
+
+for text in ("antifraud team", "Scammers ask for fees", "notafake offer", "a Fraudulent letter", "FAKE-ID check"):
+    assert legacy_flags(text), text
+    ok, violations = final_output_check({"summary": text})
+    assert not ok and violations, text
+    cleaned = sanitize_text(text)
+    assert not legacy_flags(cleaned), cleaned
+print("forbidden words inside other words are still caught ✅")
+
+# the whole containing word is replaced, not just the forbidden part
+assert sanitize_text("antifraud team") == "potentially misleading pattern team"
+assert sanitize_text("Scammers ask for fees") == "potential risk indicator ask for fees"
+print("whole containing word replaced ✅")
+
+# ---------- SHORT WORDS: whole words only ----------
+
+short = {w for w in FORBIDDEN_WORDS if len(w) < SHORT_WORD_LENGTH}
+for text in ("This is concerning.", "Please confirm the offer.", "Contact HR before you continue."):
+    assert legacy_flags(text) & short, text   # the old check flagged these...
+    assert sanitize_text(text) == text        # ...and mangled them ("misleading practicecerning")
+    assert final_output_check({"summary": text})[0], text
+assert sanitize_text("That offer is a con.") == "That offer is a misleading practice."
+print("short words match whole words only ✅")
+
+# ---------- ACCUSATIONS + FINAL CHECK ----------
+
+output = apply_full_guardrails({
+    "summary": "This is a scam run by an antifraud impostor.",
+    "explanations": ["Definitely fraud.", "Verify the company."],
+})
+assert final_output_check(output) == (True, []), output
+assert "shows patterns that may require careful verification" in output["summary"]
+print("guarded output passes the final check ✅", output["summary"])
@@ -0,0 +1,116 @@
+import os
+import tempfile
+
+# scratch database: never touch database/safe_intern.db
+os.environ.setdefault("SAFE_INTERN_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="safe_intern_test_"), "test.db"))
+
+print("test_linear_scorer.py started ✅")
+
+import csv
+import shutil
+import time
+from pathlib import Path
+
+from agents.ml_agent import MLAgent
+from ml.linear_scorer import LinearScorer, content_version
+
+TOLERANCE = 1e-9           # float64 table built in memory
+ARTIFACT_TOLERANCE = 1e-5  # shipped artifact stores float32 weights
+
+texts = [
+    row["text"]
+    for path in ("data/fake_internships.csv", "data/real_internships.csv")
+    for row in csv.DictReader(open(path, encoding="utf-8"))
+]
+texts += [
+    "Pay ₹1999 registration fee today via UPI to confirm internship.",
+    "Apply through our official careers portal. Interview rounds will follow.",
+    "",
+    "ok",
+]
+
+ml = MLAgent(scorer_path=None)
+cleaned = [ml.clean_text(t) for t in texts]
+
+# exported from the loaded pickles (independent of ml/linear_scorer/)
+scorer = LinearScorer.from_sklearn(ml.vectorizer, ml.model)
+
+expected = ml.sklearn_probs(cleaned)
+got = scorer.predict_probs(cleaned)
+
+worst = max(abs(a - b) for a, b in zip(expected, got))
+print(f"messages: {len(texts)}  max |Δp|: {worst:.2e}")
+assert worst < TOLERANCE, f"linear scorer differs from sklearn by {worst}"
+
+# batch lookup must agree with one-at-a-time scoring
+single = [scorer.predict_prob(t) for t in cleaned]
+assert max(abs(a - b) for a, b in zip(single, got)) < TOLERANCE
+
+# the shipped (memory-mapped, float32) artifact must match the shipped pickles
+shipped = MLAgent()
+if shipped.scorer is not None:
+    shipped_worst = max(abs(a - b) for a, b in zip(expected, shipped.predict_probs(cleaned, normalized=True)))
+    print(f"ml/linear_scorer/ max |Δp|: {shipped_worst:.2e}")
+    assert shipped_worst < ARTIFACT_TOLERANCE
+    assert shipped.model is None, "sklearn pickles should not be loaded when the artifact is used"
+else:
+    print("ml/linear_scorer/ missing or stale: MLAgent uses sklearn")
+
+started = time.perf_counter()
+for t in cleaned:
+    ml.sklearn_probs([t])
+sk_us = (time.perf_counter() - started) / len(cleaned) * 1e6
+
+started = time.perf_counter()
+for t in cleaned:
+    scorer.predict_prob(t)
+table_us = (time.perf_counter() - started) / len(cleaned) * 1e6
+
+print(f"per message: sklearn {sk_us:.1f} us, linear scorer {table_us:.1f} us")
+print("linear scorer parity ✅")
+
+
+# ---------- REGISTRY: replacing only the term table swaps the model ----------
+
+from agents import model_registry
+
+# module state patched below; restored so later tests see the real registry
+REGISTRY_STATE = ("ML_SCORER_PATH", "_agent", "_info", "_fingerprint", "_last_check")
+saved_state = {name: getattr(model_registry, name) for name in REGISTRY_STATE}
+
+workdir = Path(tempfile.mkdtemp(prefix="safe_intern_scorer_"))
+try:
+    scorer_dir = workdir / "linear_scorer"
+    scorer.source_version = content_version((ml.model_path, ml.vectorizer_path))
+    scorer.save(scorer_dir)
+
+    model_registry.ML_SCORER_PATH = str(scorer_dir)
+    model_registry._agent = None
+    before = model_registry.get_model_info()
+    assert before["inference"] == "linear_scorer", before
+
+    # same pickles, new weights (int8 re-save): a different served model
+    scorer.save(scorer_dir, dtype="int8")
+    model_registry._last_check = float("-inf")
+    after = model_registry.get_model_info()
+    assert after["model_version"] != before["model_version"], "term table change must change model_version"
+    assert model_registry.get_ml_agent().scorer.coef.dtype.name == "int8", "new table must be served"
+    print("term table replacement hot-swaps and changes model_version ✅", before["model_version"], "→", after["model_version"])
+
+    # compacted table (ml.compact_model --out): distinct artifact version
+    from ml.compact_model import prune
+    assert before["scorer_version"] == scorer.source_version
+    assert after["scorer_version"] == f"{scorer.source_version}+int8", after
+    prune(scorer, top_k=5000).save(scorer_dir, dtype="int8")
+    model_registry._last_check = float("-inf")
+    compact = model_registry.get_model_info()
+    assert compact["scorer_version"] == f"{scorer.source_version}+top_k=5000,int8", compact
+    assert compact["model_version"] not in (before["model_version"], after["model_version"])
+    print("compacted table served as", compact["scorer_version"], "✅")
+finally:
+    for name, value in saved_state.items():
+        setattr(model_registry, name, value)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+assert model_registry.get_model_info()["scorer_version"] != compact["scorer_version"]
+print("registry state restored ✅")
@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from intake.llm_client import OpenRouterClient, LLMRequestError
+
+print("test_llm_client.py started ✅")
+
+
+# ---------- LOCAL STUB: OpenRouter chat-completions shape ----------
+
+state = {"calls": 0, "fail_first": True, "in_flight": 0, "max_in_flight": 0}
+lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        text = body["messages"][-1]["content"]
+
+        with lock:
+            state["calls"] += 1
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            fail = state["fail_first"]
+            state["fail_first"] = False
+
+        time.sleep(0.05)
+
+        with lock:
+            state["in_flight"] -= 1
+
+        if fail or text == "always-503":
+            status, payload = (429 if fail else 503), {"error": {"message": "try later"}}
+        else:
+            content = json.dumps({
+                "clean_text": text,
+                "payment_mentions": "fee" in text,
+                "urgency_mentions": False,
+                "input_length": len(text)
+            })
+            status, payload = 200, {
+                "id": "stub",
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]
+            }
+
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f"http://127.0.0.1:{server.server_address[1]}/api/v1/chat/completions"
+
+client = OpenRouterClient(
+    url,
+    system_prompt="stub",
+    api_key="test-key",
+    max_concurrency=3,
+    rate_per_second=100,
+    burst=10,
+    max_retries=2,
+    timeout=5,
+)
+
+# 429 on the very first call is retried transparently
+texts = [f"message {i} fee" if i % 2 else f"message {i}" for i in range(9)]
+results = client.complete_many(texts)
+
+assert [r["clean_text"] for r in results] == texts, "results must keep input order"
+assert results[1]["payment_mentions"] is True
+assert state["calls"] == len(texts) + 1, state
+assert state["max_in_flight"] <= 3, state
+print("ordered results + 429 retry ✅", state)
+
+# persistent 5xx gives up after max_retries and is reported per item
+mixed = client.complete_many(["ok text", "always-503"])
+assert mixed[0]["clean_text"] == "ok text"
+assert isinstance(mixed[1], LLMRequestError)
+print("5xx exhausted retries reported per item ✅")
+
+server.shutdown()
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# scratch database: never touch database/safe_intern.db
+os.environ.setdefault("SAFE_INTERN_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="safe_intern_test_"), "test.db"))
+
+# every check below names its database explicitly: DB_PATH is fixed by
+# whichever module imported database.db_connection first
+scratch = Path(tempfile.mkdtemp(prefix="safe_intern_test_"))
+legacy_path = scratch / "legacy.db"
+
+# ---------- A DATABASE FROM THE FIRST RELEASE ----------
+
+# tables exactly as the original init_database created them, no user_version
+legacy = sqlite3.connect(legacy_path)
+legacy.executescript("""
+CREATE TABLE risk_patterns (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pattern_type TEXT NOT NULL,
+    pattern_key TEXT NOT NULL,
+    occurrences INTEGER DEFAULT 0,
+    last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE company_risk_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    domain TEXT UNIQUE,
+    total_checks INTEGER DEFAULT 0,
+    high_risk_count INTEGER DEFAULT 0,
+    last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE system_metadata (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT UNIQUE,
+    value TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO risk_patterns (pattern_type, pattern_key, occurrences, last_seen) VALUES
+    ('payment', 'UPFRONT_FEE', 2, '2024-01-01 10:00:00'),
+    ('payment', 'UPFRONT_FEE', 3, '2024-03-01 10:00:00'),
+    ('behavior', 'URGENCY', 1, '2024-02-01 10:00:00');
+INSERT INTO company_risk_stats (domain, total_checks, last_checked) VALUES ('example.com', 4, '2024-01-05 09:00:00');
+INSERT INTO system_metadata (key, value) VALUES ('model_version', 'v1');
+""")
+legacy.commit()
+legacy.close()
+
+from database.migrations import SCHEMA_VERSION, get_schema_version, migrate
+
+print("test_migrations.py started ✅")
+
+assert get_schema_version(legacy_path) == 0
+assert migrate(legacy_path) == SCHEMA_VERSION
+print(f"legacy database upgraded to schema v{SCHEMA_VERSION} ✅")
+
+
+def occurrences(conn):
+    return conn.execute(
+        "SELECT occurrences FROM risk_patterns WHERE pattern_type = 'payment' AND pattern_key = 'UPFRONT_FEE'"
+    ).fetchall()
+
+
+# the upsert record_pattern runs: needs the unique (pattern_type, pattern_key) index
+RECORD_PATTERN = """
+INSERT INTO risk_patterns (pattern_type, pattern_key, occurrences, last_seen)
+VALUES ('payment', 'UPFRONT_FEE', 1, CURRENT_TIMESTAMP)
+ON CONFLICT(pattern_type, pattern_key)
+DO UPDATE SET occurrences = occurrences + 1, last_seen = CURRENT_TIMESTAMP
+"""
+
+conn = sqlite3.connect(legacy_path)
+
+# duplicate pattern rows merged, then upserts hit the unique index
+assert occurrences(conn) == [(5,)], occurrences(conn)
+with conn:
+    conn.execute(RECORD_PATTERN)
+assert occurrences(conn) == [(6,)], occurrences(conn)
+print("duplicate risk_patterns merged, upsert works ✅")
+
+# system_metadata carried over to metadata, then dropped
+assert conn.execute("SELECT value FROM metadata WHERE key = 'model_version'").fetchone() == ("v1",)
+print("system_metadata rows moved to metadata ✅")
+
+tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+assert "system_metadata" not in tables
+assert {"metadata", "intake_cache", "near_duplicates", "result_cache"} <= tables, tables
+
+# new company columns added, first_seen backfilled from last_checked
+row = conn.execute("SELECT total_checks, first_seen, unreachable_hits FROM company_risk_stats").fetchone()
+assert row == (4, "2024-01-05 09:00:00", 0), row
+print("company_risk_stats columns added, first_seen backfilled ✅")
+
+# ---------- IDEMPOTENT / FRESH ----------
+
+assert migrate(legacy_path) == SCHEMA_VERSION
+assert occurrences(conn) == [(6,)]
+conn.close()
+print("re-running migrate() changes nothing ✅")
+
+
+def schema(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {
+            table: sorted(row[1] for row in conn.execute(f"PRAGMA table_info({table})"))
+            for (table,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'sqlite_sequence'")
+        }
+    finally:
+        conn.close()
+
+
+fresh_path = scratch / "fresh.db"
+assert migrate(fresh_path) == SCHEMA_VERSION
+assert schema(fresh_path) == schema(legacy_path)
+print("fresh and upgraded databases have the same schema ✅")
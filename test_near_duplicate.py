@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+# scratch database: never touch database/safe_intern.db
+os.environ.setdefault("SAFE_INTERN_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="safe_intern_test_"), "test.db"))
+
+from database.db_init import init_database
+from utils import near_duplicate
+from utils.near_duplicate import find_near_duplicate, remember, shingles, signal_key
+
+print("test_near_duplicate.py started ✅")
+
+init_database()
+
+VERSION = "test-model:lexicon:scoring"
+
+original = (
+    "Dear candidate, congratulations on being shortlisted for the summer internship "
+    "program at our analytics team. No registration fee is required at any stage. "
+    "Your onboarding session starts on Monday and the mentor will share the project "
+    "details with you during the first week. Reply to this email to confirm."
+)
+output = {"risk_score": 12, "risk_category": "Low Risk", "summary": "original output"}
+remember(original, VERSION, output)
+
+# ---------- REUSE: forwarded copy with small wording edits ----------
+
+forwarded = "Fwd: " + original.replace("Dear candidate,", "Dear candidate -")
+hit = find_near_duplicate(forwarded, VERSION)
+assert hit is not None, "small edit of an analyzed message must reuse its result"
+assert hit["summary"] == "original output"
+assert hit["near_duplicate"]["similarity"] >= 0.85, hit["near_duplicate"]
+print("forwarded edit reuses the earlier output ✅", hit["near_duplicate"])
+
+# the reused output is a fresh copy
+hit["summary"] = "changed by caller"
+assert find_near_duplicate(forwarded, VERSION)["summary"] == "original output"
+
+# ---------- REJECT: edit that flips a scored signal ----------
+
+fee_edit = original.replace("No registration fee is required", "Registration fee is required")
+index = near_duplicate._load_index(VERSION)
+a, b = index.signature(shingles(original)), index.signature(shingles(fee_edit))
+similarity = float((a == b).mean())
+assert similarity >= 0.85, similarity   # wording alone would count as a duplicate...
+assert signal_key(original) != signal_key(fee_edit)
+assert find_near_duplicate(fee_edit, VERSION) is None, "removing 'No' flips the fee signal: must be re-analyzed"
+print("'No registration fee' → 'Registration fee' is not reused ✅", round(similarity, 3))
+
+# amounts / phones / URLs also have to match
+for changed in (
+    original + " Stipend: Rs 5000.",
+    original + " Call +91 98765 43210.",
+    original + " Details: https://example-internships.xyz",
+):
+    assert find_near_duplicate(changed, VERSION) is None, changed
+print("added amount / phone / URL is not reused ✅")
+
+# ---------- PERSISTENCE: a new process loads the stored index ----------
+
+near_duplicate._index = None
+assert find_near_duplicate(forwarded, VERSION)["summary"] == "original output"
+print("index reloaded from SQLite ✅")
+
+# ---------- VERSIONING ----------
+
+# a new model / lexicon / scoring version never sees old outputs, and
+# switching to it purges them
+assert find_near_duplicate(forwarded, "other-model:lexicon:scoring") is None
+near_duplicate._index = None
+assert find_near_duplicate(forwarded, VERSION) is None
+print("other result version is not reused ✅")
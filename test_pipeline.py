@@ -1,3 +1,9 @@
+import os
+import tempfile
+
+# scratch database: never touch database/safe_intern.db
+os.environ.setdefault("SAFE_INTERN_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="safe_intern_test_"), "test.db"))
+
 from agents.planner_agent import run_planner
 
 fake_intake = {
@@ -0,0 +1,71 @@
+import os
+import tempfile
+
+# scratch database: never touch database/safe_intern.db
+os.environ.setdefault("SAFE_INTERN_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="safe_intern_test_"), "test.db"))
+
+from database.db_init import init_database
+from utils import result_cache
+from utils.result_cache import cache_stats, clear_memory, get_cached_result, store_result
+
+print("test_result_cache.py started ✅")
+
+init_database()
+
+text = "Pay ₹1999 registration fee today via UPI to confirm internship."
+output = {"risk_score": 71, "risk_category": "High Risk", "explanations": ["a", "b"]}
+
+# ---------- HIT LEVELS ----------
+
+assert get_cached_result(text, "v1") is None
+store_result(text, "v1", output)
+
+hit = get_cached_result(text, "v1")
+assert hit == output and cache_stats()["memory_hits"] == 1, cache_stats()
+hit["explanations"].append("changed by caller")
+assert get_cached_result(text, "v1") == output, "every hit must be a fresh copy"
+
+clear_memory()
+assert get_cached_result(text, "v1") == output
+assert cache_stats()["db_hits"] == 1, cache_stats()
+print("memory + SQLite hits, fresh copies ✅", cache_stats())
+
+# ---------- INVALIDATION BY VERSION ----------
+
+# a new model / lexicon / scoring version never sees old outputs...
+assert get_cached_result(text, "v2") is None
+# ...and its first use purged the old rows from SQLite
+clear_memory()
+assert get_cached_result(text, "v1") is None
+print("new result version misses and purges old entries ✅")
+
+# ---------- PIPELINE: what gets stored ----------
+
+import pipeline
+
+version = pipeline.result_version()
+clean = "Hello candidate, your interview is tomorrow. Please confirm attendance today. No payment is required."
+unreachable = clean + " Details: http://no-such-host.invalid/apply"
+
+pipeline.analyze_text(clean)
+assert get_cached_result(pipeline.route_input(text_input=clean), version) is not None
+print("regular output is cached ✅")
+
+out = pipeline.analyze_text(unreachable)
+routed = pipeline.route_input(text_input=unreachable)
+assert any("could not be reached" in e for e in out["explanations"]), out["explanations"]
+assert get_cached_result(routed, version) is None, "unreachable-website output must not be cached for the full TTL"
+print("output with an unreachable website is not cached ✅")
+
+# ---------- METRICS EXPORT ----------
+
+from utils.tracing import prometheus_text
+
+metrics = prometheus_text()
+stores = cache_stats()["stores"]
+assert f'safe_intern_component_stat{{component="result_cache",stat="stores"}} {stores}' in metrics, metrics
+assert 'component="domain_cache",stat="hit_rate"' in metrics
+print("cache stats exported with the stage latencies ✅")
+assert 'component="intake",stat="llm_skip_rate"' in metrics
+assert 'component="intake",stat="deterministic"' in metrics
+print("intake routing decisions exported ✅")
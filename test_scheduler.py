@@ -0,0 +1,128 @@
+import threading
+import time
+
+from agents.scheduler import AgentTask, run_dag, _get_executor
+from config.settings import AGENT_POOL_WORKERS
+
+print("test_scheduler.py started ✅")
+
+
+def instant(value):
+    return lambda deps: value
+
+
+def sleeper(seconds, value):
+    def fn(deps):
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+def fallback(reason):
+    return {"degraded": reason}
+
+
+# ---------- TIMEOUT / ERROR DEGRADE ----------
+
+def boom(deps):
+    raise RuntimeError("agent failed")
+
+
+dag = run_dag([
+    AgentTask("fast", instant("ok"), timeout=1.0, fallback=fallback),
+    AgentTask("slow", sleeper(0.5, "late"), timeout=0.1, fallback=fallback),
+    AgentTask("broken", boom, timeout=1.0, fallback=fallback),
+    AgentTask("after_slow", lambda deps: deps["slow"], depends_on=("slow",), timeout=1.0, fallback=fallback),
+])
+
+assert dag.results["fast"] == "ok"
+assert dag.degraded == {"slow": "timeout", "broken": "error: RuntimeError"}, dag.degraded
+assert dag.results["slow"] == {"degraded": "timeout"}
+# dependents of a degraded agent still run, with its fallback result
+assert dag.results["after_slow"] == {"degraded": "timeout"}
+print("timeout + error degrade, dependents get fallback ✅", dag.degraded)
+
+
+# ---------- QUEUE TIME DOES NOT COUNT ----------
+
+def occupy_pool(seconds):
+    release = threading.Event()
+    futures = [_get_executor().submit(release.wait, seconds) for _ in range(AGENT_POOL_WORKERS)]
+    return release, futures
+
+
+# pool busy for 0.3 s, agents allow 1 s once running: they queue, then run in the pool
+release, futures = occupy_pool(0.3)
+started = time.monotonic()
+dag = run_dag([AgentTask(f"a{i}", instant(i), timeout=1.0, fallback=fallback) for i in range(4)])
+assert not dag.degraded, dag.degraded
+assert [dag.results[f"a{i}"] for i in range(4)] == [0, 1, 2, 3]
+assert max(dag.elapsed.values()) < 0.1, dag.elapsed   # elapsed = run time, not queue time
+print("queued agents are not degraded by queue time ✅", round(time.monotonic() - started, 2), "s")
+release.set()
+[f.result() for f in futures]
+
+# pool wedged longer than the agents' timeout: they move to overflow threads
+release, futures = occupy_pool(5)
+started = time.monotonic()
+dag = run_dag([AgentTask(f"b{i}", instant(i), timeout=0.2, fallback=fallback) for i in range(3)])
+waited = time.monotonic() - started
+assert not dag.degraded, dag.degraded
+assert [dag.results[f"b{i}"] for i in range(3)] == [0, 1, 2]
+assert waited < 1.0, waited
+print("saturated pool: agents overflow instead of degrading ✅", round(waited, 2), "s")
+release.set()
+[f.result() for f in futures]
+
+# overflowed agents keep their own timeout once running
+release, futures = occupy_pool(5)
+dag = run_dag([AgentTask("c", sleeper(0.6, "late"), timeout=0.2, fallback=fallback)])
+assert dag.degraded == {"c": "timeout"}, dag.degraded
+print("overflowed agent still times out on its own run time ✅")
+release.set()
+[f.result() for f in futures]
+
+# deadline passes after a worker picked the task up but before it recorded
+# its start: cancel fails, the loop must count from then, not spin
+from agents import scheduler
+
+original_timed = scheduler._timed
+
+
+def late_start(slot):
+    def run(deps):
+        time.sleep(0.5)   # picked up, start not recorded yet
+        return original_timed(slot)(deps)
+    return run
+
+
+scheduler._timed = late_start
+try:
+    cpu = time.process_time()
+    dag = run_dag([AgentTask("d", instant("ok"), timeout=0.4, fallback=fallback)])
+    cpu = time.process_time() - cpu
+finally:
+    scheduler._timed = original_timed
+assert dag.results["d"] == "ok" and not dag.degraded, dag.degraded
+assert cpu < 0.05, f"scheduler loop busy-waited: {cpu:.2f} s CPU"
+print("picked-up task without a start time does not spin the loop ✅", round(cpu, 3), "s CPU")
+
+
+# ---------- DEGRADED AGENTS SURFACE IN THE OUTPUT ----------
+
+from agents.planner_agent import DEGRADED_RESULTS
+from utils.explanation_engine import SECTION_DEFAULTS, SECTION_INCOMPLETE, generate_explanation
+from utils.guardrails import apply_full_guardrails
+from utils.risk_engine import calculate_risk
+
+agent_results = {name: make("timeout") for name, make in DEGRADED_RESULTS.items()}
+agent_results["raw_text"] = "Hello, please reply."
+agent_results["degraded"] = ["company", "payment"]
+
+output = apply_full_guardrails(generate_explanation(calculate_risk(agent_results)))
+assert output["incomplete_checks"] == ["company", "payment"], output
+assert SECTION_INCOMPLETE["payment"] in output["explanations"]
+assert SECTION_DEFAULTS["payment"] not in output["explanations"]   # no "nothing found" for a check that never ran
+assert SECTION_DEFAULTS["behavior"] in output["explanations"]
+assert "could not be completed" in output["summary"]
+print("degraded agents reported as incomplete, not as 'nothing found' ✅")
@@ -0,0 +1,96 @@
+import threading
+import time
+
+from utils.singleflight import SingleFlight
+
+print("test_singleflight.py started ✅")
+
+THREADS = 8
+
+
+def wait_for_waiters(flight, count, timeout=5.0):
+    # hold the leader until every other caller has joined its call
+    deadline = time.monotonic() + timeout
+    while sum(flight.in_flight().values()) < count:
+        assert time.monotonic() < deadline, flight.in_flight()
+        time.sleep(0.005)
+
+
+def run_concurrently(fn):
+    results = [None] * THREADS
+    start = threading.Barrier(THREADS)
+
+    def worker(i):
+        start.wait()
+        try:
+            results[i] = fn()
+        except Exception as err:
+            results[i] = err
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+# ---------- CONCURRENT CALLS SHARE ONE RUN ----------
+
+flight = SingleFlight()
+runs = []
+
+
+def analysis():
+    runs.append(threading.current_thread().name)
+    wait_for_waiters(flight, THREADS - 1)
+    return {"risk_score": 42}
+
+
+results = run_concurrently(lambda: flight.do("same text", analysis))
+assert len(runs) == 1, runs
+assert all(shared for _, shared in results), results            # leader included
+assert all(result is results[0][0] for result, _ in results)    # one object: callers must copy
+stats = flight.stats()
+assert stats["executions"] == 1 and stats["shared"] == THREADS - 1, stats
+assert stats["in_flight"] == 0 and flight.recent()[0]["waiters"] == THREADS - 1
+print("8 concurrent callers, 1 run, all marked shared ✅", stats)
+
+# a lone call is not shared, and other keys do not wait on each other
+assert flight.do("other text", lambda: "solo") == ("solo", False)
+print("lone call not shared ✅")
+
+# ---------- THE LEADER'S EXCEPTION REACHES EVERY WAITER ----------
+
+flight = SingleFlight()
+
+
+def failing():
+    wait_for_waiters(flight, THREADS - 1)
+    raise ValueError("intake failed")
+
+
+results = run_concurrently(lambda: flight.do("bad text", failing))
+assert all(isinstance(r, ValueError) for r in results), results
+assert flight.stats()["executions"] == 1
+# the key is released: the next call runs again
+assert flight.do("bad text", lambda: "retried") == ("retried", False)
+print("exception shared with waiters, key released ✅")
+
+# ---------- WAIT TIMEOUT ----------
+
+flight = SingleFlight(wait_timeout=0.1)
+release = threading.Event()
+leader = threading.Thread(target=flight.do, args=("slow text", lambda: release.wait(5)))
+leader.start()
+while not flight.in_flight():
+    time.sleep(0.005)
+
+started = time.monotonic()
+result, shared = flight.do("slow text", lambda: "own run")
+assert (result, shared) == ("own run", False)
+assert time.monotonic() - started < 1.0
+assert flight.stats()["wait_timeouts"] == 1
+release.set()
+leader.join()
+print("stuck leader: waiter computes on its own after the timeout ✅")
@@ -0,0 +1,120 @@
+# utils/analysis_context.py
+"""
+Per-request analysis context for SAFE-INTERN.
+
+Purpose:
+- Derive everything the agents and the risk engine read from the message
+  ONCE per request (built by the planner)
+- Normalized / lowercased text, the ML token stream, entities with
+  offsets and the lexicon keyword scan
+- Read-only after construction, so agents running on scheduler threads
+  can share it
+
+Entity patterns come from utils/text_cleaner (one regex per entity type).
+
+NO scoring
+NO network / database access
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from utils.keyword_matcher import LEXICON_MATCHER, MatchResult
+from utils.text_cleaner import (
+    AMOUNT_PATTERN,
+    EMAIL_PATTERN,
+    PHONE_PATTERN,
+    URL_PATTERN,
+    normalize_model_text,
+)
+
+
+class Span(NamedTuple):
+    value: str
+    start: int
+    end: int
+
+
+def _spans(pattern, text: str) -> Tuple[Span, ...]:
+    return tuple(Span(m.group(0), m.start(), m.end()) for m in pattern.finditer(text))
+
+
+class AnalysisContext:
+    """
+    Shared, precomputed view of one message.
+
+    Span offsets refer to `text`; keyword hit offsets refer to `lower`.
+    """
+
+    __slots__ = (
+        "intake",
+        "text",
+        "lower",
+        "tokens",
+        "urls",
+        "emails",
+        "phones",
+        "amounts",
+        "matches",
+    )
+
+    def __init__(self, text: str, intake: Optional[Dict[str, Any]] = None):
+        self.intake: Dict[str, Any] = intake if intake is not None else {}
+        self.text: str = text or ""
+        self.lower: str = self.text.lower()
+        self.tokens: List[str] = normalize_model_text(self.text).split()
+
+        self.urls = _spans(URL_PATTERN, self.text)
+        self.emails = _spans(EMAIL_PATTERN, self.text)
+        self.phones = _spans(PHONE_PATTERN, self.text)
+        self.amounts = _spans(AMOUNT_PATTERN, self.text)
+
+        # one keyword scan shared by every rule agent and the risk engine
+        self.matches: MatchResult = LEXICON_MATCHER.match(self.lower)
+
+    @property
+    def model_text(self) -> str:
+        """Input for the ML vectorizer (already normalized)."""
+        return " ".join(self.tokens)
+
+    def first_url(self) -> Optional[str]:
+        return self.urls[0].value if self.urls else None
+
+    def first_amount(self) -> Optional[str]:
+        return self.amounts[0].value if self.amounts else None
+
+    def __repr__(self) -> str:
+        return (
+            f"AnalysisContext(chars={len(self.text)}, tokens={len(self.tokens)}, "
+            f"urls={len(self.urls)}, emails={len(self.emails)}, "
+            f"phones={len(self.phones)}, amounts={len(self.amounts)})"
+        )
+
+
+# ---------- BUILDERS ----------
+
+def intake_to_dict(intake: Any) -> Dict[str, Any]:
+    """
+    IntakeSchema (or an already-plain dict) → dict.
+    """
+    if isinstance(intake, dict):
+        return intake
+    if hasattr(intake, "to_dict"):
+        return intake.to_dict()
+    return dict(vars(intake))
+
+
+def scoring_text(intake_data: Dict[str, Any]) -> str:
+    # ALWAYS keep raw text for scoring
+    return (
+        intake_data.get("raw_text", "")
+        or intake_data.get("clean_text", "")
+        or ""
+    )
+
+
+def build_context(intake: Any) -> AnalysisContext:
+    """
+    Build the context for one intake (IntakeSchema or dict).
+    """
+    intake_data = intake_to_dict(intake)
+    return AnalysisContext(scoring_text(intake_data), intake_data)
@@ -0,0 +1,144 @@
+# utils/domain_cache.py
+"""
+Domain reachability cache for SAFE-INTERN.
+
+Purpose:
+- Avoid a live network check for every message from a known domain
+- Persist probe outcomes in company_risk_stats (via company_repository)
+- Serve fresh answers within a TTL; serve stale answers immediately and
+  refresh them in the background
+- Track hit rate
+
+NO scoring
+NO user-facing logic
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+import sqlite3
+import threading
+
+from config.settings import (
+    DOMAIN_CACHE_TTL_SECONDS,
+    DOMAIN_CACHE_NEGATIVE_TTL_SECONDS,
+    DOMAIN_CACHE_MAX_STALE_SECONDS,
+    DOMAIN_CACHE_REFRESH_WORKERS,
+)
+from database import company_repository
+from utils.reachability import ProbeResult, probe_url
+
+
+_refresher = ThreadPoolExecutor(
+    max_workers=DOMAIN_CACHE_REFRESH_WORKERS,
+    thread_name_prefix="safe-intern-domain-refresh",
+)
+_refreshing: set = set()
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "stale_hits": 0, "misses": 0}
+
+
+# ---------- STORAGE ----------
+
+def _load(domain: str) -> Optional[Dict[str, Any]]:
+    try:
+        return company_repository.get_domain_check(domain)
+    except sqlite3.Error:
+        # cache unavailable (e.g. DB not initialized): behave like a miss
+        return None
+
+
+def _store(domain: str, probe: ProbeResult) -> None:
+    try:
+        company_repository.save_domain_check(
+            domain,
+            website_reachable=probe.reachable,
+            uses_https=probe.uses_https,
+            status_code=probe.status_code,
+        )
+    except sqlite3.Error:
+        pass
+
+
+def _probe_and_store(url: str, domain: str) -> ProbeResult:
+    probe = probe_url(url)
+    _store(domain, probe)
+    return probe
+
+
+def _refresh_async(url: str, domain: str) -> None:
+    with _stats_lock:
+        if domain in _refreshing:
+            return
+        _refreshing.add(domain)
+
+    def job():
+        try:
+            _probe_and_store(url, domain)
+        finally:
+            with _stats_lock:
+                _refreshing.discard(domain)
+
+    _refresher.submit(job)
+
+
+def _count(kind: str) -> None:
+    with _stats_lock:
+        _stats[kind] += 1
+
+
+def _from_row(url: str, domain: str, row: Dict[str, Any]) -> ProbeResult:
+    return ProbeResult(
+        url=url,
+        reachable=row["website_reachable"],
+        status_code=row["status_code"],
+        final_host=domain,
+        uses_https=row["uses_https"],
+        method="CACHE",
+        cached=True,
+    )
+
+
+# ---------- PUBLIC API ----------
+
+def check_website(url: str, domain: str) -> ProbeResult:
+    """
+    Return a reachability answer for a website, cached per domain.
+
+    Args:
+        url: Website URL to probe on a miss
+        domain: Cache key (website domain)
+
+    Returns:
+        ProbeResult (cached=True when served from the cache)
+    """
+    row = _load(domain)
+
+    if row is not None and row["age_seconds"] is not None:
+        age = row["age_seconds"]
+        ttl = DOMAIN_CACHE_TTL_SECONDS if row["website_reachable"] else DOMAIN_CACHE_NEGATIVE_TTL_SECONDS
+
+        if age < ttl:
+            _count("hits")
+            return _from_row(url, domain, row)
+
+        if age < DOMAIN_CACHE_MAX_STALE_SECONDS:
+            _count("stale_hits")
+            _refresh_async(url, domain)
+            return _from_row(url, domain, row)
+
+    _count("misses")
+    return _probe_and_store(url, domain)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss counters since process start. Stale hits count as hits
+    (no network on the request path).
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+
+    total = stats["hits"] + stats["stale_hits"] + stats["misses"]
+    stats["hit_rate"] = round((stats["hits"] + stats["stale_hits"]) / total, 4) if total else 0.0
+    return stats
@@ -15,6 +15,8 @@ NO absolute claims
 
 from typing import Dict, Any, List
 
+from config.signals import SIGNALS, Signal, explain
+
 
 # ---------- DISCLAIMER ----------
 
@@ -27,111 +29,52 @@ DISCLAIMER = (
 
 # ---------- EXPLANATION BUILDERS ----------
 
-def explain_company(details: List[str]) -> List[str]:
-    explanations = []
-
-    for d in details:
-        d = d.lower()
-
-        if "not reachable" in d:
-            explanations.append(
-                "The company website could not be reached, which may make verification difficult."
-            )
-        elif "does not use https" in d:
-            explanations.append(
-                "The company website does not use HTTPS, which is less common for established organizations."
-            )
-        elif "free email domain" in d:
-            explanations.append(
-                "Communication appears to use a free email domain rather than an official company domain."
-            )
-        elif "does not match website domain" in d:
-            explanations.append(
-                "The email domain does not match the website domain, which may require additional verification."
-            )
-
-    if not explanations:
-        explanations.append(
-            "No significant concerns were observed related to the company’s online presence."
-        )
-
-    return explanations
-
-
-def explain_payment(details: List[str]) -> List[str]:
-    explanations = []
-
-    for d in details:
-        d = d.lower()
-
-        if "payment appears to be requested before" in d:
-            explanations.append(
-                "Payment is requested before the internship begins, which is uncommon and may require careful verification."
-            )
-        elif "specific payment amount" in d:
-            explanations.append(
-                "A specific payment amount is mentioned in the communication."
-            )
-        elif "high-pressure language" in d:
-            explanations.append(
-                "Time-sensitive language is used around payment, which may increase pressure on the applicant."
-            )
-
-    if not explanations:
-        explanations.append(
-            "No unusual payment-related patterns were detected."
-        )
-
-    return explanations
-
+# sections shown to the user, in order, with the sentence used when a
+# section has nothing to report
+SECTION_DEFAULTS = {
+    "company": "No significant concerns were observed related to the company’s online presence.",
+    "payment": "No unusual payment-related patterns were detected.",
+    "behavior": "The communication tone appears balanced without strong urgency or pressure.",
+    "ml": "Machine learning analysis did not identify strong risk-related language patterns.",
+}
+
+
+# used instead of the default for a section whose agent did not finish:
+# "nothing found" would wrongly reassure
+SECTION_INCOMPLETE = {
+    "company": "The company / website check could not be completed for this analysis, so the company’s online presence was not assessed.",
+    "payment": "The payment check could not be completed for this analysis, so payment-related patterns were not assessed.",
+    "behavior": "The communication-tone check could not be completed for this analysis, so urgency or pressure was not assessed.",
+    "ml": "The machine learning check could not be completed for this analysis.",
+}
+
+INCOMPLETE_NOTE = "Some checks could not be completed, so this score may understate the risk. Consider running the analysis again."
+
+
+def explain_signals(signals: List[Signal], degraded: List[str] = ()) -> List[str]:
+    """
+    Registry lookup: one sentence per distinct signal code, grouped by
+    section; a section without sentences gets its default, or the
+    "not completed" sentence if its agent is in degraded.
+    """
+    by_section: Dict[str, List[str]] = {section: [] for section in SECTION_DEFAULTS}
+    seen = set()
+
+    for signal in signals:
+        section = SIGNALS[signal.code].section
+        if section not in by_section or signal.code in seen:
+            continue
+        seen.add(signal.code)
+
+        sentence = explain(signal)
+        if sentence:
+            by_section[section].append(sentence)
 
-def explain_behavior(details: List[str]) -> List[str]:
     explanations = []
-
-    for d in details:
-        d = d.lower()
-
-        if "urgency" in d:
-            explanations.append(
-                "Urgency-focused language is used, which may encourage rushed decision-making."
-            )
-        elif "manipulation" in d:
-            explanations.append(
-                "Certain phrases suggest guaranteed outcomes or simplified processes, which may warrant caution."
-            )
-
-    if not explanations:
-        explanations.append(
-            "The communication tone appears balanced without strong urgency or pressure."
-        )
-
-    return explanations
-
-
-def explain_ml(details: List[str]) -> List[str]:
-    explanations = []
-
-    for d in details:
-        d = d.lower()
-
-        if "low" in d:
-            explanations.append(
-                "Language patterns are similar to lower-risk internship communications."
-            )
-        elif "medium" in d:
-            explanations.append(
-                "Some language patterns resemble those found in higher-risk communications."
-            )
-        elif "high" in d:
-            explanations.append(
-                "The language shows multiple patterns commonly associated with higher-risk internship messages."
-            )
-
-    if not explanations:
-        explanations.append(
-            "Machine learning analysis did not identify strong risk-related language patterns."
-        )
-
+    for section, default in SECTION_DEFAULTS.items():
+        if section in degraded:
+            default = SECTION_INCOMPLETE[section]
+        explanations.extend(by_section[section] or [default])
     return explanations
 
 
@@ -158,21 +101,23 @@ def generate_summary(risk_category: str, risk_score: int) -> str:
 # ---------- MAIN EXPLANATION ENGINE ----------
 
 def generate_explanation(risk_result: Dict[str, Any]) -> Dict[str, Any]:
-    details = risk_result.get("details", {})
     risk_category = risk_result.get("risk_category", "Unknown")
     risk_score = risk_result.get("risk_score", 0)
 
-    explanations = []
-    explanations.extend(explain_company(details.get("company", [])))
-    explanations.extend(explain_payment(details.get("payment", [])))
-    explanations.extend(explain_behavior(details.get("behavior", [])))
-    explanations.extend(explain_ml(details.get("ml", [])))
+    degraded = risk_result.get("degraded", [])
+    explanations = explain_signals(risk_result.get("signals", []), degraded)
+
+    summary = generate_summary(risk_category, risk_score)
+    if degraded:
+        summary = f"{summary} {INCOMPLETE_NOTE}"
 
     return {
         "risk_category": risk_category,
         "risk_score": risk_score,
-        "summary": generate_summary(risk_category, risk_score),
+        "summary": summary,
         "explanations": explanations,
         "breakdown": risk_result.get("breakdown", {}),
+        # checks that did not run (agent timed out / failed)
+        "incomplete_checks": sorted(degraded),
         "disclaimer": DISCLAIMER
     }
@@ -8,13 +8,29 @@ Purpose:
 - Replace forbidden words before user display
 - Validate output safety before UI rendering
 
+All forbidden words and accusatory patterns are compiled at import into
+one alternation regex, so a string is sanitized in a single pass that
+also reports what it replaced. Results are memoized per string: the
+explanation engine emits mostly the same static sentences.
+
+Word rules:
+- Accusatory patterns ("this is a scam") are tried first and replaced
+  as a whole
+- Short forbidden words (< 4 letters, e.g. "con") match whole words only,
+  so "concerning" is left alone
+- Longer forbidden words match anywhere inside a word, like the old
+  substring check, and the whole containing word is replaced
+  ("fraudulent", "antifraud", "notafake")
+
 Runs AFTER explanation_engine
 Runs BEFORE Streamlit UI
 """
 
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple
 import re
 from config.guardrail_words import FORBIDDEN_WORDS, SAFE_REPLACEMENTS
+from config.settings import GUARDRAIL_CACHE_SIZE
 
 
 # ---------- ACCUSATORY PATTERNS ----------
@@ -26,9 +42,61 @@ ACCUSATORY_PATTERNS = [
     r'\bguaranteed (to be )?(a )?(scam|fraud)\b',
 ]
 
+ACCUSATION_REPLACEMENT = "shows patterns that may require careful verification"
+DEFAULT_REPLACEMENT = "potential risk indicator"
+
+SHORT_WORD_LENGTH = 4
+
+
+# ---------- COMPILED GUARDRAIL REGEX ----------
+
+def _alternation(words) -> str:
+    # longest first so overlapping words prefer the longer one
+    return "|".join(re.escape(w) for w in sorted(words, key=lambda w: (-len(w), w)))
+
+
+def _compile_guardrail_regex() -> re.Pattern:
+    long_words = [w for w in FORBIDDEN_WORDS if len(w) >= SHORT_WORD_LENGTH]
+    short_words = [w for w in FORBIDDEN_WORDS if len(w) < SHORT_WORD_LENGTH]
+
+    branches = ["(?P<accusation>" + "|".join(f"(?:{p})" for p in ACCUSATORY_PATTERNS) + ")"]
+    if long_words:
+        branches.append(rf"\w*(?P<word>{_alternation(long_words)})\w*")
+    if short_words:
+        branches.append(rf"\b(?P<short>{_alternation(short_words)})\b")
+
+    return re.compile("|".join(branches), re.IGNORECASE)
+
+
+GUARDRAIL_REGEX = _compile_guardrail_regex()
+
+# replacements must not themselves trip the guardrail (keeps one pass final)
+for _replacement in [*SAFE_REPLACEMENTS.values(), ACCUSATION_REPLACEMENT, DEFAULT_REPLACEMENT]:
+    if GUARDRAIL_REGEX.search(_replacement):
+        raise ValueError(f"Guardrail replacement contains forbidden language: {_replacement!r}")
+
 
 # ---------- CORE SANITIZATION ----------
 
+@lru_cache(maxsize=GUARDRAIL_CACHE_SIZE)
+def _sanitize(text: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    One pass: replace every match and record what was replaced.
+    """
+    violations = []
+
+    def replace(match: re.Match) -> str:
+        if match.group("accusation"):
+            violations.append("Accusatory pattern")
+            return ACCUSATION_REPLACEMENT
+
+        word = (match.group("word") or match.group("short")).lower()
+        violations.append(f"Forbidden word '{word}'")
+        return SAFE_REPLACEMENTS.get(word, DEFAULT_REPLACEMENT)
+
+    return GUARDRAIL_REGEX.sub(replace, text), tuple(violations)
+
+
 def sanitize_text(text: str) -> str:
     """
     Sanitize user-facing text by:
@@ -39,72 +107,52 @@ def sanitize_text(text: str) -> str:
     if not text:
         return ""
 
-    sanitized = text
-
-    # Replace forbidden words
-    for bad_word in FORBIDDEN_WORDS:
-        if bad_word.lower() in sanitized.lower():
-            replacement = SAFE_REPLACEMENTS.get(
-                bad_word, "potential risk indicator"
-            )
-            sanitized = _replace_case_insensitive(
-                sanitized, bad_word, replacement
-            )
-
-    # Remove accusatory patterns
-    for pattern in ACCUSATORY_PATTERNS:
-        sanitized = re.sub(
-            pattern,
-            "shows patterns that may require careful verification",
-            sanitized,
-            flags=re.IGNORECASE
-        )
-
-    return sanitized
-
-
-def _replace_case_insensitive(text: str, target: str, replacement: str) -> str:
-    pattern = re.compile(re.escape(target), re.IGNORECASE)
-    return pattern.sub(replacement, text)
+    return _sanitize(text)[0]
 
 
 # ---------- STRUCTURED GUARDRAILS ----------
 
-def apply_guardrails(output: Dict[str, Any]) -> Dict[str, Any]:
+def guard_output(output: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
     """
-    Recursively apply guardrails to explanation output.
+    Sanitize every string in an explanation output (nested dicts/lists)
+    and collect what was replaced, in one traversal.
+
+    Returns:
+        (guarded copy, violations found in the input with their paths)
     """
 
-    guarded = {}
+    violations: List[str] = []
 
-    for key, value in output.items():
-        if isinstance(value, str):
-            guarded[key] = sanitize_text(value)
+    def walk(obj: Any, path: str) -> Any:
+        if isinstance(obj, str):
+            if not obj:
+                return ""
+            sanitized, found = _sanitize(obj)
+            violations.extend(f"{v} at {path}" for v in found)
+            return sanitized
 
-        elif isinstance(value, list):
-            guarded[key] = [
-                sanitize_text(v) if isinstance(v, str) else v
-                for v in value
-            ]
+        if isinstance(obj, list):
+            return [walk(item, f"{path}[{i}]") for i, item in enumerate(obj)]
 
-        elif isinstance(value, dict):
-            guarded[key] = apply_guardrails(value)
+        if isinstance(obj, dict):
+            return {k: walk(v, f"{path}.{k}") for k, v in obj.items()}
 
-        else:
-            guarded[key] = value
+        return obj
 
-    return guarded
+    return walk(output, "root"), violations
 
 
-def apply_full_guardrails(output: Dict[str, Any]) -> Dict[str, Any]:
-    guarded = apply_guardrails(output)
-    is_safe, violations = final_output_check(guarded)
+def apply_guardrails(output: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Recursively apply guardrails to explanation output.
+    """
+
+    return guard_output(output)[0]
 
-    if not is_safe:
-        # last-resort sanitization (safe fallback)
-        guarded = apply_guardrails(guarded)
 
-    return guarded
+def apply_full_guardrails(output: Dict[str, Any]) -> Dict[str, Any]:
+    # replacements are checked at import never to match, so one pass is final
+    return guard_output(output)[0]
 
 
 # ---------- FINAL SAFETY VALIDATION ----------
@@ -114,26 +162,6 @@ def final_output_check(output: Dict[str, Any]) -> Tuple[bool, List[str]]:
     Ensure no forbidden or accusatory language remains.
     """
 
-    violations = []
-
-    def scan(obj: Any, path: str = "root"):
-        if isinstance(obj, str):
-            for word in FORBIDDEN_WORDS:
-                if word.lower() in obj.lower():
-                    violations.append(f"Forbidden word '{word}' at {path}")
-
-            for pattern in ACCUSATORY_PATTERNS:
-                if re.search(pattern, obj, re.IGNORECASE):
-                    violations.append(f"Accusatory pattern at {path}")
-
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                scan(item, f"{path}[{i}]")
-
-        elif isinstance(obj, dict):
-            for k, v in obj.items():
-                scan(v, f"{path}.{k}")
-
-    scan(output)
+    _, violations = guard_output(output)
 
     return len(violations) == 0, violations
@@ -0,0 +1,165 @@
+# utils/keyword_matcher.py
+"""
+Single-pass multi-keyword matcher for SAFE-INTERN.
+
+Purpose:
+- Compile every keyword list once into one combined regex
+- Scan a text ONCE and report every hit with its category and offset
+- Let all rule agents / risk engine read their hits from one result
+
+Semantics match `keyword in text` (substring, overlapping hits included):
+the regex finds the longest keyword starting at each offset, and every
+shorter keyword that is a prefix of it is added from a precomputed table.
+Keywords are compiled as a prefix trie (a|b(?:c|d)...) rather than a flat
+alternation, so each offset costs one branch walk instead of ~100 tries.
+
+NO scoring
+NO user-facing logic
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from config.lexicon import KEYWORD_CATEGORIES
+
+
+class KeywordHit(NamedTuple):
+    category: str
+    keyword: str
+    offset: int
+
+
+class MatchResult:
+    """
+    Hits of one scan. terms() keeps lexicon declaration order so callers
+    see the same ordering as a `[k for k in LIST if k in text]` scan.
+    Per-category views and the full hit list are built lazily.
+    """
+
+    __slots__ = ("_matcher", "_raw", "_found", "_terms", "_hits")
+
+    def __init__(self, matcher: "KeywordMatcher", raw: List[Tuple[int, str]], found: set):
+        self._matcher = matcher
+        self._raw = raw          # (offset, longest keyword at offset)
+        self._found = found      # every keyword seen anywhere
+        self._terms = None
+        self._hits = None
+
+    def _group(self) -> Dict[str, List[str]]:
+        # work is proportional to the (small) number of distinct hits,
+        # not to the size of the lexicon
+        by_category: Dict[str, List[str]] = {}
+        categories_of = self._matcher.categories_of
+        for word in self._found:
+            for category in categories_of[word]:
+                by_category.setdefault(category, []).append(word)
+
+        order = self._matcher.order
+        for category, words in by_category.items():
+            words.sort(key=lambda w: order[(category, w)])
+        return by_category
+
+    def terms(self, category: str) -> List[str]:
+        if self._terms is None:
+            self._terms = self._group()
+        return self._terms.get(category, [])
+
+    def has(self, category: str) -> bool:
+        return bool(self.terms(category))
+
+    @property
+    def hits(self) -> List[KeywordHit]:
+        if self._hits is None:
+            categories_of = self._matcher.categories_of
+            prefixes = self._matcher.prefixes
+            self._hits = [
+                KeywordHit(category, keyword, offset)
+                for offset, longest in self._raw
+                for keyword in prefixes[longest]
+                for category in categories_of[keyword]
+            ]
+        return self._hits
+
+    def offsets(self, category: str) -> List[Tuple[str, int]]:
+        return [(h.keyword, h.offset) for h in self.hits if h.category == category]
+
+    def __repr__(self) -> str:
+        return f"MatchResult({sorted(self._found)!r})"
+
+
+class KeywordMatcher:
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self.categories_of: Dict[str, List[str]] = {}
+        self.order: Dict[Tuple[str, str], int] = {}
+
+        for category, words in categories.items():
+            for i, word in enumerate(words):
+                word = word.lower()
+                cats = self.categories_of.setdefault(word, [])
+                if category not in cats:
+                    cats.append(category)
+                self.order.setdefault((category, word), i)
+
+        keywords = sorted(self.categories_of, key=len, reverse=True)
+
+        # longest keyword at an offset -> every keyword that is its prefix
+        self.prefixes: Dict[str, List[str]] = {
+            k: [p for p in keywords if k.startswith(p)] for k in keywords
+        }
+
+        self._pattern = re.compile(_trie_regex(keywords))
+
+    def match(self, text: str) -> MatchResult:
+        """
+        Scan already-lowercased text once.
+        """
+        raw: List[Tuple[int, str]] = []
+        found: set = set()
+        prefixes = self.prefixes
+        search = self._pattern.search
+
+        # restart one char after each match start so overlapping hits are kept
+        m = search(text)
+        while m:
+            offset = m.start()
+            longest = m.group()
+            raw.append((offset, longest))
+            found.update(prefixes[longest])
+            m = search(text, offset + 1)
+
+        return MatchResult(self, raw, found)
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """
+    Compile words into a greedy prefix-trie regex that matches the
+    longest word starting at a position.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # a word may end here: the longer continuation is optional (greedy)
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+# ---------- SHARED LEXICON MATCHER ----------
+
+LEXICON_MATCHER = KeywordMatcher(KEYWORD_CATEGORIES)
+
+
+def match_keywords(text: str) -> MatchResult:
+    """
+    Lowercase once and scan with the shared lexicon matcher.
+    """
+    return LEXICON_MATCHER.match((text or "").lower())
@@ -0,0 +1,312 @@
+# utils/near_duplicate.py
+"""
+Near-duplicate message index for SAFE-INTERN.
+
+Purpose:
+- Recognize messages that were already analyzed, forwarded verbatim or
+  with small edits, and reuse their guarded output instead of running
+  intake, the website check and ML scoring again
+- MinHash signatures over word shingles of the ML-normalized text,
+  LSH banding for candidate lookup, estimated Jaccard >= NEAR_DUP_THRESHOLD
+  to accept a match
+- A match also needs the same scored content: URLs / emails / phones,
+  amounts and lexicon hits (normalization strips URLs and numbers, and a
+  small edit such as "No registration fee" → "Registration fee" keeps
+  the shingles similar but flips a rule signal)
+- Bounded memory: at most NEAR_DUP_MAX_ENTRIES entries, least recently
+  used evicted first; entries expire after NEAR_DUP_TTL_SECONDS
+- Persisted in near_duplicates (via near_duplicate_repository) and loaded
+  into memory on first use
+
+Index failures never break analysis: any DB error is treated as a miss.
+
+NO scoring
+NO user-facing logic
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import hashlib
+import itertools
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from config.settings import (
+    NEAR_DUP_ENABLED,
+    NEAR_DUP_THRESHOLD,
+    NEAR_DUP_NUM_PERM,
+    NEAR_DUP_BANDS,
+    NEAR_DUP_SHINGLE_WORDS,
+    NEAR_DUP_MIN_SHINGLES,
+    NEAR_DUP_MAX_ENTRIES,
+    NEAR_DUP_TTL_SECONDS,
+)
+from database import near_duplicate_repository
+from utils.keyword_matcher import match_keywords
+from utils.text_cleaner import (
+    AMOUNT_PATTERN,
+    EMAIL_PATTERN,
+    PHONE_PATTERN,
+    URL_PATTERN,
+    normalize_model_text,
+)
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_HASH_SEED = 1   # fixed: signatures are persisted and compared across processes
+
+
+# ---------- SHINGLES ----------
+
+def shingles(text: str, size: int = NEAR_DUP_SHINGLE_WORDS) -> Set[str]:
+    tokens = normalize_model_text(text).split()
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def signal_key(text: str) -> str:
+    """
+    Hash of everything the rule agents score besides wording: two messages
+    reuse one result only if this is equal.
+    """
+    matches = match_keywords(text)
+    parts = sorted(
+        {"url:" + m.lower() for m in URL_PATTERN.findall(text)}
+        | {"email:" + m.lower() for m in EMAIL_PATTERN.findall(text)}
+        | {"phone:" + "".join(c for c in m if c.isdigit()) for m in PHONE_PATTERN.findall(text)}
+        | {"amount:" + "".join(m.lower().split()) for m in AMOUNT_PATTERN.findall(text)}
+        | {f"kw:{hit.category}:{hit.keyword}" for hit in matches.hits}
+    )
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+# ---------- INDEX ----------
+
+class _Entry:
+    __slots__ = ("signature", "signal_key", "output", "created_at")
+
+    def __init__(self, signature: np.ndarray, signal_key: str, output: str, created_at: float):
+        self.signature = signature
+        self.signal_key = signal_key
+        self.output = output            # JSON; decoded per hit so callers get a fresh copy
+        self.created_at = created_at
+
+
+class NearDuplicateIndex:
+    """
+    In-memory MinHash/LSH index with LRU eviction. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = NEAR_DUP_NUM_PERM,
+        bands: int = NEAR_DUP_BANDS,
+        threshold: float = NEAR_DUP_THRESHOLD,
+        max_entries: int = NEAR_DUP_MAX_ENTRIES,
+        ttl_seconds: float = NEAR_DUP_TTL_SECONDS,
+    ):
+        if num_perm % bands:
+            raise ValueError("NEAR_DUP_NUM_PERM must be a multiple of NEAR_DUP_BANDS")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # h(x) = (a * x + b) mod 2^32 with odd a: one hash function per permutation
+        rng = np.random.RandomState(_HASH_SEED)
+        self._a = rng.randint(1, 2 ** 32, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, bytes], Set[int]] = {}
+        self._stats = {"lookups": 0, "hits": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def signature(self, shingle_set: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingle_set), dtype=np.uint64
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) & _MASK32
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        r = self.rows
+        return [(band, signature[band * r:(band + 1) * r].tobytes()) for band in range(self.bands)]
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for key in self._band_keys(entry.signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def add(self, entry_id: int, signature: np.ndarray, signal: str, output: str, created_at: float) -> None:
+        with self._lock:
+            self._remove(entry_id)
+            self._entries[entry_id] = _Entry(signature, signal, output, created_at)
+            for key in self._band_keys(signature):
+                self._buckets.setdefault(key, set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def query(self, signature: np.ndarray, signal: str, now: float) -> Optional[Tuple[int, float, _Entry]]:
+        """
+        Best matching entry (id, estimated similarity, entry) or None.
+        """
+        with self._lock:
+            self._stats["lookups"] += 1
+
+            candidates: Set[int] = set()
+            for key in self._band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+
+            best = None
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                if entry.signal_key != signal:
+                    continue
+                if now - entry.created_at > self.ttl_seconds:
+                    self._remove(entry_id)
+                    continue
+                similarity = float(np.mean(entry.signature == signature))
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (entry_id, similarity, entry)
+
+            if best is not None:
+                self._entries.move_to_end(best[0])
+                self._stats["hits"] += 1
+            return best
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "buckets": len(self._buckets)}
+
+
+# ---------- SHARED INDEX (persisted) ----------
+
+_index: Optional[NearDuplicateIndex] = None
+_index_version: Optional[str] = None
+_index_lock = threading.Lock()
+_local_ids = itertools.count(-1, -1)   # ids for entries the DB could not store
+
+
+def _load_index(version: str) -> NearDuplicateIndex:
+    global _index, _index_version
+
+    if _index is not None and _index_version == version:
+        return _index
+
+    with _index_lock:
+        if _index is not None and _index_version == version:
+            return _index
+
+        index = NearDuplicateIndex()
+        min_created_at = time.time() - index.ttl_seconds
+        try:
+            near_duplicate_repository.purge(version, min_created_at)
+            rows = near_duplicate_repository.load_recent(version, min_created_at, index.max_entries)
+        except sqlite3.Error:
+            rows = []
+
+        # oldest first, so the LRU order matches the stored last use
+        for row in reversed(rows):
+            index.add(
+                row["id"],
+                np.frombuffer(row["signature"], dtype=np.uint32),
+                row["signal_key"],
+                row["output"],
+                row["created_at"],
+            )
+
+        _index, _index_version = index, version
+        return index
+
+
+def find_near_duplicate(text: str, version: str) -> Optional[Dict[str, Any]]:
+    """
+    Output of an earlier analysis of a near-identical message, annotated
+    with the match, or None.
+
+    Args:
+        text: Routed (cleaned) message text
+        version: Model + lexicon version the output must come from
+    """
+    if not NEAR_DUP_ENABLED:
+        return None
+
+    shingle_set = shingles(text)
+    if len(shingle_set) < NEAR_DUP_MIN_SHINGLES:
+        return None
+
+    index = _load_index(version)
+    now = time.time()
+    match = index.query(index.signature(shingle_set), signal_key(text), now)
+    if match is None:
+        return None
+
+    entry_id, similarity, entry = match
+    if entry_id > 0:
+        try:
+            near_duplicate_repository.mark_used(entry_id, now)
+        except sqlite3.Error:
+            pass
+
+    output = json.loads(entry.output)
+    output["near_duplicate"] = {
+        "similarity": round(similarity, 3),
+        "analyzed_at": datetime.fromtimestamp(entry.created_at, timezone.utc).isoformat(timespec="seconds"),
+    }
+    return output
+
+
+def remember(text: str, version: str, output: Dict[str, Any]) -> None:
+    """
+    Index a freshly analyzed message with its guarded output.
+    """
+    if not NEAR_DUP_ENABLED:
+        return
+
+    shingle_set = shingles(text)
+    if len(shingle_set) < NEAR_DUP_MIN_SHINGLES:
+        return
+
+    index = _load_index(version)
+    signature = index.signature(shingle_set)
+    signal = signal_key(text)
+    payload = json.dumps(output, ensure_ascii=False)
+    created_at = time.time()
+
+    try:
+        entry_id = near_duplicate_repository.store_entry(
+            signature.tobytes(), signal, version, payload, created_at, index.max_entries
+        )
+    except sqlite3.Error:
+        entry_id = next(_local_ids)
+
+    index.add(entry_id, signature, signal, payload, created_at)
+
+
+def index_stats() -> Dict[str, Any]:
+    """
+    Lookup / hit / eviction counters of the shared index.
+    """
+    return _index.stats() if _index is not None else {"lookups": 0, "hits": 0, "evictions": 0, "entries": 0}
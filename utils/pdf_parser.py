@@ -5,19 +5,282 @@ PDF text extraction for SAFE-INTERN.
 Purpose:
 - Extract raw text from uploaded PDFs
 - Used ONLY in intake stage
+
+Large documents are bounded: pages are produced lazily and extraction
+stops at a character, page or time budget. Documents with many pages
+are split into page ranges extracted in a process pool: ranges are
+submitted a few at a time (one per worker), each capped by the
+characters still wanted, and none once a budget is spent. Workers read
+the document from one temp file rather than a pickled copy per task.
+The pool starts
+its workers with forkserver (spawn where unavailable), never fork: the
+app is multithreaded, and a forked child can inherit locks held by
+other threads. If the workers cannot start or die (BrokenProcessPool),
+the affected page ranges are read in-process and the pool is recreated
+on next use.
 """
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Deque, Iterator, List, Optional, Tuple
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
 import fitz  # PyMuPDF
 
+from config.settings import (
+    PDF_MAX_PAGES,
+    PDF_TIME_BUDGET_SECONDS,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_PARALLEL_WORKERS,
+    PDF_PAGES_PER_TASK,
+)
 
-def extract_text_from_pdf(pdf_bytes: bytes) -> str:
+
+# ---------- LAZY PAGE ITERATOR ----------
+
+def iter_pdf_pages(
+    pdf_bytes: bytes,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    time_budget: Optional[float] = None
+) -> Iterator[str]:
+    """
+    Yield page texts one at a time, stopping once any budget is spent.
+    """
     if not pdf_bytes:
-        return ""
+        return
 
-    text = []
+    started = time.monotonic()
+    chars = 0
 
     with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-        for page in doc:
-            text.append(page.get_text())
+        for i, page in enumerate(doc):
+            if max_pages is not None and i >= max_pages:
+                return
+            if time_budget is not None and time.monotonic() - started > time_budget:
+                return
+
+            text = page.get_text()
+            yield text
+
+            chars += len(text) + 1
+            if max_chars is not None and chars >= max_chars:
+                return
+
+
+# ---------- PARALLEL EXTRACTION ----------
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _pool = ProcessPoolExecutor(
+                    max_workers=PDF_PARALLEL_WORKERS,
+                    mp_context=multiprocessing.get_context(method),
+                )
+    return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(
+    path: str,
+    start: int,
+    end: int,
+    max_chars: Optional[int],
+    deadline: Optional[float]
+) -> List[str]:
+    # runs in a worker process: open the shared file and read pages [start, end)
+    pages = []
+    chars = 0
+    with fitz.open(path, filetype="pdf") as doc:
+        for i in range(start, end):
+            if deadline is not None and time.time() > deadline:
+                break
+            text = doc[i].get_text()
+            pages.append(text)
+            chars += len(text) + 1
+            if max_chars is not None and chars >= max_chars:
+                break
+    return pages
+
+
+def _iter_pages_parallel(
+    pdf_bytes: bytes,
+    page_count: int,
+    max_chars: Optional[int],
+    time_budget: Optional[float]
+) -> Iterator[str]:
+    started = time.monotonic()
+    # wall clock: shared with the worker processes
+    deadline = None if time_budget is None else time.time() + time_budget
+
+    ranges = deque(
+        (start, min(start + PDF_PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PDF_PAGES_PER_TASK)
+    )
+    in_flight: Deque[Tuple[int, int, Future]] = deque()
+    chars = 0
+
+    # workers open one temp file instead of each task pickling the bytes
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(pdf_bytes)
+        path = f.name
+
+    pool: Optional[ProcessPoolExecutor] = _get_pool()
+    try:
+        while True:
+            # one range per worker at a time, each capped by the chars still
+            # wanted; nothing new once the time budget is spent
+            while pool is not None and ranges and len(in_flight) < PDF_PARALLEL_WORKERS:
+                if deadline is not None and time.time() > deadline:
+                    break
+                start, end = ranges.popleft()
+                wanted = None if max_chars is None else max_chars - chars
+                try:
+                    in_flight.append((start, end, pool.submit(_extract_page_range, path, start, end, wanted, deadline)))
+                except BrokenProcessPool:
+                    ranges.appendleft((start, end))
+                    _discard_pool(pool)
+                    pool = None
+
+            if in_flight:
+                start, end, future = in_flight.popleft()
+            elif ranges:
+                start, end = ranges.popleft()
+                future = None
+            else:
+                return
+
+            remaining = None if time_budget is None else time_budget - (time.monotonic() - started)
+            if remaining is not None and remaining <= 0:
+                return
+
+            wanted = None if max_chars is None else max_chars - chars
+            try:
+                if future is None:
+                    pages = _extract_page_range(path, start, end, wanted, deadline)
+                else:
+                    pages = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                return
+            except BrokenProcessPool:
+                # workers could not start or died: read the rest here
+                if pool is not None:
+                    _discard_pool(pool)
+                    pool = None
+                pages = _extract_page_range(path, start, end, wanted, deadline)
+
+            for text in pages:
+                yield text
+                chars += len(text) + 1
+                if max_chars is not None and chars >= max_chars:
+                    return
+            if len(pages) < end - start:
+                # worker hit the deadline: later ranges would leave a gap
+                return
+    finally:
+        # ranges already running finish on their own (bounded by the
+        # deadline and their char cap); queued ones are dropped
+        for _start, _end, future in in_flight:
+            future.cancel()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+# ---------- PUBLIC API ----------
+
+def extract_pdf(
+    pdf_bytes: bytes,
+    max_chars: Optional[int] = None,
+    max_pages: int = PDF_MAX_PAGES,
+    time_budget: float = PDF_TIME_BUDGET_SECONDS
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extract text within budgets.
+
+    Args:
+        pdf_bytes: Raw PDF file content
+        max_chars: Stop once this many characters were read (None = no cap)
+        max_pages: Read at most this many pages
+        time_budget: Stop starting new pages after this many seconds
+
+    Returns:
+        (text, metadata) where metadata has pages_total, pages_read,
+        truncated, parallel and extraction_seconds
+    """
+    started = time.monotonic()
+    metadata: Dict[str, Any] = {
+        "pages_total": 0,
+        "pages_read": 0,
+        "truncated": False,
+        "parallel": False,
+        "extraction_seconds": 0.0,
+    }
+
+    if not pdf_bytes:
+        return "", metadata
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        page_count = doc.page_count
+
+    pages_to_read = min(page_count, max_pages)
+    parallel = pages_to_read >= PDF_PARALLEL_MIN_PAGES
+
+    if parallel:
+        pages = _iter_pages_parallel(pdf_bytes, pages_to_read, max_chars, time_budget)
+    else:
+        pages = iter_pdf_pages(pdf_bytes, max_pages=pages_to_read, max_chars=max_chars, time_budget=time_budget)
+
+    text_parts = list(pages)
+    text = "\n".join(text_parts).strip()
+
+    truncated = len(text_parts) < page_count
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars]
+        truncated = True
+
+    metadata.update({
+        "pages_total": page_count,
+        "pages_read": len(text_parts),
+        "truncated": truncated,
+        "parallel": parallel,
+        "extraction_seconds": round(time.monotonic() - started, 4),
+    })
+    return text, metadata
+
+
+TRUNCATION_NOTE = "[PDF truncated: read {pages_read} of {pages_total} pages]"
+
+
+def extract_text_from_pdf(pdf_bytes: bytes) -> str:
+    """
+    Text only, within the default budgets. A truncated document ends
+    with TRUNCATION_NOTE (extract_pdf reports it in metadata instead).
+    """
+    if not pdf_bytes:
+        return ""
 
-    return "\n".join(text).strip()
+    text, metadata = extract_pdf(pdf_bytes)
+    if metadata["truncated"]:
+        text = f"{text}\n{TRUNCATION_NOTE.format(**metadata)}".lstrip()
+    return text
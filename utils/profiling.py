@@ -0,0 +1,296 @@
+# utils/profiling.py
+"""
+Opt-in sampled profiling for SAFE-INTERN.
+
+Purpose:
+- Profile a fraction of requests (PROFILE_SAMPLE_RATE, overridable with
+  the SAFE_INTERN_PROFILE_RATE environment variable; 0 = off)
+- Sampled requests run under cProfile: the request thread as stage
+  "analyze", each agent on its scheduler thread as "agent.<name>"
+- Optionally also trace allocations with tracemalloc (PROFILE_MEMORY /
+  SAFE_INTERN_PROFILE_MEMORY=1) and write the top allocation sites
+- Files go to PROFILE_DIR as
+  <time>--<request id>--<stage>--<input chars>.prof (+ .alloc.txt);
+  only the newest PROFILE_MAX_FILES profiles are kept
+- CLI: aggregate collected profiles into a hot-function table
+
+    python -m utils.profiling                        # all stages, by cumulative time
+    python -m utils.profiling --stage agent.ml --sort tottime --top 40
+
+tracemalloc is process-wide, so an allocation report also counts what
+other threads allocated meanwhile. Profiling never breaks analysis:
+write errors are ignored.
+
+NO analysis logic
+NO always-on overhead (unsampled requests cost one random() call)
+"""
+
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+
+from config.settings import (
+    PROFILE_SAMPLE_RATE,
+    PROFILE_MEMORY,
+    PROFILE_DIR,
+    PROFILE_MAX_FILES,
+    PROFILE_TOP_ALLOCATIONS,
+)
+
+SAMPLE_RATE = float(os.environ.get("SAFE_INTERN_PROFILE_RATE", PROFILE_SAMPLE_RATE))
+MEMORY = os.environ.get("SAFE_INTERN_PROFILE_MEMORY", "1" if PROFILE_MEMORY else "0") == "1"
+
+SEPARATOR = "--"
+
+
+class _Request(NamedTuple):
+    request_id: str
+    input_size: int
+
+
+_request: ContextVar[Optional[_Request]] = ContextVar("safe_intern_profile", default=None)
+_thread = threading.local()   # .active: a profiler already runs on this thread
+
+
+# ---------- PROFILED BLOCKS ----------
+
+class profiled:
+    """
+    Profile a block when the current request was sampled:
+
+        with profiled("agent.ml"):
+            ...
+
+    Outside a sampled request, or nested in another profiled block on the
+    same thread, this does nothing.
+    """
+
+    __slots__ = ("stage", "_profiler", "_snapshot", "_started")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._profiler: Optional[cProfile.Profile] = None
+
+    def __enter__(self) -> "profiled":
+        if _request.get() is None or getattr(_thread, "active", False):
+            return self
+
+        # snapshot first, so taking it does not show up in the profile
+        snapshot = _start_memory() if MEMORY else None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # another profiler owns the process (Python 3.12+ allows one)
+            if snapshot is not None:
+                _stop_memory()
+            return self
+
+        _thread.active = True
+        self._snapshot = snapshot
+        self._started = time.time()
+        self._profiler = profiler
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._profiler is None:
+            return False
+
+        self._profiler.disable()
+        _thread.active = False
+        try:
+            _write(self.stage, self._started, self._profiler, self._snapshot)
+        except OSError:
+            pass
+        finally:
+            if self._snapshot is not None:
+                _stop_memory()
+            self._profiler = None
+        return False
+
+
+class sample_request:
+    """
+    Request root: decide whether to profile it (SAMPLE_RATE) and, if so,
+    profile it as stage "analyze". Blocks on other threads that inherit
+    the context (scheduler agents) are profiled too.
+    """
+
+    __slots__ = ("input_size", "_token", "_block")
+
+    def __init__(self, input_size: int):
+        self.input_size = input_size
+        self._token = None
+        self._block: Optional[profiled] = None
+
+    def __enter__(self) -> "sample_request":
+        if SAMPLE_RATE <= 0 or random.random() >= SAMPLE_RATE:
+            return self
+
+        self._token = _request.set(_Request(uuid.uuid4().hex[:8], self.input_size))
+        self._block = profiled("analyze").__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._token is None:
+            return False
+
+        self._block.__exit__(exc_type, exc, tb)
+        _request.reset(self._token)
+        self._token = None
+        return False
+
+
+# ---------- MEMORY ----------
+
+_memory_lock = threading.Lock()
+_memory_users = 0
+
+
+def _start_memory() -> tracemalloc.Snapshot:
+    global _memory_users
+    with _memory_lock:
+        if _memory_users == 0:
+            tracemalloc.start()
+        _memory_users += 1
+    return tracemalloc.take_snapshot()
+
+
+def _stop_memory() -> None:
+    global _memory_users
+    with _memory_lock:
+        _memory_users -= 1
+        if _memory_users == 0:
+            tracemalloc.stop()
+
+
+# allocations made by the profilers themselves
+_OWN_FILES = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, cProfile.__file__)]
+
+
+def _allocation_report(before: tracemalloc.Snapshot) -> str:
+    after = tracemalloc.take_snapshot().filter_traces(_OWN_FILES)
+    diff = after.compare_to(before.filter_traces(_OWN_FILES), "lineno")
+    lines = [f"{'size KB':>10} {'count':>8}  location"]
+    for stat in diff[:PROFILE_TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size_diff / 1024:10.1f} {stat.count_diff:8d}  {frame.filename}:{frame.lineno}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------- FILES ----------
+
+def _write(stage: str, started: float, profiler: cProfile.Profile, snapshot) -> None:
+    request = _request.get()
+    directory = Path(PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started))
+    base = directory / SEPARATOR.join([stamp, request.request_id, stage, str(request.input_size)])
+
+    profiler.dump_stats(f"{base}.prof")
+    if snapshot is not None:
+        Path(f"{base}.alloc.txt").write_text(_allocation_report(snapshot), encoding="utf-8")
+
+    _rotate(directory)
+
+
+def _rotate(directory: Path) -> None:
+    profiles = sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime)
+    for old in profiles[:max(0, len(profiles) - PROFILE_MAX_FILES)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".alloc.txt").unlink(missing_ok=True)
+
+
+def parse_name(path: Path) -> Dict[str, Any]:
+    """
+    Tags encoded in a profile file name.
+    """
+    stamp, request_id, stage, size = path.stem.split(SEPARATOR)
+    return {"time": stamp, "request_id": request_id, "stage": stage, "input_size": int(size)}
+
+
+# ---------- AGGREGATION (CLI) ----------
+
+def collect(directory: str = PROFILE_DIR, stage: Optional[str] = None) -> List[Path]:
+    paths = []
+    for path in sorted(Path(directory).glob("*.prof")):
+        try:
+            tags = parse_name(path)
+        except ValueError:
+            continue
+        if stage is None or tags["stage"] == stage:
+            paths.append(path)
+    return paths
+
+
+def hot_functions(paths: List[Path], sort: str = "cumtime", top: int = 25) -> List[Dict[str, Any]]:
+    """
+    Merge profiles and return the top functions.
+
+    Returns:
+        Rows with calls, tottime, cumtime (seconds, summed over profiles),
+        per-profile cumtime and the function location
+    """
+    stats = pstats.Stats(str(paths[0]))
+    for path in paths[1:]:
+        stats.add(str(path))
+
+    rows = []
+    for (filename, line, name), (_cc, calls, tottime, cumtime, _callers) in stats.stats.items():
+        rows.append({
+            "calls": calls,
+            "tottime": tottime,
+            "cumtime": cumtime,
+            "cum_per_profile": cumtime / len(paths),
+            "function": f"{name} ({filename}:{line})" if line else name,
+        })
+
+    rows.sort(key=lambda r: r[sort], reverse=True)
+    return rows[:top]
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'calls':>10} {'tottime s':>10} {'cumtime s':>10} {'cum/prof ms':>12}  function")
+    for r in rows:
+        print(
+            f"{r['calls']:10d} {r['tottime']:10.4f} {r['cumtime']:10.4f} "
+            f"{r['cum_per_profile'] * 1000:12.2f}  {r['function']}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Aggregate sampled request profiles into a hot-function table.")
+    parser.add_argument("--dir", default=PROFILE_DIR)
+    parser.add_argument("--stage", help="only profiles of this stage (analyze, agent.ml, ...)")
+    parser.add_argument("--sort", default="cumtime", choices=["cumtime", "tottime", "calls"])
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    paths = collect(args.dir, args.stage)
+    if not paths:
+        print(f"No profiles in {args.dir}/" + (f" for stage {args.stage}" if args.stage else ""))
+        return
+
+    per_stage: Dict[str, List[int]] = {}
+    for path in paths:
+        tags = parse_name(path)
+        per_stage.setdefault(tags["stage"], []).append(tags["input_size"])
+    for stage, sizes in sorted(per_stage.items()):
+        print(f"{stage}: {len(sizes)} profiles, input {min(sizes)}-{max(sizes)} chars")
+    print()
+
+    print_table(hot_functions(paths, args.sort, args.top))
+
+
+if __name__ == "__main__":
+    main()
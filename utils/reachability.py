@@ -0,0 +1,140 @@
+# utils/reachability.py
+"""
+Website reachability probe for SAFE-INTERN.
+
+Purpose:
+- Answer "does this website respond?" as cheaply as possible
+- Reuse pooled keep-alive connections (one requests.Session per thread)
+- Try HEAD first; fall back to a streamed GET that reads only a few KB
+- Separate connect and read timeouts
+
+Returns a structured ProbeResult; callers decide what it means.
+
+NO scoring
+NO page content parsing
+"""
+
+from dataclasses import dataclass, field, asdict
+from typing import Optional, List, Dict, Any
+from urllib.parse import urlparse
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import (
+    PROBE_CONNECT_TIMEOUT,
+    PROBE_READ_TIMEOUT,
+    PROBE_MAX_BYTES,
+    PROBE_POOL_SIZE,
+)
+
+USER_AGENT = "SAFE-INTERN/1.0"
+
+# HEAD answers that are worth a second opinion from GET
+_HEAD_RETRY_STATUSES = range(400, 600)
+
+
+@dataclass
+class ProbeResult:
+    url: str
+    reachable: bool
+    status_code: Optional[int] = None
+    redirect_chain: List[str] = field(default_factory=list)
+    final_url: Optional[str] = None
+    final_host: Optional[str] = None
+    elapsed: float = 0.0
+    method: Optional[str] = None        # "HEAD" or "GET"
+    error: Optional[str] = None
+    uses_https: bool = False            # scheme of the final (post-redirect) URL
+    cached: bool = False                # served from the domain cache
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# ---------- SESSION POOL ----------
+
+_local = threading.local()
+
+
+def _get_session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=PROBE_POOL_SIZE,
+            pool_maxsize=PROBE_POOL_SIZE,
+            max_retries=0,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": USER_AGENT})
+        _local.session = session
+    return session
+
+
+# ---------- PROBE ----------
+
+def _fill(result: ProbeResult, response: requests.Response, method: str) -> None:
+    result.status_code = response.status_code
+    result.redirect_chain = [r.url for r in response.history]
+    result.final_url = response.url
+    result.final_host = urlparse(response.url).hostname
+    result.uses_https = response.url.lower().startswith("https://")
+    result.method = method
+    result.reachable = True
+    result.error = None
+
+
+def probe_url(url: str) -> ProbeResult:
+    """
+    Probe a website with bounded cost.
+
+    Args:
+        url: Website URL (scheme optional, https assumed)
+
+    Returns:
+        ProbeResult with status, redirect chain, final host and elapsed time
+    """
+    if not url.startswith(("http://", "https://")):
+        url = f"https://{url}"
+
+    result = ProbeResult(url=url, reachable=False)
+    timeout = (PROBE_CONNECT_TIMEOUT, PROBE_READ_TIMEOUT)
+    session = _get_session()
+    started = time.monotonic()
+
+    try:
+        try:
+            head = session.head(url, timeout=timeout, allow_redirects=True)
+            head.close()
+            _fill(result, head, "HEAD")
+            if head.status_code not in _HEAD_RETRY_STATUSES:
+                return result
+        except (requests.ConnectionError, requests.exceptions.ConnectTimeout):
+            # host does not answer at all; a GET would not either
+            raise
+        except requests.RequestException:
+            # read timeout / odd HEAD handling: let GET decide
+            pass
+
+        # Streamed GET: only headers plus the first few KB are transferred
+        with session.get(url, timeout=timeout, allow_redirects=True, stream=True) as response:
+            read = 0
+            for chunk in response.iter_content(chunk_size=1024):
+                read += len(chunk)
+                if read >= PROBE_MAX_BYTES:
+                    break
+            _fill(result, response, "GET")
+
+    except requests.RequestException as err:
+        if result.status_code is None:
+            result.reachable = False
+            result.error = type(err).__name__
+
+    finally:
+        result.elapsed = round(time.monotonic() - started, 4)
+
+    return result
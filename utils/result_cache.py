@@ -0,0 +1,158 @@
+# utils/result_cache.py
+"""
+Two-level cache of final (guarded) analysis outputs.
+
+Responsibilities:
+- Key outputs by sha256(basic_clean_text output + result version), where
+  the result version covers the ML model, LEXICON_VERSION and the scoring
+  version (see pipeline.result_version)
+- Level 1: in-process LRU (RESULT_CACHE_MEMORY_ENTRIES)
+- Level 2: result_cache table shared by every session / process
+  (via result_cache_repository), LRU-bounded, entries expire after
+  RESULT_CACHE_TTL_SECONDS
+- A version change makes every old key unreachable; old rows are purged
+  the first time a process sees the new version
+
+The pipeline does not store outputs with degraded agents or an
+unreachable website probe (see pipeline._reusable).
+
+Cache failures never break analysis: any DB error is treated as a miss.
+Every hit returns a fresh copy, so callers may modify it.
+
+NO analysis logic
+NO user-facing logic
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from config.settings import (
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_MEMORY_ENTRIES,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_TTL_SECONDS,
+)
+from database import result_cache_repository
+
+
+_lock = threading.Lock()
+_memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()   # key -> (output JSON, created_at)
+_purged_versions: set = set()
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0}
+
+
+def cache_key(clean_text: str, version: str) -> str:
+    payload = "\x00".join([clean_text, version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ---------- LEVEL 1 (memory) ----------
+
+def _memory_get(key: str, now: float) -> Optional[str]:
+    with _lock:
+        entry = _memory.get(key)
+        if entry is None:
+            return None
+        output, created_at = entry
+        if now - created_at > RESULT_CACHE_TTL_SECONDS:
+            del _memory[key]
+            return None
+        _memory.move_to_end(key)
+        return output
+
+
+def _memory_put(key: str, output: str, created_at: float) -> None:
+    with _lock:
+        _memory[key] = (output, created_at)
+        _memory.move_to_end(key)
+        while len(_memory) > RESULT_CACHE_MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+# ---------- LEVEL 2 (SQLite) ----------
+
+def _purge_once(version: str) -> None:
+    if version in _purged_versions:
+        return
+    with _lock:
+        if version in _purged_versions:
+            return
+        _purged_versions.add(version)
+    result_cache_repository.purge_other_versions(version)
+
+
+def _count(stat: str) -> None:
+    with _lock:
+        _stats[stat] += 1
+
+
+# ---------- PUBLIC API ----------
+
+def get_cached_result(clean_text: str, version: str) -> Optional[Dict[str, Any]]:
+    """
+    Cached guarded output for this cleaned text and result version, or None.
+    """
+    if not RESULT_CACHE_ENABLED:
+        return None
+
+    key = cache_key(clean_text, version)
+    now = time.time()
+
+    output = _memory_get(key, now)
+    if output is not None:
+        _count("memory_hits")
+        return json.loads(output)
+
+    try:
+        _purge_once(version)
+        row = result_cache_repository.get_result(key, now - RESULT_CACHE_TTL_SECONDS, now)
+    except sqlite3.Error:
+        row = None
+
+    if row is None:
+        _count("misses")
+        return None
+
+    output, created_at = row
+    _memory_put(key, output, created_at)
+    _count("db_hits")
+    return json.loads(output)
+
+
+def store_result(clean_text: str, version: str, output: Dict[str, Any]) -> None:
+    """
+    Cache a guarded output in memory and in SQLite.
+    """
+    if not RESULT_CACHE_ENABLED:
+        return
+
+    key = cache_key(clean_text, version)
+    payload = json.dumps(output, ensure_ascii=False)
+    created_at = time.time()
+
+    _memory_put(key, payload, created_at)
+    _count("stores")
+
+    try:
+        _purge_once(version)
+        result_cache_repository.store_result(key, version, payload, created_at, RESULT_CACHE_MAX_ENTRIES)
+    except sqlite3.Error:
+        pass
+
+
+def cache_stats() -> Dict[str, Any]:
+    """
+    Hit / miss counters and the current in-memory size.
+    """
+    with _lock:
+        return {**_stats, "memory_entries": len(_memory)}
+
+
+def clear_memory() -> None:
+    with _lock:
+        _memory.clear()
@@ -1,124 +1,97 @@
 # utils/risk_engine.py
 
-def calculate_risk(agent_results: dict) -> dict:
-    score = 0
-    breakdown = {}
+import hashlib
+
+from config.signals import (
+    BREAKDOWN_KEYS,
+    BUCKET_CAPS,
+    SIGNALS,
+    Signal,
+    SignalCode,
+)
+from utils.keyword_matcher import match_keywords
+
+AGENT_NAMES = ("company", "payment", "behavior", "ml")
+
+
+# --------------------
+# Text-level legitimacy cues (keyword scan → signal codes)
+# --------------------
+KEYWORD_SIGNALS = (
+    # interview/process signals: strong legitimacy structure
+    (SignalCode.PROCESS_STRUCTURE, lambda m: m.has("structure_process")),
+    # mentorship / learning signals
+    (SignalCode.MENTORSHIP, lambda m: m.has("mentorship")),
+    # stipend is a soft legitimacy signal
+    (SignalCode.STIPEND, lambda m: m.has("stipend")),
+    # strongest green flag
+    (SignalCode.NO_FEE_STATED, lambda m: m.has("no_fee")),
+    # official career portal hint
+    (SignalCode.CAREERS_PORTAL, lambda m: m.has("https") and m.has("careers")),
+    # email from company domain (not free email) – mild bonus
+    (SignalCode.COMPANY_EMAIL, lambda m: m.has("email") and not m.has("free_email")),
+)
 
-    raw_text = agent_results.get("raw_text", "") or ""
-    text = raw_text.lower()
 
-    # --------------------
-    # 1) PAYMENT RISK
-    # --------------------
-    payment_obs = agent_results.get("payment", {}).get("observations", [])
-    payment_flag = any(
-        ("payment" in o.lower())
-        or ("fee" in o.lower())
-        or ("upi" in o.lower())
-        or ("amount" in o.lower())
-        for o in payment_obs
-    )
-    financial = 45 if payment_flag else 0
-    score += financial
-    breakdown["financial"] = financial
+def keyword_signals(matches) -> list:
+    return [Signal(code) for code, present in KEYWORD_SIGNALS if present(matches)]
 
-    # --------------------
-    # 2) BEHAVIOR RISK (hard urgency vs scarcity)
-    # --------------------
-    behavior = agent_results.get("behavior", {})
-
-    # support BOTH schemas (old + new) so your app won’t break
-    hard_urgency = behavior.get("hard_urgency_terms", []) or behavior.get("urgency_terms", [])
-    scarcity = behavior.get("scarcity_terms", [])
-    manipulation = behavior.get("manipulation_terms", [])
-    behavior_obs = behavior.get("observations", [])
-
-    pressure = 0
-    if hard_urgency:
-        pressure += 20          # strong pressure words
-    if scarcity:
-        pressure += 6           # limited seats is mild, not scam by itself
-    if manipulation:
-        pressure += 25
-    if any("no clear interview" in o.lower() for o in behavior_obs):
-        pressure += 10
-
-    pressure = min(45, pressure)
-    score += pressure
-    breakdown["pressure"] = pressure
 
-    # --------------------
-    # 3) COMPANY RISK + TRUST
-    # --------------------
-    company_obs = agent_results.get("company", {}).get("observations", [])
-    company_risk = 0
-    if any(("suspicious" in o.lower()) or ("mismatch" in o.lower()) for o in company_obs):
-        company_risk = 15
+# --------------------
+# Scoring version: part of the result cache key
+# --------------------
+# bump when calculate_risk changes in a way the registry hash cannot see
+SCORING_REVISION = 2
 
-    score += company_risk
-    breakdown["company"] = company_risk
 
-    company_trust = agent_results.get("company", {}).get("trust_score", 0)
-    score += company_trust
-    breakdown["company_trust"] = company_trust  # usually negative for trusted domains
-
-    # --------------------
-    # 4) ML RISK (cap it so it can’t dominate)
-    # --------------------
-    ml_prob = agent_results.get("ml", {}).get("ml_probability", 0.0) or 0.0
-    ml_points = int(ml_prob * 20)
-    ml_points = min(15, ml_points)  # ✅ CAP at 15
-    score += ml_points
-    breakdown["ml"] = ml_points
+def _scoring_version() -> str:
+    payload = repr((
+        SCORING_REVISION,
+        sorted((code.value, spec) for code, spec in SIGNALS.items()),
+        sorted(BUCKET_CAPS.items()),
+        [code.value for code, _ in KEYWORD_SIGNALS],
+    ))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
 
-    # --------------------
-    # 5) LEGIT STRUCTURE BONUS (expanded to cover your safe examples)
-    # --------------------
-    structure_bonus = 0
 
-    # interview/process signals
-    if any(k in text for k in [
-        "interview", "technical interview", "hr discussion", "resume screening",
-        "selection process", "screening", "assessment", "shortlisted",
-        "online interaction", "interaction with the founders", "call with founders"
-    ]):
-        structure_bonus += 20  # strong legitimacy structure
+# changes with the point table, caps and explanation templates
+SCORING_VERSION = _scoring_version()
 
-    # mentorship / learning signals
-    if any(k in text for k in ["mentor", "mentorship", "hands-on learning", "learning and mentorship"]):
-        structure_bonus += 8
 
-    # stipend is a soft legitimacy signal
-    if "stipend" in text or "₹" in text:
-        # only count stipend if it actually says stipend
-        if "stipend" in text:
-            structure_bonus += 5
+def calculate_risk(agent_results: dict) -> dict:
+    # keyword hits come from the planner's analysis context; rescan only if missing
+    context = agent_results.get("context")
+    if context is not None:
+        matches = context.matches
+    else:
+        matches = match_keywords(agent_results.get("raw_text", "") or "")
 
-    score -= structure_bonus
-    breakdown["structure_bonus"] = -structure_bonus
+    signals = []
+    for name in AGENT_NAMES:
+        signals.extend(agent_results.get(name, {}).get("signals", []))
+    signals.extend(keyword_signals(matches))
 
     # --------------------
-    # 6) TRUST / GREEN SIGNALS (strong)
+    # Points per bucket: registry lookup, each code counted once
     # --------------------
-    trust_bonus = 0
-
-    # strongest green flag
-    if any(k in text for k in ["no fees", "no fee", "no payment", "no charges", "no registration fee"]):
-        trust_bonus += 30
-
-    # official career portal hint
-    if "https://" in text and "careers" in text:
-        trust_bonus += 10
-
-    # email from company domain (not free email) – mild bonus
-    if ("@" in text) and not any(free in text for free in ["@gmail.com", "@yahoo.com", "@outlook.com", "@hotmail.com"]):
-        trust_bonus += 5
-
-    score -= trust_bonus
-    breakdown["trust_bonus"] = -trust_bonus
+    breakdown = dict.fromkeys(BREAKDOWN_KEYS, 0)
+    seen = set()
+    for signal in signals:
+        spec = SIGNALS[signal.code]
+        if spec.bucket is None or signal.code in seen:
+            continue
+        seen.add(signal.code)
+        breakdown[spec.bucket] += spec.points
+
+    for bucket, cap in BUCKET_CAPS.items():
+        breakdown[bucket] = min(cap, breakdown[bucket])
+
+    # ML RISK (cap it so it can’t dominate)
+    ml_prob = agent_results.get("ml", {}).get("ml_probability", 0.0) or 0.0
+    breakdown["ml"] = min(15, int(ml_prob * 20))
 
     # clamp
-    score = max(0, min(score, 100))
+    score = max(0, min(sum(breakdown.values()), 100))
 
     if score >= 70:
         category = "High Risk"
@@ -130,5 +103,8 @@ def calculate_risk(agent_results: dict) -> dict:
     return {
         "risk_score": score,
         "risk_category": category,
-        "breakdown": breakdown
-    }
\ No newline at end of file
+        "breakdown": breakdown,
+        "signals": signals,
+        # agents that timed out / failed: their checks did not run
+        "degraded": list(agent_results.get("degraded", [])),
+    }
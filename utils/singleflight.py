@@ -0,0 +1,123 @@
+# utils/singleflight.py
+"""
+Duplicate-call suppression for SAFE-INTERN.
+
+Purpose:
+- When many users paste the same message at once, run the analysis once:
+  the first caller for a key computes, concurrent callers with the same
+  key wait and share its result (or its exception)
+- Expose how much duplicate work was avoided: waiters per in-flight key,
+  totals, and the most recent calls that had waiters
+
+A waiter that has waited SINGLEFLIGHT_WAIT_TIMEOUT_SECONDS stops waiting
+and computes on its own, so one stuck call cannot pile up every caller.
+
+NO analysis logic
+NO persistence
+"""
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import threading
+import time
+
+from config.settings import SINGLEFLIGHT_WAIT_TIMEOUT_SECONDS, SINGLEFLIGHT_HISTORY_SIZE
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters", "started")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.started = time.monotonic()
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        wait_timeout: Optional[float] = SINGLEFLIGHT_WAIT_TIMEOUT_SECONDS,
+        history_size: int = SINGLEFLIGHT_HISTORY_SIZE,
+    ):
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._stats = {"executions": 0, "shared": 0, "wait_timeouts": 0, "max_waiters": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per concurrent key.
+
+        Returns:
+            (result, shared) — shared is True whenever the same result
+            object went to more than one caller (leader included), so
+            callers that modify it should copy it first
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+
+        if not leader:
+            return self._wait(call, fn)
+
+        shared = False
+        try:
+            call.result = fn()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                # no one can join once the key is removed: waiters is final
+                del self._calls[key]
+                shared = call.waiters > 0
+                self._stats["executions"] += 1
+                self._stats["shared"] += call.waiters
+                self._stats["max_waiters"] = max(self._stats["max_waiters"], call.waiters)
+                if call.waiters:
+                    self._history.append({
+                        "key": key[:16],
+                        "waiters": call.waiters,
+                        "seconds": round(time.monotonic() - call.started, 4),
+                    })
+            call.done.set()
+
+        return call.result, shared
+
+    def _wait(self, call: _Call, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        if not call.done.wait(self.wait_timeout):
+            with self._lock:
+                self._stats["wait_timeouts"] += 1
+            return fn(), False
+
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+    # ---------- INTROSPECTION ----------
+
+    def in_flight(self) -> Dict[str, int]:
+        """
+        Waiters per key currently being computed (key prefix → waiters).
+        """
+        with self._lock:
+            return {key[:16]: call.waiters for key, call in self._calls.items()}
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """
+        Most recent completed calls that had waiters.
+        """
+        with self._lock:
+            return list(self._history)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
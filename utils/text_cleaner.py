@@ -16,9 +16,16 @@ from typing import List, Dict, Any
 
 # ---------- REGEX ----------
 
-EMAIL_PATTERN = re.compile(r'\b[\w\.-]+@[\w\.-]+\.\w{2,}\b')
-URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+# Single source for entity patterns: intake extraction, the company agent,
+# the ML normalizer and utils/analysis_context all use these.
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+')
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+', re.IGNORECASE)
 PHONE_PATTERN = re.compile(r'\+?\d[\d\s\-]{7,}\d')
+AMOUNT_PATTERN = re.compile(r'(?:₹|rs\.?|inr|\$)\s*\d[\d,]*', re.IGNORECASE)
+
+# ML normalization: everything except a-z, digits and ₹ becomes a space
+MODEL_STRIP_PATTERN = re.compile(r'[^a-z0-9₹\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
 
 
 # ---------- BASIC CLEAN ----------
@@ -42,6 +49,19 @@ def basic_clean_text(text: str) -> str:
     return text.strip()
 
 
+# ---------- MODEL TEXT ----------
+
+def normalize_model_text(text: str) -> str:
+    """
+    Text exactly as the ML vectorizer was trained on it: lowercased,
+    URLs and punctuation blanked, whitespace collapsed.
+    """
+    t = str(text).lower().strip()
+    t = URL_PATTERN.sub(" ", t)
+    t = MODEL_STRIP_PATTERN.sub(" ", t)
+    return WHITESPACE_PATTERN.sub(" ", t).strip()
+
+
 # ---------- EXTRACTION ----------
 
 def extract_emails(text: str) -> List[str]:
@@ -56,6 +76,10 @@ def extract_phones(text: str) -> List[str]:
     return list(set(PHONE_PATTERN.findall(text)))
 
 
+def extract_amounts(text: str) -> List[str]:
+    return list(set(AMOUNT_PATTERN.findall(text)))
+
+
 # ---------- VALIDATION ----------
 
 def validate_text(text: str, min_length: int = 10) -> Dict[str, Any]:
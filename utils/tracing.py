@@ -0,0 +1,274 @@
+# utils/tracing.py
+"""
+Per-stage latency tracing for SAFE-INTERN.
+
+Purpose:
+- Time every pipeline stage and agent with nested spans
+  (monotonic clock, class-based context managers: a few microseconds each)
+- Keep a per-request trace (span name, parent, start offset, duration)
+  that the pipeline attaches to its output in debug mode
+- Keep rolling latency windows per stage (last TRACE_WINDOW_SIZE calls)
+  for p50 / p95 / p99, plus cumulative count / sum
+- Export registered component counters (caches, singleflight, analytics
+  writer) next to the stage latencies
+- Write both in Prometheus text format to TRACE_METRICS_PATH
+  (atomically, at most every TRACE_METRICS_DUMP_SECONDS)
+
+The current span lives in a context variable; the agent scheduler runs
+each agent inside a copy of the caller's context, so agent spans nest
+under the planner span of the request that started them.
+
+NO analysis logic
+NO persistence beyond the metrics file
+"""
+
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional
+import math
+import os
+import threading
+import time
+
+from config.settings import (
+    TRACING_ENABLED,
+    TRACE_WINDOW_SIZE,
+    TRACE_METRICS_PATH,
+    TRACE_METRICS_DUMP_SECONDS,
+)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+# ---------- PER-REQUEST TRACE ----------
+
+class Trace:
+    """
+    Spans of one request. Spans may finish on agent threads, so appends
+    are locked.
+    """
+
+    __slots__ = ("started", "_spans", "_lock")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, parent: Optional[str], started: float, elapsed: float) -> None:
+        record = {
+            "name": name,
+            "parent": parent,
+            "start_ms": round((started - self.started) * 1000, 3),
+            "duration_ms": round(elapsed * 1000, 3),
+        }
+        with self._lock:
+            self._spans.append(record)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """
+        Finished spans ordered by start time.
+        """
+        with self._lock:
+            return sorted(self._spans, key=lambda s: s["start_ms"])
+
+
+class _Frame(NamedTuple):
+    trace: Optional[Trace]
+    name: str
+
+
+_current: ContextVar[Optional[_Frame]] = ContextVar("safe_intern_span", default=None)
+
+
+# ---------- SPANS ----------
+
+class span:
+    """
+    Time a block as a stage:
+
+        with span("risk"):
+            ...
+
+    Always feeds the stage's rolling window; also recorded in the request
+    trace when one is active (see start_trace).
+    """
+
+    __slots__ = ("name", "trace", "_parent", "_token", "_started")
+
+    def __init__(self, name: str, _new_trace: bool = False):
+        self.name = name
+        self.trace: Optional[Trace] = Trace() if _new_trace and TRACING_ENABLED else None
+        self._token = None
+
+    def __enter__(self) -> "span":
+        if not TRACING_ENABLED:
+            return self
+
+        self._parent = _current.get()
+        if self.trace is None and self._parent is not None:
+            self.trace = self._parent.trace
+        self._token = _current.set(_Frame(self.trace, self.name))
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._token is None:
+            return False
+
+        elapsed = time.perf_counter() - self._started
+        _current.reset(self._token)
+        self._token = None
+
+        _observe(self.name, elapsed)
+        if self.trace is not None:
+            parent = self._parent.name if self._parent is not None else None
+            self.trace.add(self.name, parent, self._started, elapsed)
+        if self._parent is None:
+            _maybe_dump()
+        return False
+
+
+def start_trace(name: str) -> span:
+    """
+    Root span of a request; its .trace collects every nested span.
+    """
+    return span(name, _new_trace=True)
+
+
+# ---------- ROLLING STAGE STATS ----------
+
+_stats_lock = threading.Lock()
+_windows: Dict[str, Deque[float]] = {}
+_totals: Dict[str, List[float]] = {}   # stage -> [count, sum seconds]
+
+
+def _observe(name: str, elapsed: float) -> None:
+    with _stats_lock:
+        window = _windows.get(name)
+        if window is None:
+            window = _windows[name] = deque(maxlen=TRACE_WINDOW_SIZE)
+            _totals[name] = [0, 0.0]
+        window.append(elapsed)
+        totals = _totals[name]
+        totals[0] += 1
+        totals[1] += elapsed
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    # nearest rank
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def stage_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Per stage: cumulative count / sum (seconds) and p50 / p95 / p99
+    (seconds) over the rolling window.
+    """
+    with _stats_lock:
+        snapshot = {name: (sorted(window), list(_totals[name])) for name, window in _windows.items()}
+
+    out = {}
+    for name, (ordered, (count, total)) in sorted(snapshot.items()):
+        stats = {"count": int(count), "sum": total}
+        for q in QUANTILES:
+            stats[f"p{int(q * 100)}"] = _quantile(ordered, q)
+        out[name] = stats
+    return out
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _windows.clear()
+        _totals.clear()
+
+
+# ---------- COMPONENT STATS ----------
+
+_components: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_metrics(component: str, stats_fn: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Export a component's stats (a function returning a flat dict, e.g.
+    domain_cache.cache_stats) with every metrics write. Non-numeric
+    values are skipped.
+    """
+    _components[component] = stats_fn
+
+
+def component_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Current numeric stats of every registered component.
+    """
+    out = {}
+    for component, stats_fn in sorted(_components.items()):
+        out[component] = {
+            key: float(value)
+            for key, value in stats_fn().items()
+            if isinstance(value, (int, float))
+        }
+    return out
+
+
+# ---------- PROMETHEUS EXPORT ----------
+
+def prometheus_text() -> str:
+    """
+    Stage latencies as a Prometheus summary and component stats as
+    gauges (text exposition format).
+    """
+    lines = [
+        f"# HELP safe_intern_stage_seconds Analysis stage latency (quantiles over the last {TRACE_WINDOW_SIZE} calls)",
+        "# TYPE safe_intern_stage_seconds summary",
+    ]
+    for name, stats in stage_stats().items():
+        for q in QUANTILES:
+            lines.append(f'safe_intern_stage_seconds{{stage="{name}",quantile="{q}"}} {stats[f"p{int(q * 100)}"]:.6f}')
+        lines.append(f'safe_intern_stage_seconds_sum{{stage="{name}"}} {stats["sum"]:.6f}')
+        lines.append(f'safe_intern_stage_seconds_count{{stage="{name}"}} {stats["count"]}')
+
+    components = component_stats()
+    if components:
+        lines.append("# HELP safe_intern_component_stat Cache / queue counters and rates of pipeline components")
+        lines.append("# TYPE safe_intern_component_stat gauge")
+    for component, stats in components.items():
+        for key, value in sorted(stats.items()):
+            lines.append(f'safe_intern_component_stat{{component="{component}",stat="{key}"}} {value:g}')
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path: str = TRACE_METRICS_PATH) -> None:
+    """
+    Write prometheus_text() to path (replaced atomically, so a scraper
+    or node_exporter textfile collector never reads a partial file).
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+_dump_lock = threading.Lock()
+_last_dump = time.monotonic()
+
+
+def _maybe_dump() -> None:
+    global _last_dump
+
+    if not TRACE_METRICS_DUMP_SECONDS or time.monotonic() - _last_dump < TRACE_METRICS_DUMP_SECONDS:
+        return
+    # one writer at a time; other requests skip instead of waiting
+    if not _dump_lock.acquire(blocking=False):
+        return
+    try:
+        _last_dump = time.monotonic()
+        write_metrics()
+    except OSError:
+        pass
+    finally:
+        _dump_lock.release()
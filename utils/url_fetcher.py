@@ -5,32 +5,217 @@ URL content fetcher for SAFE-INTERN.
 Purpose:
 - Fetch readable website text
 - Used in intake BEFORE analysis
+
+The response is streamed with a hard byte cap and the content type is
+checked before the body is read. HTML is converted to text
+incrementally (no document tree): script/style/noscript content is
+skipped as it streams past. lxml's parser-target interface is used when
+lxml is installed, otherwise the stdlib HTMLParser.
 """
 
+from html.parser import HTMLParser
+from typing import Dict, Any, List, Tuple
+import codecs
+
 import requests
-from bs4 import BeautifulSoup
 
+from config.settings import URL_FETCH_MAX_BYTES
 
-def fetch_text_from_url(url: str, timeout: int = 10) -> str:
+try:
+    from lxml import etree
+except ImportError:  # optional fast path
+    etree = None
+
+
+SKIP_TAGS = {"script", "style", "noscript"}
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+
+# ---------- INCREMENTAL HTML → TEXT ----------
+
+class _TextCollector:
+    """
+    Shared SAX-style logic: buffer character data between tags and keep
+    it unless we are inside a skipped element.
+    """
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self._buffer: List[str] = []
+        self._skip_depth = 0
+
+    def _flush(self) -> None:
+        if self._buffer:
+            if not self._skip_depth:
+                self.parts.append("".join(self._buffer))
+            self._buffer = []
+
+    def on_start(self, tag: str) -> None:
+        self._flush()
+        if tag.lower() in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def on_end(self, tag: str) -> None:
+        self._flush()
+        if tag.lower() in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def on_data(self, data: str) -> None:
+        self._buffer.append(data)
+
+    def text(self) -> str:
+        self._flush()
+        lines = (line.strip() for part in self.parts for line in part.splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+class _StdlibHTMLText(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.collector = _TextCollector()
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.on_start(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.on_end(tag)
+
+    def handle_data(self, data):
+        self.collector.on_data(data)
+
+    def result(self) -> str:
+        self.close()
+        return self.collector.text()
+
+
+class _LxmlTarget:
+    # parser-target interface: lxml calls these, no tree is built
+    def __init__(self, collector: _TextCollector):
+        self.collector = collector
+
+    def start(self, tag, attrib):
+        self.collector.on_start(tag)
+
+    def end(self, tag):
+        self.collector.on_end(tag)
+
+    def data(self, data):
+        self.collector.on_data(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return None
+
+
+class _LxmlHTMLText:
+    def __init__(self):
+        self.collector = _TextCollector()
+        self._parser = etree.HTMLParser(target=_LxmlTarget(self.collector))
+
+    def feed(self, data: str) -> None:
+        self._parser.feed(data)
+
+    def result(self) -> str:
+        self._parser.close()
+        return self.collector.text()
+
+
+class _PlainText:
+    def __init__(self):
+        self._parts: List[str] = []
+
+    def feed(self, data: str) -> None:
+        self._parts.append(data)
+
+    def result(self) -> str:
+        lines = (line.strip() for line in "".join(self._parts).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+def html_text_parser(use_lxml: bool = True):
+    """
+    Return an incremental HTML→text parser (feed(str) / result()).
+    """
+    if use_lxml and etree is not None:
+        return _LxmlHTMLText()
+    return _StdlibHTMLText()
+
+
+def html_to_text(html: str, use_lxml: bool = True) -> str:
+    parser = html_text_parser(use_lxml)
+    parser.feed(html)
+    return parser.result()
+
+
+# ---------- FETCH ----------
+
+def _encoding_from_content_type(content_type: str) -> str:
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            encoding = value.strip("\"' ")
+            try:
+                codecs.lookup(encoding)
+                return encoding
+            except LookupError:
+                break
+    return "utf-8"
+
+
+def fetch_url_text(
+    url: str,
+    timeout: int = 10,
+    max_bytes: int = URL_FETCH_MAX_BYTES
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Fetch a page and return (text, metadata).
+
+    metadata: content_type, bytes_read, truncated
+    """
     if not url:
-        return ""
+        return "", {"content_type": None, "bytes_read": 0, "truncated": False}
 
     if not url.startswith(("http://", "https://")):
         url = "https://" + url
 
-    response = requests.get(url, timeout=timeout, headers={
+    with requests.get(url, timeout=timeout, stream=True, headers={
         "User-Agent": "SAFE-INTERN/1.0"
-    })
+    }) as response:
+
+        response.raise_for_status()
 
-    response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "text/html")
+        mime = content_type.split(";")[0].strip().lower()
+        if mime not in TEXT_CONTENT_TYPES:
+            raise ValueError(f"Unsupported content type: {mime}")
 
-    soup = BeautifulSoup(response.text, "html.parser")
+        parser = _PlainText() if mime == "text/plain" else html_text_parser()
+        decoder = codecs.getincrementaldecoder(_encoding_from_content_type(content_type))(errors="replace")
 
-    # Remove scripts & styles
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
+        bytes_read = 0
+        truncated = False
+        for chunk in response.iter_content(chunk_size=16384):
+            if bytes_read + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - bytes_read]
+                truncated = True
+            bytes_read += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            if truncated:
+                break
 
-    text = soup.get_text(separator="\n")
+        parser.feed(decoder.decode(b"", final=True))
+
+    return parser.result(), {
+        "content_type": mime,
+        "bytes_read": bytes_read,
+        "truncated": truncated,
+    }
+
+
+def fetch_text_from_url(url: str, timeout: int = 10) -> str:
+    if not url:
+        return ""
 
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    return "\n".join(lines)
+    return fetch_url_text(url, timeout=timeout)[0]